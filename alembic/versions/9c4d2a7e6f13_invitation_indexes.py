@@ -0,0 +1,37 @@
+"""invitation_indexes
+
+Revision ID: 9c4d2a7e6f13
+Revises: 5b2f8e1d9a47
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4d2a7e6f13'
+down_revision: Union[str, None] = '5b2f8e1d9a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Build concurrently so writes to a large invitations table are not blocked while the indexes build
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_invitations_user_id_created_at_id', 'invitations', ['user_id', 'created_at', 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_invitations_unused_user_id_created_at_id', 'invitations', ['user_id', 'created_at', 'id'],
+            unique=False, postgresql_where=sa.text('used IS NOT TRUE'), postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_invitations_unused_user_id_created_at_id', table_name='invitations', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_invitations_user_id_created_at_id', table_name='invitations', postgresql_concurrently=True, if_exists=True)
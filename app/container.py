@@ -0,0 +1,50 @@
+from app.database import Database
+from app.minio_setup import create_minio_bucket, object_storage
+from app.services.email_service import EmailService, smtp_client
+from app.services.invite_cache import invite_cache
+from app.utils.password_hasher import password_hasher
+from app.utils.template_manager import TemplateManager
+from qrcodegen.engine import qr_render_engine
+from settings.config import Settings, settings
+
+class Container:
+    """
+    Application-scoped services shared by every request.
+    Built once at import so dependencies are plain attribute lookups; pools are opened by `startup()`
+    and released by `shutdown()`, which the FastAPI lifespan calls.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.template_manager = TemplateManager()
+        self.email_service = EmailService(template_manager=self.template_manager, smtp_client=smtp_client)
+
+    def initialize_database(self):
+        Database.initialize(
+            self.settings.database_url, self.settings.debug,
+            pool_size=self.settings.db_pool_size,
+            max_overflow=self.settings.db_max_overflow,
+            pool_timeout=self.settings.db_pool_timeout_seconds,
+            pool_recycle=self.settings.db_pool_recycle_seconds,
+            pool_pre_ping=self.settings.db_pool_pre_ping,
+            statement_cache_size=self.settings.db_statement_cache_size,
+            prepared_statement_cache_size=self.settings.db_prepared_statement_cache_size
+        )
+
+    async def startup(self):
+        self.initialize_database()
+        await create_minio_bucket()
+        qr_render_engine.start()
+        password_hasher.start()
+        self.template_manager.precompile()
+
+    async def shutdown(self):
+        qr_render_engine.shutdown()
+        await password_hasher.drain()
+        password_hasher.shutdown()
+        object_storage.shutdown()
+        self.email_service.smtp_client.close()
+        await invite_cache.close()
+        await Database.dispose()
+
+container = Container(settings)
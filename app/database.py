@@ -1,18 +1,89 @@
+import threading
+import time
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 Base = declarative_base()
 
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait to check out a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.acquisitions = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        waited = time.perf_counter() - start
+        with self._stats_lock:
+            self.acquisitions += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        return connection
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "pool_size": self.size(),
+                "max_overflow": self._max_overflow,
+                "checked_in": self.checkedin(),
+                "checked_out": self.checkedout(),
+                "overflow": max(self.overflow(), 0),
+                "acquisitions": self.acquisitions,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
 class Database:
     """Handles database connections and sessions."""
     _engine = None
     _session_factory = None
 
     @classmethod
-    def initialize(cls, database_url: str, echo: bool = False):
-        """Initialize the async engine and sessionmaker."""
+    def initialize(cls, database_url: str, echo: bool = False, pool_size: int = 5, max_overflow: int = 10,
+                   pool_timeout: float = 30.0, pool_recycle: int = -1, pool_pre_ping: bool = False,
+                   statement_cache_size: int = None, prepared_statement_cache_size: int = None):
+        """
+        Initialize the async engine and sessionmaker.
+        :param pool_size: Connections kept open in the pool.
+        :param max_overflow: Extra connections opened under burst load.
+        :param pool_timeout: Seconds to wait for a free connection before failing.
+        :param pool_recycle: Replace connections older than this many seconds; -1 disables recycling.
+        :param pool_pre_ping: Test connections for liveness on checkout.
+        :param statement_cache_size: asyncpg's per-connection statement cache; 0 disables it (e.g. behind PgBouncer).
+        :param prepared_statement_cache_size: SQLAlchemy's asyncpg prepared statement cache per connection.
+        """
         if cls._engine is None:  # Ensure engine is created once
-            cls._engine = create_async_engine(database_url, echo=echo, future=True)
+            connect_args = {}
+            if make_url(database_url).get_driver_name() == "asyncpg":
+                if statement_cache_size is not None:
+                    connect_args["statement_cache_size"] = statement_cache_size
+                if prepared_statement_cache_size is not None:
+                    connect_args["prepared_statement_cache_size"] = prepared_statement_cache_size
+            cls._engine = create_async_engine(
+                database_url, echo=echo, future=True,
+                poolclass=InstrumentedQueuePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_recycle=pool_recycle,
+                pool_pre_ping=pool_pre_ping,
+                connect_args=connect_args
+            )
             cls._session_factory = sessionmaker(
                 bind=cls._engine, class_=AsyncSession, expire_on_commit=False, future=True
             )
@@ -23,3 +94,16 @@ class Database:
         if cls._session_factory is None:
             raise ValueError("Database not initialized. Call `initialize()` first.")
         return cls._session_factory
+
+    @classmethod
+    def pool_stats(cls) -> dict:
+        """Returns live connection pool statistics, ensuring the engine is initialized."""
+        if cls._engine is None:
+            raise ValueError("Database not initialized. Call `initialize()` first.")
+        return cls._engine.pool.stats()
+
+    @classmethod
+    async def dispose(cls):
+        """Close all pooled connections; the engine reconnects lazily if used again."""
+        if cls._engine is not None:
+            await cls._engine.dispose()
@@ -1,9 +1,11 @@
 from builtins import Exception, dict, str
-from fastapi import Depends, HTTPException
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.container import container
 from app.database import Database
-from app.utils.template_manager import TemplateManager
 from app.services.email_service import EmailService
 from app.services.jwt_service import decode_token
 from settings.config import Settings
@@ -11,12 +13,12 @@ from fastapi import Depends
 from uuid import UUID
 
 def get_settings() -> Settings:
-    """Return application settings."""
-    return Settings()
+    """Return the application-wide settings, parsed once at startup."""
+    return container.settings
 
 def get_email_service() -> EmailService:
-    template_manager = TemplateManager()
-    return EmailService(template_manager=template_manager)
+    """Return the shared EmailService and its pooled SMTP client."""
+    return container.email_service
 
 async def get_db() -> AsyncSession:
     """Dependency that provides a database session for each request."""
@@ -30,25 +32,69 @@ async def get_db() -> AsyncSession:
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
-    credentials_exception = HTTPException(
+class Principal:
+    """
+    The authenticated caller, decoded once per request and shared through `request.state.principal`.
+    Immutable and slotted so it is cheap to build and safe to hand to middleware, dependencies and routes.
+    """
+    __slots__ = ("subject", "user_id", "roles")
+
+    def __init__(self, subject: str, user_id: Optional[UUID], roles: FrozenSet[str]):
+        object.__setattr__(self, "subject", subject)
+        object.__setattr__(self, "user_id", user_id)
+        object.__setattr__(self, "roles", roles)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Principal is immutable")
+
+    def __repr__(self):
+        return f"Principal(subject={self.subject!r}, user_id={self.user_id!r}, roles={set(self.roles)!r})"
+
+    @property
+    def role(self) -> str:
+        """The caller's role; tokens carry exactly one."""
+        return next(iter(self.roles))
+
+    def has_any_role(self, roles: FrozenSet[str]) -> bool:
+        return not self.roles.isdisjoint(roles)
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=401,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+async def get_current_user(request: Request, token: str = Depends(oauth2_scheme)) -> Principal:
+    # Async so FastAPI calls it on the event loop; a sync dependency would cost a threadpool hop per request
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal
     payload = decode_token(token)
     if payload is None:
-        raise credentials_exception
-    user_id: str = payload.get("sub")
-    user_role: str = payload.get("role")
-    user_uuid: UUID = payload.get("user_id")
-    if user_id is None or user_role is None:
-        raise credentials_exception
-    return {"user_id": user_id, "role": user_role, "user_uuid": user_uuid}
-
-def require_role(role: str):
-    def role_checker(current_user: dict = Depends(get_current_user)):
-        if current_user["role"] not in role:
+        raise _credentials_exception()
+    subject = payload.get("sub")
+    role = payload.get("role")
+    if subject is None or role is None:
+        raise _credentials_exception()
+    try:
+        user_id = UUID(payload["user_id"]) if payload.get("user_id") else None
+    except ValueError:
+        raise _credentials_exception()
+    principal = request.state.principal = Principal(subject, user_id, frozenset((role,)))
+    return principal
+
+@lru_cache(maxsize=None)
+def _role_checker(roles: FrozenSet[str]):
+    async def role_checker(current_user: Principal = Depends(get_current_user)) -> Principal:
+        if not current_user.has_any_role(roles):
             raise HTTPException(status_code=403, detail="Operation not permitted")
         return current_user
     return role_checker
+
+def require_role(roles: Iterable[str]):
+    """
+    Dependency that admits callers holding any of `roles`.
+    Routes asking for the same roles share one checker instead of each building its own closure.
+    """
+    return _role_checker(frozenset(roles))
@@ -1,12 +1,22 @@
 from builtins import Exception
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from starlette.responses import JSONResponse, HTMLResponse
 from starlette.middleware.cors import CORSMiddleware  # Import the CORSMiddleware
-from app.database import Database
-from app.dependencies import get_settings
-from app.routers import user_routes, invite_routes
+from app.container import container
+from app.routers import user_routes, invite_routes, metrics_routes
 from app.utils.api_description import getDescription
-from app.minio_setup import create_minio_bucket
+from app.utils.password_hasher import PasswordHasherBusy
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared services live for the whole process; expose them on app.state for handlers outside DI
+    app.state.container = container
+    await container.startup()
+    try:
+        yield
+    finally:
+        await container.shutdown()
 
 app = FastAPI(
     title="User Management",
@@ -18,6 +28,7 @@ app = FastAPI(
         "email": "support@example.com",
     },
     license_info={"name": "MIT", "url": "https://opensource.org/licenses/MIT"},
+    lifespan=lifespan,
 )
 # CORS middleware configuration
 # This middleware will enable CORS and allow requests from any origin
@@ -30,16 +41,15 @@ app.add_middleware(
     allow_headers=["*"],  # Allowed HTTP headers
 )
 
-@app.on_event("startup")
-async def startup_event():
-    settings = get_settings()
-    Database.initialize(settings.database_url, settings.debug)
-    create_minio_bucket()
-
 @app.exception_handler(Exception)
 async def exception_handler(request, exc):
     return JSONResponse(status_code=500, content={"message": "An unexpected error occurred."})
 
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request, exc):
+    # Shed load instead of letting logins queue behind each other until every request times out
+    return JSONResponse(status_code=429, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
 @app.get("/accepted",include_in_schema=False, response_class=HTMLResponse)
 async def verified_page():
     # Return an HTML response with the message
@@ -59,4 +69,5 @@ async def verified_page():
     return html_content
 
 app.include_router(user_routes.router)
-app.include_router(invite_routes.router)
\ No newline at end of file
+app.include_router(invite_routes.router)
+app.include_router(metrics_routes.router)
\ No newline at end of file
@@ -1,23 +1,123 @@
 from minio import Minio
-from minio.error import S3Error
+from minio.error import S3Error, ServerError
 from settings.config import settings
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from io import BytesIO
+import asyncio
 import logging
 import os
+import urllib3
 
 # Initialize logger
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# S3 error codes that indicate a transient condition worth retrying
+RETRYABLE_S3_CODES = {"InternalError", "ServiceUnavailable", "SlowDown", "RequestTimeout"}
+
+# Pooled HTTP client shared by every Minio call; retries are handled by AsyncObjectStorage instead
+http_client = urllib3.PoolManager(
+    maxsize=settings.minio_max_connections,
+    block=True,
+    timeout=urllib3.Timeout(connect=settings.minio_timeout_seconds, read=settings.minio_timeout_seconds),
+    retries=False
+)
+
 # Initialize Minio client using the configuration from settings
 minio_client = Minio(
     settings.minio_url,
     access_key=os.environ.get("MINIO_ROOT_USER"),
     secret_key=os.environ.get("MINIO_ROOT_PASSWORD"),
-    secure=False
+    secure=False,
+    http_client=http_client
 )
 
-def create_minio_bucket():
-    
+class AsyncObjectStorage:
+    """
+    Async facade over the synchronous Minio client.
+    Calls run in a dedicated thread pool, which also bounds how many requests are in flight,
+    and transient failures are retried with exponential backoff.
+    """
+
+    def __init__(self, client: Minio, max_concurrency: int, max_retries: int, retry_backoff: float):
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="minio")
+        return self._executor
+
+    def shutdown(self):
+        """Stop the worker threads, waiting for in-flight calls to finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if isinstance(error, S3Error):
+            return error.code in RETRYABLE_S3_CODES
+        return isinstance(error, (ServerError, urllib3.exceptions.HTTPError))
+
+    async def _call(self, method: str, *args, before_attempt=None, **kwargs):
+        return await self._run(method, partial(getattr(self.client, method), *args, **kwargs), before_attempt)
+
+    async def _run(self, method: str, call, before_attempt=None):
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            if before_attempt is not None:
+                before_attempt()
+            try:
+                return await loop.run_in_executor(self._get_executor(), call)
+            except Exception as e:
+                if attempt == self.max_retries or not self._is_retryable(e):
+                    raise
+                delay = self.retry_backoff * (2 ** attempt)
+                logger.warning(f"Minio {method} failed ({e}); retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def bucket_exists(self, bucket_name: str) -> bool:
+        return await self._call("bucket_exists", bucket_name)
+
+    async def make_bucket(self, bucket_name: str):
+        return await self._call("make_bucket", bucket_name)
+
+    async def set_bucket_policy(self, bucket_name: str, policy: str):
+        return await self._call("set_bucket_policy", bucket_name, policy)
+
+    def _read_object(self, bucket_name: str, object_name: str) -> bytes:
+        response = self.client.get_object(bucket_name, object_name)
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+    async def get_object_data(self, bucket_name: str, object_name: str) -> bytes:
+        """Download a whole object; the body is read in the worker thread so the pooled connection is released there."""
+        return await self._run("get_object", partial(self._read_object, bucket_name, object_name))
+
+    async def put_object(self, bucket_name: str, object_name: str, data: BytesIO, length: int, content_type: str = "application/octet-stream"):
+        # Rewind before every attempt so a retried upload sends the whole body again
+        return await self._call(
+            "put_object", bucket_name, object_name, data, length,
+            content_type=content_type, before_attempt=lambda: data.seek(0)
+        )
+
+object_storage = AsyncObjectStorage(
+    minio_client,
+    max_concurrency=settings.minio_max_concurrency,
+    max_retries=settings.minio_max_retries,
+    retry_backoff=settings.minio_retry_backoff_seconds
+)
+
+async def create_minio_bucket():
+
     # Define the bucket name from settings
     bucket_name = settings.minio_bucket
 
@@ -38,22 +138,22 @@ def create_minio_bucket():
     ]
 }
 """
-    
+
     try:
         # Check if the bucket already exists
-        if not minio_client.bucket_exists(bucket_name):
+        if not await object_storage.bucket_exists(bucket_name):
             # If the bucket does not exist, create it
-            minio_client.make_bucket(bucket_name)
+            await object_storage.make_bucket(bucket_name)
             logger.info(f"Bucket '{bucket_name}' created successfully!")
-            minio_client.set_bucket_policy(bucket_name, policy)
+            await object_storage.set_bucket_policy(bucket_name, policy)
         else:
             logger.info(f"Bucket '{bucket_name}' already exists.")
-            minio_client.set_bucket_policy(bucket_name, policy)
-    
+            await object_storage.set_bucket_policy(bucket_name, policy)
+
     except S3Error as e:
         logger.error(f"Error creating bucket: {e}")
         raise Exception(f"Error creating Minio bucket: {e}")
 
 # This will be executed only if the script is run directly
 if __name__ == "__main__":
-    create_minio_bucket()
+    asyncio.run(create_minio_bucket())
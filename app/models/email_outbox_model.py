@@ -0,0 +1,30 @@
+import uuid
+from sqlalchemy import Column, String, Integer, DateTime, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from datetime import datetime
+from app.database import Base
+
+class EmailOutbox(Base):
+    """
+    Transactional outbox of emails waiting to be delivered by the outbox worker.
+    Rows are written in the same transaction as the record that triggers the email.
+    """
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        Index('ix_email_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    PENDING = "pending"
+    SENT = "sent"
+    DEAD = "dead"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind: Mapped[str] = Column(String(50), nullable=False)
+    payload: Mapped[dict] = Column(JSONB, nullable=False)
+    status: Mapped[str] = Column(String(20), nullable=False, default=PENDING)
+    attempts: Mapped[int] = Column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error: Mapped[str] = Column(String, nullable=True)
+    created_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import ForeignKey, Column, Boolean, String, DateTime, func
+from sqlalchemy import ForeignKey, Column, Boolean, String, DateTime, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
@@ -7,6 +7,12 @@ from app.database import Base
 
 class Invitation(Base):
     __tablename__ = 'invitations'
+    __table_args__ = (
+        # Serves every per-user filter and the (created_at, id) keyset listing in one index
+        Index('ix_invitations_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        # Pending invitations are the ones still being listed, resent and scanned; this stays small as they get used
+        Index('ix_invitations_unused_user_id_created_at_id', 'user_id', 'created_at', 'id', postgresql_where=text('used IS NOT TRUE')),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4)
     invitee_email: Mapped[str] = Column(String(255), unique=True, nullable=False, index=True)
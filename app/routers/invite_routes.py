@@ -1,14 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import RedirectResponse
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import RedirectResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.count_service import CountStrategy
 from app.services.invite_service import InviteService
-from app.schemas.invite_schemas import InviteCreate, InviteUpdate, InviteResponse, InviteListResponse
-from app.dependencies import get_db, get_current_user, get_email_service
-from app.models.user_model import User
+from app.schemas.invite_schemas import InviteCreate, InviteUpdate, InviteResponse, InviteListResponse, InviteBulkCreate, InviteBulkResponse
+from app.dependencies import Principal, get_db, get_current_user, get_email_service
 from app.services.email_service import EmailService
 from settings.config import settings
 from base64 import urlsafe_b64decode
 from uuid import UUID
+from typing import Optional
+from app.utils.link_generation import generate_pagination_links
+from qrcodegen.generation import load_qr_code_image, qr_code_version, qr_options
+from qrcodegen.rendering import CONTENT_TYPES
 
 router = APIRouter()
 
@@ -17,7 +21,7 @@ router = APIRouter()
 async def create_invite(
     invite_data: InviteCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     email_service: EmailService = Depends(get_email_service)
 ):
     """
@@ -25,7 +29,7 @@ async def create_invite(
     """
     new_invite = await InviteService.create_invitation(
         session=db,
-        user_id=current_user["user_uuid"],
+        user_id=current_user.user_id,
         invitee_email=invite_data.invitee_email,
         nickname=invite_data.nickname,
         email_service=email_service
@@ -36,12 +40,38 @@ async def create_invite(
     return new_invite
 
 
+@router.post("/invites/bulk", response_model=InviteBulkResponse, status_code=201, name="create_invites_bulk", tags=["Invitations with MinIO (Authentication Required)"])
+async def create_invites_bulk(
+    invite_data: InviteBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    email_service: EmailService = Depends(get_email_service)
+):
+    """
+    Create invitations for many invitees at once and report the outcome for each row.
+    Batches larger than `invite_bulk_max_size` are rejected with 422 while the body is validated.
+    """
+    results = await InviteService.create_invitations_bulk(
+        session=db,
+        user_id=current_user.user_id,
+        invitees=[invitee.model_dump() for invitee in invite_data.invitees],
+        email_service=email_service
+    )
+    statuses = [result["status"] for result in results]
+    return InviteBulkResponse(
+        items=results,
+        created=statuses.count("created"),
+        rejected=statuses.count("rejected"),
+        failed=statuses.count("failed")
+    )
+
+
 @router.put("/invites/{invite_id}", response_model=InviteResponse, name="update_invite", tags=["Invitations with MinIO (Authentication Required)"])
 async def update_invite(
     invite_id: UUID,
     invite_data: InviteUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Update an invitation by ID.
@@ -50,7 +80,7 @@ async def update_invite(
         session=db,
         invite_id=invite_id,
         update_data=invite_data.dict(exclude_unset=True),
-        user_id=current_user["user_uuid"]
+        user_id=current_user.user_id
     )
     if not updated_invite:
         raise HTTPException(status_code=404, detail="Invitation not found.")
@@ -61,34 +91,102 @@ async def update_invite(
 async def get_invite_by_code(
     invite_code: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Retrieve an invitation by its invite code.
     """
-    invite = await InviteService.get_invitation_by_code(session=db, invite_code=invite_code, user_id=current_user["user_uuid"])
+    invite = await InviteService.get_invitation_by_code(session=db, invite_code=invite_code, user_id=current_user.user_id)
     if not invite:
         raise HTTPException(status_code=404, detail="Invitation not found.")
     return invite
 
 
+QR_CODE_IMMUTABLE = "public, max-age=31536000, immutable"
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+@router.get("/invites/{invite_code}/qr.{image_format}", name="get_invite_qr_code", response_class=Response, tags=["Invitations with MinIO (Authentication Required)"])
+async def get_invite_qr_code(invite_code: str, image_format: str, request: Request, v: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+    """
+    Serve the QR code for an invitation as `qr.png` or `qr.svg`, rendering and storing it on first request.
+    The invite code is the credential, so invitees can load the image from their email without logging in.
+    Responses carry a content-hash ETag and answer a matching If-None-Match with 304; the versioned URL
+    embedded in emails is cacheable as immutable.
+    """
+    if image_format not in CONTENT_TYPES:
+        raise HTTPException(status_code=404, detail="Unsupported QR image format.")
+    invite = await InviteService.get_invitation_by_code(session=db, invite_code=invite_code)
+    if not invite:
+        raise HTTPException(status_code=404, detail="Invitation not found.")
+    options = qr_options(image_format)
+    version = qr_code_version(invite.nickname, invite.invite_code, options)
+    headers = {
+        "ETag": f'"{version}"',
+        # An unversioned or outdated URL may show a different image later, so it must be revalidated
+        "Cache-Control": QR_CODE_IMMUTABLE if v == version else "no-cache",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    image = await load_qr_code_image(invite.nickname, invite.invite_code, options)
+    return Response(content=image, media_type=options.content_type, headers=headers)
+
+
 @router.get("/invites/", response_model=InviteListResponse, name="list_invites", tags=["Invitations with MinIO (Authentication Required)"])
 async def list_invites(
+    request: Request,
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = None,
+    include_total: Optional[CountStrategy] = None,
+    used: Optional[bool] = None,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
-    List all invitations created by the current user.
+    List all invitations created by the current user, oldest first.
+    - Follow the `next`/`prev` links (opaque `cursor` tokens) to page through without OFFSET.
+    - `skip` is still accepted for existing clients but gets slower on deep pages; its total is always exact.
+    - `include_total` picks how the total is computed (exact, cached, estimate or none; defaults to the
+      `invites_count_strategy` setting).
+    - `used=false` lists only pending invitations, `used=true` only accepted ones.
     """
-    invites, total = await InviteService.list_invitations_for_user(
-        session=db,
-        user_id=current_user["user_uuid"],
-        skip=skip,
-        limit=limit
+    if skip and not cursor:
+        invites, total = await InviteService.list_invitations_for_user(
+            session=db,
+            user_id=current_user.user_id,
+            skip=skip,
+            limit=limit,
+            used=used
+        )
+        links = generate_pagination_links(request, skip, limit, total)
+        return InviteListResponse(items=invites, total=total, page=skip // limit + 1, size=limit, links=links)
+
+    strategy = include_total or CountStrategy(settings.invites_count_strategy)
+    try:
+        page = await InviteService.list_invitations_page(
+            session=db,
+            user_id=current_user.user_id,
+            limit=limit,
+            cursor=cursor,
+            count_strategy=strategy,
+            used=used
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+    links = generate_pagination_links(request, skip, limit, page.total, page)
+    return InviteListResponse(
+        items=page.items,
+        total=page.total,
+        total_is_estimate=strategy == CountStrategy.ESTIMATE,
+        page=None if cursor else 1,
+        size=limit,
+        links=links
     )
-    return InviteListResponse(items=invites, total=total, page=skip // limit + 1, size=limit)
 
 @router.get("/accept",include_in_schema=False, name="accept_invite", tags=["Invitations with MinIO (Authentication Required)"])
 async def accept_invite(
@@ -100,24 +198,23 @@ async def accept_invite(
     Scan a QR code and validate the invitation.
     - The invite code and nickname are passed as URL parameters.
     - Validates the invite code and checks if the nickname matches.
-    - Marks the invitation as used if valid.
+    - Marks the invitation as used if valid; an invitation can only be accepted once.
     - Returns the redirect URL to proceed with the flow.
     """
     try:
         # Decode the nickname from Base64 URL encoding
         decoded_nickname = urlsafe_b64decode(nickname).decode('utf-8')
 
-        # Retrieve the invitation by its code
-        invitation = await InviteService.get_invitation_by_code(session=db, invite_code=invite_code)
+        # Validate and mark the invitation as used in one statement
+        invitation = await InviteService.accept_invitation(session=db, invite_code=invite_code, nickname=decoded_nickname)
         if not invitation:
-            raise HTTPException(status_code=400, detail="Invalid or expired invite code.")
-        
-        # Check if the decoded nickname matches the invitation's nickname
-        if invitation.nickname != decoded_nickname:
-            raise HTTPException(status_code=400, detail="Invalid invitation nickname.")
-
-        # Mark the invitation as used
-        await InviteService.mark_invitation_as_used(session=db, invite_id=invitation.id)
+            # Only rejected scans pay for a second query to explain why
+            invitation = await InviteService.get_invitation_by_code(session=db, invite_code=invite_code)
+            if not invitation:
+                raise HTTPException(status_code=400, detail="Invalid or expired invite code.")
+            if invitation.nickname != decoded_nickname:
+                raise HTTPException(status_code=400, detail="Invalid invitation nickname.")
+            raise HTTPException(status_code=400, detail="Invitation has already been used.")
 
         # Return the redirect URL for further processing (the front-end should handle this)
         return RedirectResponse(url=settings.redirect_base_url)
@@ -131,7 +228,7 @@ async def resend_invitation(
     invite_id: UUID,
     db: AsyncSession = Depends(get_db),
     email_service: EmailService = Depends(get_email_service),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Resend an existing invitation email by its ID.
@@ -140,7 +237,7 @@ async def resend_invitation(
         session=db,
         invite_id=invite_id,
         email_service=email_service,
-        user_id= current_user["user_uuid"]
+        user_id= current_user.user_id
     )
     if not success:
         raise HTTPException(status_code=404, detail="Invitation not found or could not be resent.")
@@ -149,7 +246,7 @@ async def resend_invitation(
 @router.delete("/invites/{invite_id}", name="delete_invite", tags=["Invitations with MinIO (Authentication Required)"])
 async def delete_invitation(
     invite_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -160,7 +257,7 @@ async def delete_invitation(
         deleted = await InviteService.delete_invitation(
             session=db,
             invite_id=invite_id,
-            user_id=current_user["user_uuid"]
+            user_id=current_user.user_id
         )
 
         if not deleted:
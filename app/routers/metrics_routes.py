@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+from app.database import Database
+from app.dependencies import Principal, require_role
+from app.schemas.metrics_schemas import DatabasePoolMetrics, PasswordHasherMetrics
+from app.utils.password_hasher import password_hasher
+
+router = APIRouter()
+
+
+@router.get("/metrics/db-pool", response_model=DatabasePoolMetrics, name="db_pool_metrics", tags=["Metrics (Admin Role Required)"])
+async def db_pool_metrics(current_user: Principal = Depends(require_role(["ADMIN"]))):
+    """
+    Live statistics for this worker's database connection pool, for sizing the pool and spotting acquire stalls.
+    """
+    return Database.pool_stats()
+
+
+@router.get("/metrics/password-hasher", response_model=PasswordHasherMetrics, name="password_hasher_metrics", tags=["Metrics (Admin Role Required)"])
+async def password_hasher_metrics(current_user: Principal = Depends(require_role(["ADMIN"]))):
+    """
+    Queue depth, rejections and per-call timings of this worker's password hashing pool.
+    """
+    return password_hasher.stats()
@@ -20,24 +20,25 @@ Key Highlights:
 
 from builtins import dict, int, len, str
 from datetime import timedelta
+from typing import Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Response, status, Request
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.dependencies import get_current_user, get_db, get_email_service, require_role
+from app.dependencies import Principal, get_current_user, get_db, get_email_service, require_role
 from app.schemas.pagination_schema import EnhancedPagination
 from app.schemas.token_schema import TokenResponse
 from app.schemas.user_schemas import LoginRequest, UserBase, UserCreate, UserListResponse, UserResponse, UserUpdate
-from app.services.user_service import UserService
+from app.services.count_service import CountStrategy
+from app.services.user_service import AccountLockedError, UserService
 from app.services.jwt_service import create_access_token
 from app.utils.link_generation import create_user_links, generate_pagination_links
 from app.dependencies import get_settings
 from app.services.email_service import EmailService
 router = APIRouter()
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 settings = get_settings()
 @router.get("/users/{user_id}", response_model=UserResponse, name="get_user", tags=["User Management Requires (Admin or Manager Roles)"])
-async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(require_role(["ADMIN", "MANAGER"]))):
     """
     Endpoint to fetch a user by their unique identifier (UUID).
 
@@ -48,7 +49,7 @@ async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(g
         user_id: UUID of the user to fetch.
         request: The request object, used to generate full URLs in the response.
         db: Dependency that provides an AsyncSession for database access.
-        token: The OAuth2 access token obtained through OAuth2PasswordBearer dependency.
+        current_user: The authenticated caller, decoded from the OAuth2 bearer token.
     """
     user = await UserService.get_by_id(db, user_id)
     if not user:
@@ -79,7 +80,7 @@ async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(g
 # experience by adhering to REST principles and providing self-discoverable operations.
 
 @router.put("/users/{user_id}", response_model=UserResponse, name="update_user", tags=["User Management Requires (Admin or Manager Roles)"])
-async def update_user(user_id: UUID, user_update: UserUpdate, request: Request, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+async def update_user(user_id: UUID, user_update: UserUpdate, request: Request, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(require_role(["ADMIN", "MANAGER"]))):
     """
     Update user information.
 
@@ -110,7 +111,7 @@ async def update_user(user_id: UUID, user_update: UserUpdate, request: Request,
 
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT, name="delete_user", tags=["User Management Requires (Admin or Manager Roles)"])
-async def delete_user(user_id: UUID, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+async def delete_user(user_id: UUID, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(require_role(["ADMIN", "MANAGER"]))):
     """
     Delete a user by their ID.
 
@@ -124,7 +125,7 @@ async def delete_user(user_id: UUID, db: AsyncSession = Depends(get_db), token:
 
 
 @router.post("/users/", response_model=UserResponse, status_code=status.HTTP_201_CREATED, tags=["User Management Requires (Admin or Manager Roles)"], name="create_user")
-async def create_user(user: UserCreate, request: Request, db: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+async def create_user(user: UserCreate, request: Request, db: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service), current_user: Principal = Depends(require_role(["ADMIN", "MANAGER"]))):
     """
     Create a new user.
 
@@ -170,23 +171,45 @@ async def list_users(
     request: Request,
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = None,
+    include_total: Optional[CountStrategy] = None,
     db: AsyncSession = Depends(get_db),
-    current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))
+    current_user: Principal = Depends(require_role(["ADMIN", "MANAGER"]))
 ):
-    total_users = await UserService.count(db)
-    users = await UserService.list_users(db, skip, limit)
+    """
+    List users, oldest first. `include_total` overrides how the total is computed
+    (exact, cached, estimate or none; defaults to the `users_count_strategy` setting).
+    """
+    strategy = include_total or CountStrategy(settings.users_count_strategy)
+    page = None
+    if skip and not cursor:
+        # Legacy offset pagination, kept for existing clients; its links need some total to find the last page
+        if strategy == CountStrategy.NONE:
+            strategy = CountStrategy.ESTIMATE
+        total_users = await UserService.count(db, strategy)
+        users = await UserService.list_users(db, skip, limit)
+        page_number = skip // limit + 1
+    else:
+        try:
+            page = await UserService.list_users_page(db, limit, cursor, count_strategy=strategy)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+        users = page.items
+        total_users = page.total
+        page_number = None if cursor else 1
 
     user_responses = [
         UserResponse.model_validate(user) for user in users
     ]
     
-    pagination_links = generate_pagination_links(request, skip, limit, total_users)
+    pagination_links = generate_pagination_links(request, skip, limit, total_users, page)
     
     # Construct the final response with pagination details
     return UserListResponse(
         items=user_responses,
         total=total_users,
-        page=skip // limit + 1,
+        total_is_estimate=strategy == CountStrategy.ESTIMATE,
+        page=page_number,
         size=len(user_responses),
         links=pagination_links  # Ensure you have appropriate logic to create these links
     )
@@ -201,10 +224,10 @@ async def register(user_data: UserCreate, session: AsyncSession = Depends(get_db
 
 @router.post("/login/", response_model=TokenResponse, tags=["Login and Registration"])
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_db)):
-    if await UserService.is_account_locked(session, form_data.username):
+    try:
+        user = await UserService.login_user(session, form_data.username, form_data.password)
+    except AccountLockedError:
         raise HTTPException(status_code=400, detail="Account locked due to too many failed login attempts.")
-
-    user = await UserService.login_user(session, form_data.username, form_data.password)
     if user:
         access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
 
@@ -216,23 +239,6 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Async
         return {"access_token": access_token, "token_type": "bearer"}
     raise HTTPException(status_code=401, detail="Incorrect email or password.")
 
-@router.post("/login/", include_in_schema=False, response_model=TokenResponse, tags=["Login and Registration"])
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_db)):
-    if await UserService.is_account_locked(session, form_data.username):
-        raise HTTPException(status_code=400, detail="Account locked due to too many failed login attempts.")
-
-    user = await UserService.login_user(session, form_data.username, form_data.password)
-    if user:
-        access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-
-        access_token = create_access_token(
-            data={"sub": user.email, "role": str(user.role.name)},
-            expires_delta=access_token_expires
-        )
-
-        return {"access_token": access_token, "token_type": "bearer"}
-    raise HTTPException(status_code=401, detail="Incorrect email or password.")
-
 
 @router.get("/verify-email/{user_id}/{token}", status_code=status.HTTP_200_OK, name="verify_email", tags=["Login and Registration"])
 async def verify_email(user_id: UUID, token: str, db: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service)):
@@ -3,6 +3,8 @@ from uuid import UUID
 from datetime import datetime
 from typing import Optional, List
 import uuid
+from app.schemas.pagination_schema import PaginationLink
+from settings.config import settings
 
 class InviteCreate(BaseModel):
     invitee_email: EmailStr = Field(..., example="invitee@example.com")
@@ -37,6 +39,27 @@ class InviteListResponse(BaseModel):
             "used_at": None
         }
     ])
-    total: int = Field(..., example=100)
-    page: int = Field(..., example=1)
+    total: Optional[int] = Field(None, example=100, description="Total matching items; None when the count was skipped.")
+    total_is_estimate: bool = Field(False, description="Whether `total` is a planner estimate rather than an exact count.")
+    page: Optional[int] = Field(None, example=1, description="Page number for offset pagination; None when paginating by cursor.")
     size: int = Field(..., example=10)
+    links: List[PaginationLink] = []
+
+class InviteBulkCreate(BaseModel):
+    invitees: List[InviteCreate] = Field(..., min_length=1, max_length=settings.invite_bulk_max_size, example=[
+        {"invitee_email": "invitee@example.com", "nickname": "john_doe123"}
+    ])
+
+class InviteBulkItemResult(BaseModel):
+    invitee_email: str
+    nickname: str
+    status: str = Field(..., example="created", description="created, rejected (row not inserted) or failed (row inserted but QR/email delivery failed)")
+    id: Optional[UUID] = None
+    invite_code: Optional[str] = None
+    detail: Optional[str] = None
+
+class InviteBulkResponse(BaseModel):
+    items: List[InviteBulkItemResult]
+    created: int = Field(..., example=98)
+    rejected: int = Field(..., example=1)
+    failed: int = Field(..., example=1)
@@ -0,0 +1,43 @@
+from builtins import float, int
+from pydantic import BaseModel, Field
+
+class DatabasePoolMetrics(BaseModel):
+    pool_size: int = Field(..., description="Connections the pool keeps open.")
+    max_overflow: int = Field(..., description="Extra connections allowed beyond pool_size.")
+    checked_in: int = Field(..., description="Idle connections available in the pool.")
+    checked_out: int = Field(..., description="Connections currently in use.")
+    overflow: int = Field(..., description="Overflow connections currently open.")
+    acquisitions: int = Field(..., description="Successful connection checkouts since startup.")
+    timeouts: int = Field(..., description="Checkouts that gave up after the pool timeout.")
+    wait_seconds_total: float = Field(..., description="Total time spent waiting for connections.")
+    wait_seconds_max: float = Field(..., description="Longest single wait for a connection.")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "pool_size": 5,
+                "max_overflow": 10,
+                "checked_in": 3,
+                "checked_out": 2,
+                "overflow": 0,
+                "acquisitions": 1520,
+                "timeouts": 0,
+                "wait_seconds_total": 0.84,
+                "wait_seconds_max": 0.031
+            }
+        }
+
+class PasswordOperationMetrics(BaseModel):
+    calls: int = Field(..., description="Completed calls since startup.")
+    wait_seconds_total: float = Field(..., description="Total time calls spent queued for a worker.")
+    wait_seconds_max: float = Field(..., description="Longest single queue wait.")
+    run_seconds_total: float = Field(..., description="Total time spent hashing or verifying passwords.")
+    run_seconds_max: float = Field(..., description="Longest single hash or verify call.")
+
+class PasswordHasherMetrics(BaseModel):
+    max_workers: int = Field(..., description="Threads hashing passwords.")
+    max_pending: int = Field(..., description="Calls allowed to queue before requests are rejected.")
+    in_flight: int = Field(..., description="Calls currently running or queued.")
+    rejected: int = Field(..., description="Calls rejected with 429 since startup.")
+    hash: PasswordOperationMetrics
+    verify: PasswordOperationMetrics
@@ -8,6 +8,7 @@ import uuid
 import re
 from app.models.user_model import UserRole
 from app.utils.nickname_gen import generate_nickname
+from app.schemas.pagination_schema import PaginationLink
 
 
 def validate_url(url: Optional[str]) -> Optional[str]:
@@ -101,6 +102,8 @@ class UserListResponse(BaseModel):
         "linkedin_profile_url": "https://linkedin.com/in/johndoe", 
         "github_profile_url": "https://github.com/johndoe"
     }])
-    total: int = Field(..., example=100)
-    page: int = Field(..., example=1)
+    total: Optional[int] = Field(None, example=100, description="Total matching items; None when the count was skipped.")
+    total_is_estimate: bool = Field(False, description="Whether `total` is a planner estimate rather than an exact count.")
+    page: Optional[int] = Field(None, example=1, description="Page number for offset pagination; None when paginating by cursor.")
     size: int = Field(..., example=10)
+    links: List[PaginationLink] = []
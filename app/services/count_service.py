@@ -0,0 +1,135 @@
+from sqlalchemy import Select, event, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from enum import Enum
+from typing import Dict, Optional, Set, Tuple
+import json
+import threading
+import time
+from settings.config import settings
+
+class CountStrategy(str, Enum):
+    EXACT = "exact"          # count(*), fetched alongside the page where possible
+    CACHED = "cached"        # exact count reused for `count_cache_ttl_seconds`, dropped when rows are added or removed
+    ESTIMATE = "estimate"    # planner estimate from pg_class.reltuples or EXPLAIN; cheap but approximate
+    NONE = "none"            # skip the total entirely
+
+class CountService:
+    # Cached totals keyed by (table name, scope), each holding (expires_at, count)
+    _cache: Dict[Tuple[str, str], Tuple[float, int]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def invalidate(cls, table_name: str):
+        """
+        Drop every cached total for a table.
+        :param table_name: Name of the table whose rows were inserted or deleted.
+        """
+        with cls._lock:
+            for key in [key for key in cls._cache if key[0] == table_name]:
+                del cls._cache[key]
+
+    @classmethod
+    def clear(cls):
+        """Drop every cached total."""
+        with cls._lock:
+            cls._cache.clear()
+
+    @staticmethod
+    def _count_query(query: Select) -> Select:
+        return select(func.count()).select_from(query.order_by(None).subquery())
+
+    @classmethod
+    async def exact(cls, session: AsyncSession, query: Select) -> int:
+        """
+        Count the rows matched by a query.
+        :param session: Database session.
+        :param query: SELECT whose rows should be counted.
+        :return: Number of rows.
+        """
+        return (await session.execute(cls._count_query(query))).scalar() or 0
+
+    @classmethod
+    async def cached(cls, session: AsyncSession, query: Select, table_name: str, scope: str = "") -> int:
+        """
+        Return an exact count, reusing a previous result for `count_cache_ttl_seconds`.
+        :param session: Database session.
+        :param query: SELECT whose rows should be counted.
+        :param table_name: Table the query reads, used for invalidation.
+        :param scope: Distinguishes differently filtered queries over the same table.
+        :return: Number of rows.
+        """
+        key = (table_name, scope)
+        with cls._lock:
+            entry = cls._cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        count = await cls.exact(session, query)
+        with cls._lock:
+            cls._cache[key] = (time.monotonic() + settings.count_cache_ttl_seconds, count)
+        return count
+
+    @classmethod
+    async def estimate(cls, session: AsyncSession, query: Select, table_name: str) -> int:
+        """
+        Estimate the rows matched by a query from planner statistics without scanning the table.
+        Unfiltered queries read `pg_class.reltuples`; filtered ones use the row estimate of their EXPLAIN plan.
+        Tables that have never been analyzed fall back to an exact count.
+        :param session: Database session.
+        :param query: SELECT whose rows should be estimated.
+        :param table_name: Table the query reads.
+        :return: Estimated number of rows.
+        """
+        if query.whereclause is None:
+            result = await session.execute(
+                text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table_name)"), {"table_name": table_name}
+            )
+            reltuples = result.scalar()
+            if reltuples is None or reltuples < 0:
+                return await cls.exact(session, query)
+            return int(reltuples)
+        # Queries here are built by the services, so their bound values are safe to inline for EXPLAIN
+        compiled = query.order_by(None).compile(dialect=session.bind.dialect, compile_kwargs={"literal_binds": True})
+        # Run as driver SQL: text() would read any ':word' inside the inlined string literals as a bind parameter
+        connection = await session.connection()
+        plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @classmethod
+    async def count(cls, session: AsyncSession, query: Select, strategy: CountStrategy, table_name: str, scope: str = "") -> Optional[int]:
+        """
+        Count the rows matched by a query using the given strategy.
+        :param session: Database session.
+        :param query: SELECT whose rows should be counted.
+        :param strategy: How to count; NONE returns None.
+        :param table_name: Table the query reads.
+        :param scope: Cache scope for the CACHED strategy.
+        :return: Number of rows, or None.
+        """
+        if strategy == CountStrategy.EXACT:
+            return await cls.exact(session, query)
+        if strategy == CountStrategy.CACHED:
+            return await cls.cached(session, query, table_name, scope)
+        if strategy == CountStrategy.ESTIMATE:
+            return await cls.estimate(session, query, table_name)
+        return None
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_tables(session, flush_context):
+    changed: Set[str] = session.info.setdefault("count_invalidations", set())
+    for instance in list(session.new) + list(session.deleted):
+        table = getattr(instance, "__tablename__", None)
+        if table:
+            changed.add(table)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tables(session):
+    # Only drop cached totals once the inserts and deletes are visible to other sessions
+    for table in session.info.pop("count_invalidations", ()):
+        CountService.invalidate(table)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_tables(session):
+    session.info.pop("count_invalidations", None)
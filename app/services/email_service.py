@@ -5,16 +5,19 @@ from app.utils.smtp_connection import SMTPClient
 from app.utils.template_manager import TemplateManager
 from app.models.user_model import User
 from app.models.invite_model import Invitation
-from base64 import urlsafe_b64encode
+from qrcodegen.generation import generate_qr_data, qr_code_url_for, render_qr_code_png
+
+# Shared so every EmailService reuses the same pooled SMTP connections
+smtp_client = SMTPClient(
+    server=settings.smtp_server,
+    port=settings.smtp_port,
+    username=settings.smtp_username,
+    password=settings.smtp_password
+)
 
 class EmailService:
-    def __init__(self, template_manager: TemplateManager):
-        self.smtp_client = SMTPClient(
-            server=settings.smtp_server,
-            port=settings.smtp_port,
-            username=settings.smtp_username,
-            password=settings.smtp_password
-        )
+    def __init__(self, template_manager: TemplateManager, smtp_client: SMTPClient = smtp_client):
+        self.smtp_client = smtp_client
         self.template_manager = template_manager
 
     async def send_user_email(self, user_data: dict, email_type: str):
@@ -28,7 +31,7 @@ class EmailService:
             raise ValueError("Invalid email type")
 
         html_content = self.template_manager.render_template(email_type, **user_data)
-        self.smtp_client.send_email(subject_map[email_type], html_content, user_data['email'])
+        await self.smtp_client.send_email_async(subject_map[email_type], html_content, user_data['email'])
 
     async def send_verification_email(self, user: User):
         verification_url = f"{settings.server_base_url}verify-email/{user.id}/{user.verification_token}"
@@ -40,18 +43,24 @@ class EmailService:
 
     async def send_invite_email(self, invite: Invitation):
         """
-        Sends an invitation email to the invitee with a QR code attached.
+        Sends an invitation email to the invitee with a QR code.
+        With `email_inline_qr_code` the PNG is rendered in memory and embedded as an inline CID image, so opening
+        the email fetches nothing; otherwise the email links to the invitation's QR endpoint.
         :param invite: Invitation object containing the invite details.
         :return: None
         """
         try:
             # Generate the invite link URL
-            base64_nickname = urlsafe_b64encode(invite.nickname.encode('utf-8')).decode('utf-8')
-            invite_url = f"{settings.server_base_url}accept?nickname={base64_nickname}&invite_code={invite.invite_code}"
+            invite_url = generate_qr_data(invite.nickname, invite.invite_code)
 
-            # The URL for the QR code image already stored in Minio
-            qr_code_url = f"http://localhost:9000/{settings.minio_bucket}/invite_{invite.invite_code}.png"
-            print(qr_code_url)
+            inline_images = None
+            if settings.email_inline_qr_code:
+                content_id = f"qr-{invite.invite_code}@invite"
+                inline_images = {content_id: await render_qr_code_png(invite.nickname, invite.invite_code)}
+                qr_code_url = f"cid:{content_id}"
+            else:
+                # The versioned URL of the QR endpoint, which renders and stores the image on first request
+                qr_code_url = qr_code_url_for(invite.nickname, invite.invite_code)
 
             # Prepare the email content using the template
             user_data = {
@@ -64,10 +73,11 @@ class EmailService:
             html_content = self.template_manager.render_template("invite_email", **user_data)
 
             # Send the email with the QR code as an embedded image
-            self.smtp_client.send_email(
+            await self.smtp_client.send_email_async(
                 subject="You're Invited to Join",
                 html_content=html_content,
-                recipient=invite.invitee_email
+                recipient=invite.invitee_email,
+                inline_images=inline_images
             )
             print(f"Invitation email sent to {invite.invitee_email}")
         except Exception as e:
@@ -0,0 +1,103 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+import logging
+from app.models.invite_model import Invitation
+from app.utils.cache import CacheBackend, InMemorySharedCache, LocalTTLCache, RedisCache, TieredCache
+from settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+def build_cache_backend() -> Optional[CacheBackend]:
+    """Create the invite cache backend selected by `invite_cache_backend`, or None when caching is disabled."""
+    if not settings.invite_cache_enabled:
+        return None
+    local = LocalTTLCache(max_entries=settings.invite_cache_max_entries)
+    if settings.invite_cache_backend == "local":
+        return local
+    if settings.invite_cache_backend == "memory":
+        shared = InMemorySharedCache()
+    elif settings.invite_cache_backend == "redis":
+        shared = RedisCache(settings.invite_cache_redis_url, prefix="invite:")
+    else:
+        raise ValueError(f"Unknown invite cache backend: {settings.invite_cache_backend}")
+    return TieredCache(local, shared, local_ttl=settings.invite_cache_local_ttl_seconds)
+
+def cache_ttl() -> float:
+    """
+    Lifetime of cached invitations. The local backend has no shared tier, so an invalidation never reaches
+    the other workers' copies; entries are then held for `invite_cache_local_ttl_seconds` to bound that staleness.
+    """
+    if settings.invite_cache_backend == "local":
+        return min(settings.invite_cache_ttl_seconds, settings.invite_cache_local_ttl_seconds)
+    return settings.invite_cache_ttl_seconds
+
+class InviteCache:
+    """
+    Read-through cache of invitations keyed by invite code.
+    Only hits are cached; writers must call `invalidate` after committing a change to an invitation.
+    A cache failure never fails the lookup, it just falls through to the database.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def _serialize(invitation: Invitation) -> dict:
+        return {
+            "id": str(invitation.id),
+            "invitee_email": invitation.invitee_email,
+            "invite_code": invitation.invite_code,
+            "user_id": str(invitation.user_id) if invitation.user_id else None,
+            "created_at": invitation.created_at.isoformat() if invitation.created_at else None,
+            "used": invitation.used,
+            "used_at": invitation.used_at.isoformat() if invitation.used_at else None,
+            "nickname": invitation.nickname,
+        }
+
+    @staticmethod
+    def _deserialize(data: dict) -> Invitation:
+        # A detached, read-only copy: it belongs to no session and must not be added to one
+        return Invitation(
+            id=UUID(data["id"]),
+            invitee_email=data["invitee_email"],
+            invite_code=data["invite_code"],
+            user_id=UUID(data["user_id"]) if data["user_id"] else None,
+            created_at=datetime.fromisoformat(data["created_at"]) if data["created_at"] else None,
+            used=data["used"],
+            used_at=datetime.fromisoformat(data["used_at"]) if data["used_at"] else None,
+            nickname=data["nickname"],
+        )
+
+    async def get(self, invite_code: str) -> Optional[Invitation]:
+        if self.backend is None:
+            return None
+        try:
+            data = await self.backend.get(invite_code)
+        except Exception as e:
+            logger.warning(f"Invite cache read failed: {e}")
+            return None
+        return self._deserialize(data) if data is not None else None
+
+    async def set(self, invitation: Invitation):
+        if self.backend is None:
+            return
+        try:
+            await self.backend.set(invitation.invite_code, self._serialize(invitation), self.ttl)
+        except Exception as e:
+            logger.warning(f"Invite cache write failed: {e}")
+
+    async def invalidate(self, invite_code: str):
+        if self.backend is None or not invite_code:
+            return
+        try:
+            await self.backend.delete(invite_code)
+        except Exception as e:
+            logger.error(f"Invite cache invalidation failed for {invite_code}: {e}")
+
+    async def close(self):
+        if self.backend is not None:
+            await self.backend.close()
+
+invite_cache = InviteCache(build_cache_backend(), ttl=cache_ttl())
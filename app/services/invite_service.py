@@ -1,14 +1,23 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import update, select, func, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import joinedload
 from uuid import UUID
+from app.models.email_outbox_model import EmailOutbox
 from app.models.invite_model import Invitation
 from app.services.email_service import EmailService
+from app.services.count_service import CountService, CountStrategy
+from app.services.invite_cache import invite_cache
+from app.services.outbox_service import OutboxService
+from app.utils.pagination import CursorPage, keyset_paginate
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Optional, List, Dict
+import asyncio
 import secrets
+import uuid
 import logging
-from qrcodegen.generation import generate_qr_code, store_qr_code_in_minio
+from qrcodegen.generation import qr_code_url_for
+from settings.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -34,12 +43,12 @@ class InviteService:
         email_service: EmailService
     ) -> Optional[Invitation]:
         """
-        Create an invitation linked to a user with a unique invite code and generate/store a QR code.
+        Create an invitation linked to a user with a unique invite code. Its QR code is rendered lazily when first requested.
         :param session: Database session.
         :param user_id: ID of the user creating the invitation.
         :param invitee_email: Email address of the invitee.
         :param nickname: Nickname for the invitation.
-        :param email_service: EmailService instance for sending emails.
+        :param email_service: EmailService instance, used only when the email outbox is disabled.
         :return: Created Invitation object or None.
         """
         try:
@@ -48,6 +57,7 @@ class InviteService:
             
             # Create new invitation record
             new_invite = Invitation(
+                id=uuid.uuid4(),
                 invitee_email=invitee_email,
                 invite_code=invite_code,
                 user_id=user_id,
@@ -56,19 +66,16 @@ class InviteService:
                 used=False,
             )
             session.add(new_invite)
+            # Queue the invitation email in the same transaction as the invitation
+            if settings.email_outbox_enabled:
+                OutboxService.enqueue_invite_email(session, new_invite.id)
             await session.commit()
 
-            # Generate QR code and store it in Minio
-            img_stream = generate_qr_code(invite_code)
-            qr_data = store_qr_code_in_minio(user_id, nickname, invite_code, img_stream)
-
-            # Set QR code URL in the invitation object
-            new_invite.qr_code_url = qr_data["url"]
-            session.add(new_invite)
-            await session.commit()
+            # The QR code is rendered and stored on first request to this URL, not here
+            new_invite.qr_code_url = qr_code_url_for(nickname, invite_code)
 
-            # Send invitation email
-            await email_service.send_invite_email(new_invite)
+            if not settings.email_outbox_enabled:
+                await email_service.send_invite_email(new_invite)
 
             return new_invite
         except Exception as e:
@@ -76,16 +83,140 @@ class InviteService:
             return None
 
     @classmethod
-    async def get_invitation_by_code(cls, session: AsyncSession, invite_code: str) -> Optional[Invitation]:
+    async def create_invitations_bulk(
+        cls,
+        session: AsyncSession,
+        user_id: UUID,
+        invitees: List[Dict[str, str]],
+        email_service: EmailService
+    ) -> List[Dict]:
         """
-        Retrieve an invitation by its unique invite code.
+        Create invitations for many invitees at once.
+        Rows and their outbox emails are written with multi-row INSERT statements and committed in a single
+        transaction; emails not handled by the outbox are then sent through a bounded concurrent pipeline without touching the session.
+        :param session: Database session.
+        :param user_id: ID of the user creating the invitations.
+        :param invitees: List of dicts with `invitee_email` and `nickname` keys.
+        :param email_service: EmailService instance, used only when the email outbox is disabled.
+        :return: One result dict per invitee, in request order.
+        """
+        results = [
+            {"invitee_email": invitee["invitee_email"], "nickname": invitee["nickname"], "status": "rejected"}
+            for invitee in invitees
+        ]
+        pending = {}
+        rows = []
+        created_at = datetime.now(timezone.utc)
+        for result in results:
+            if result["invitee_email"] in pending:
+                result["detail"] = "Duplicate invitee email in request."
+                continue
+            pending[result["invitee_email"]] = result
+            rows.append({
+                "id": uuid.uuid4(),
+                "invitee_email": result["invitee_email"],
+                "invite_code": secrets.token_urlsafe(8),
+                "user_id": user_id,
+                "nickname": result["nickname"],
+                "created_at": created_at,
+                "used": False,
+            })
+
+        inserted = []
+        try:
+            batch_size = settings.invite_bulk_insert_batch_size
+            for start in range(0, len(rows), batch_size):
+                query = (
+                    pg_insert(Invitation)
+                    .values(rows[start:start + batch_size])
+                    .on_conflict_do_nothing(index_elements=[Invitation.invitee_email])
+                    .returning(Invitation)
+                )
+                batch = (await session.execute(query)).scalars().all()
+                if batch and settings.email_outbox_enabled:
+                    await session.execute(
+                        pg_insert(EmailOutbox).values(OutboxService.invite_email_rows([invite.id for invite in batch]))
+                    )
+                inserted.extend(batch)
+            await session.commit()
+            # Core INSERTs bypass the session's flush hooks, so drop cached totals explicitly
+            CountService.invalidate(Invitation.__tablename__)
+        except Exception as e:
+            logger.error(f"Error inserting bulk invitations: {e}")
+            await session.rollback()
+            for result in pending.values():
+                result["detail"] = "Error creating invitation."
+            return results
+
+        for result in pending.values():
+            result["detail"] = "Invitation already exists for this invitee."
+
+        semaphore = asyncio.Semaphore(settings.invite_bulk_concurrency)
+
+        async def deliver(invite: Invitation):
+            result = pending[invite.invitee_email]
+            result.update(id=invite.id, invite_code=invite.invite_code, detail=None)
+            async with semaphore:
+                try:
+                    invite.qr_code_url = qr_code_url_for(invite.nickname, invite.invite_code)
+                    if not settings.email_outbox_enabled:
+                        await email_service.send_invite_email(invite)
+                    result["status"] = "created"
+                except Exception as e:
+                    logger.error(f"Error delivering invitation {invite.id}: {e}")
+                    result["status"] = "failed"
+                    result["detail"] = str(e)
+
+        await asyncio.gather(*(deliver(invite) for invite in inserted))
+        return results
+
+    @classmethod
+    async def get_invitation_by_code(cls, session: AsyncSession, invite_code: str, user_id: Optional[UUID] = None) -> Optional[Invitation]:
+        """
+        Retrieve an invitation by its unique invite code, reading through the invite cache.
+        Cache hits return a detached copy, so treat the result as read-only.
         :param session: Database session.
         :param invite_code: Unique invite code.
+        :param user_id: If given, only return the invitation when it belongs to this user.
         :return: Invitation object or None.
         """
-        query = select(Invitation).where(Invitation.invite_code == invite_code)
+        invitation = await invite_cache.get(invite_code)
+        if invitation is None:
+            query = select(Invitation).where(Invitation.invite_code == invite_code)
+            result = await cls._execute_query(session, query)
+            invitation = result.scalars().first() if result else None
+            if invitation is not None:
+                await invite_cache.set(invitation)
+        if invitation is not None and user_id is not None and invitation.user_id != user_id:
+            return None
+        return invitation
+
+    @classmethod
+    async def accept_invitation(cls, session: AsyncSession, invite_code: str, nickname: str) -> Optional[Invitation]:
+        """
+        Atomically mark an unused invitation as used in a single UPDATE ... RETURNING round trip.
+        Concurrent scans of the same code race on the row lock, so only one of them can succeed.
+        :param session: Database session.
+        :param invite_code: Unique invite code.
+        :param nickname: Nickname the invitation was issued for.
+        :return: The accepted invitation, or None if no unused invitation matches.
+        """
+        query = (
+            update(Invitation)
+            .where(
+                Invitation.invite_code == invite_code,
+                Invitation.nickname == nickname,
+                Invitation.used.isnot(True)
+            )
+            .values(used=True, used_at=func.now())
+            .returning(Invitation)
+            .execution_options(populate_existing=True)
+        )
         result = await cls._execute_query(session, query)
-        return result.scalars().first() if result else None
+        invitation = result.scalars().first() if result else None
+        if invitation is not None:
+            await invite_cache.invalidate(invite_code)
+        return invitation
 
     @classmethod
     async def mark_invitation_as_used(cls, session: AsyncSession, invite_id: int) -> bool:
@@ -100,36 +231,86 @@ class InviteService:
                 update(Invitation)
                 .where(Invitation.id == invite_id)
                 .values(used=True, used_at=datetime.now(timezone.utc))
+                .returning(Invitation.invite_code)
                 .execution_options(synchronize_session="fetch")
             )
-            await cls._execute_query(session, query)
+            result = await cls._execute_query(session, query)
+            if result:
+                for invite_code in result.scalars():
+                    await invite_cache.invalidate(invite_code)
             return True
         except Exception as e:
             logger.error(f"Error marking invitation as used: {e}")
             return False
 
     @classmethod
-    async def list_invitations_for_user(cls, session: AsyncSession, user_id: UUID, skip: int = 0, limit: int = 10):
+    def _user_invitations_filter(cls, user_id: UUID, used: Optional[bool] = None):
+        # `used IS NOT TRUE` matches the partial index predicate, so pending-only listings read that small index
+        if used is None:
+            return Invitation.user_id == user_id
+        return and_(Invitation.user_id == user_id, Invitation.used.is_(True) if used else Invitation.used.isnot(True))
+
+    @classmethod
+    async def list_invitations_for_user(cls, session: AsyncSession, user_id: UUID, skip: int = 0, limit: int = 10, used: Optional[bool] = None):
         """
         List all invitations created by a specific user along with the total count.
         :param session: Database session.
         :param user_id: ID of the user.
         :param skip: Number of records to skip (pagination).
         :param limit: Maximum number of records to return (pagination).
+        :param used: Only list used (True) or pending (False) invitations; None lists both.
         :return: A tuple containing the list of invitations and the total count.
         """
         # Query to fetch invitations
-        query = select(Invitation).where(Invitation.user_id == user_id).offset(skip).limit(limit)
+        # The window count is evaluated before OFFSET/LIMIT, so the total arrives with the page
+        query = (
+            select(Invitation, func.count().over().label("total"))
+            .where(cls._user_invitations_filter(user_id, used))
+            .order_by(Invitation.created_at, Invitation.id)
+            .offset(skip)
+            .limit(limit)
+        )
         result = await cls._execute_query(session, query)
-        invites = result.scalars().all() if result else []
-
-        # Query to count total invitations
-        total_query = select(func.count(Invitation.id)).where(Invitation.user_id == user_id)
-        total_result = await session.execute(total_query)
-        total = total_result.scalar() or 0
+        rows = result.all() if result else []
+        invites = [row[0] for row in rows]
 
+        # A page past the end has no rows to carry the total
+        total = rows[0][1] if rows else await cls.count_invitations_for_user(session, user_id, used)
         return invites, total
 
+    @classmethod
+    async def list_invitations_page(cls, session: AsyncSession, user_id: UUID, limit: int = 10, cursor: Optional[str] = None,
+                                    count_strategy: CountStrategy = CountStrategy.NONE, used: Optional[bool] = None) -> CursorPage:
+        """
+        List a page of a user's invitations ordered by (created_at, id) using keyset pagination.
+        :param session: Database session.
+        :param user_id: ID of the user.
+        :param limit: Maximum number of records to return.
+        :param cursor: Opaque cursor from a previous page; None starts at the first page.
+        :param count_strategy: How to compute the page's `total`; exact totals come back with the page itself.
+        :param used: Only list used (True) or pending (False) invitations; None lists both.
+        :return: CursorPage of invitations with cursors for the neighbouring pages.
+        :raises ValueError: If the cursor is malformed.
+        """
+        query = select(Invitation).where(cls._user_invitations_filter(user_id, used))
+        page = await keyset_paginate(session, query, Invitation, limit, cursor, with_total=count_strategy == CountStrategy.EXACT)
+        if count_strategy not in (CountStrategy.EXACT, CountStrategy.NONE):
+            page.total = await CountService.count(session, query, count_strategy, Invitation.__tablename__, scope=f"{user_id}:{used}")
+        return page
+
+    @classmethod
+    async def count_invitations_for_user(cls, session: AsyncSession, user_id: UUID, used: Optional[bool] = None) -> int:
+        """
+        Count the invitations created by a specific user.
+        :param session: Database session.
+        :param user_id: ID of the user.
+        :param used: Only count used (True) or pending (False) invitations; None counts both.
+        :return: Number of invitations.
+        """
+        total_query = select(func.count(Invitation.id)).where(cls._user_invitations_filter(user_id, used))
+        total_result = await session.execute(total_query)
+        return total_result.scalar() or 0
+
     @classmethod
     async def resend_invitation(cls, session: AsyncSession, invite_id: UUID, user_id: UUID, email_service: EmailService) -> bool:
         """
@@ -183,6 +364,7 @@ class InviteService:
                 setattr(invitation, field, value)
 
             await session.commit()  # Commit the transaction
+            await invite_cache.invalidate(invitation.invite_code)
             await session.refresh(invitation)  # Refresh the instance to reflect updates
             return invitation
         except Exception as e:
@@ -211,6 +393,7 @@ class InviteService:
             # Delete the invitation
             await session.delete(invitation)
             await session.commit()
+            await invite_cache.invalidate(invitation.invite_code)
             return True
 
         except Exception as e:
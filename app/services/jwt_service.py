@@ -1,9 +1,119 @@
 # app/services/jwt_service.py
 from builtins import dict, str
+import hashlib
+import threading
+import time
 import jwt
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, ed448, rsa
+from cryptography.hazmat.primitives.serialization import load_pem_private_key, load_pem_public_key
 from settings.config import settings
 
+SYMMETRIC_ALGORITHMS = {"HS256", "HS384", "HS512"}
+
+class KeyRing:
+    """
+    Signing key plus every key accepted for verification, looked up by the token's `kid` header.
+    Keys are parsed once into key objects, so signing and verifying never re-read settings or PEM files.
+    Tokens without a `kid`, issued before key IDs were stamped, are checked against the signing key.
+    """
+
+    def __init__(self, signing_kid: str, algorithm: str, signing_key, verification_keys: Dict[str, Tuple[str, object]]):
+        self.signing_kid = signing_kid
+        self.algorithm = algorithm
+        self.signing_key = signing_key
+        self.verification_keys = verification_keys
+
+    def encode(self, payload: dict) -> str:
+        return jwt.encode(payload, self.signing_key, algorithm=self.algorithm, headers={"kid": self.signing_kid})
+
+    def decode(self, token: str) -> dict:
+        """
+        Verify a token's signature and claims.
+        :raises jwt.PyJWTError: If the token is malformed, expired, signed by an unknown key or not signed by its key.
+        """
+        kid = jwt.get_unverified_header(token).get("kid", self.signing_kid)
+        if kid not in self.verification_keys:
+            raise jwt.InvalidKeyError(f"Unknown key ID: {kid}")
+        algorithm, key = self.verification_keys[kid]
+        return jwt.decode(token, key, algorithms=[algorithm])
+
+def _algorithm_for(public_key) -> str:
+    if isinstance(public_key, (ed25519.Ed25519PublicKey, ed448.Ed448PublicKey)):
+        return "EdDSA"
+    if isinstance(public_key, ec.EllipticCurvePublicKey):
+        return {"secp256r1": "ES256", "secp384r1": "ES384", "secp521r1": "ES512"}[public_key.curve.name]
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return "RS256"
+    raise ValueError(f"Unsupported JWT public key type: {type(public_key).__name__}")
+
+def _read_pem(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
+
+def build_key_ring(settings) -> KeyRing:
+    if settings.jwt_algorithm in SYMMETRIC_ALGORITHMS:
+        signing_key = verification_key = settings.jwt_secret_key.encode("utf-8")
+    else:
+        if not settings.jwt_private_key_file:
+            raise ValueError(f"jwt_private_key_file is required for {settings.jwt_algorithm} tokens")
+        signing_key = load_pem_private_key(_read_pem(settings.jwt_private_key_file), password=None)
+        verification_key = signing_key.public_key()
+    verification_keys = {settings.jwt_key_id: (settings.jwt_algorithm, verification_key)}
+    for kid, path in settings.jwt_public_key_files.items():
+        public_key = load_pem_public_key(_read_pem(path))
+        verification_keys[kid] = (_algorithm_for(public_key), public_key)
+    return KeyRing(settings.jwt_key_id, settings.jwt_algorithm, signing_key, verification_keys)
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of already-verified token payloads, keyed by the SHA-256 of the token so raw bearer
+    tokens are not kept in memory. Entries are dropped at the token's `exp`, so a cached token is never
+    accepted after it would have failed verification. Guarded by a lock since sync callers may run in threads.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, key: bytes) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: bytes, payload: dict):
+        # Tokens without an expiry are verified every time rather than trusted forever
+        if self.max_entries <= 0 or "exp" not in payload:
+            return
+        with self._lock:
+            self._entries[key] = (float(payload["exp"]), payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+key_ring = build_key_ring(settings)
+token_cache = VerifiedTokenCache(settings.jwt_token_cache_max_entries)
+
 def create_access_token(*, data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     # Convert role to uppercase before encoding the JWT
@@ -11,12 +121,18 @@ def create_access_token(*, data: dict, expires_delta: timedelta = None):
         to_encode['role'] = to_encode['role'].upper()
     expire = datetime.utcnow() + (expires_delta if expires_delta else timedelta(minutes=settings.access_token_expire_minutes))
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    encoded_jwt = key_ring.encode(to_encode)
     return encoded_jwt
 
 def decode_token(token: str):
-    try:
-        decoded = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+    """Return the verified payload of a token, or None if it is invalid. Repeat calls for a token are served from `token_cache`."""
+    cache_key = token_cache.key(token)
+    decoded = token_cache.get(cache_key)
+    if decoded is not None:
         return decoded
+    try:
+        decoded = key_ring.decode(token)
     except jwt.PyJWTError:
         return None
+    token_cache.put(cache_key, decoded)
+    return decoded
@@ -0,0 +1,48 @@
+from typing import AsyncIterator, List, Optional, Sequence
+from sqlalchemy import String, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user_model import User
+from app.utils.nickname_gen import generate_nicknames
+from settings.config import settings
+
+class NicknameUnavailableError(Exception):
+    """Raised when no free nickname was found within `nickname_max_batches` batches."""
+
+class NicknameService:
+    # One array parameter instead of an IN list, so every batch size reuses the same prepared statement
+    _taken_query = select(User.nickname).where(
+        User.nickname == any_(bindparam("candidates", type_=ARRAY(String)))
+    )
+
+    @classmethod
+    async def find_available(cls, session: AsyncSession, candidates: Sequence[str]) -> List[str]:
+        """
+        Check a batch of nicknames with a single `nickname = ANY(...)` query.
+        :param session: Database session.
+        :param candidates: Nicknames to check.
+        :return: The candidates that are not taken, in their original order.
+        """
+        result = await session.execute(cls._taken_query, {"candidates": list(candidates)})
+        taken = set(result.scalars())
+        return [candidate for candidate in candidates if candidate not in taken]
+
+    @classmethod
+    async def candidates(cls, session: AsyncSession, preferred: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Yield nicknames that were free when checked, the preferred one first if available.
+        Candidates are checked `nickname_batch_size` at a time, so a burst of registrations costs one query per batch.
+        Another transaction can still claim a candidate before it is inserted, so callers insert with
+        ON CONFLICT and move on to the next candidate when the insert is skipped.
+        :param session: Database session.
+        :param preferred: Nickname the user asked for, if any.
+        :raises NicknameUnavailableError: If `nickname_max_batches` batches produced no usable nickname.
+        """
+        batch_size = settings.nickname_batch_size
+        for batch in range(settings.nickname_max_batches):
+            batch_candidates = generate_nicknames(batch_size)
+            if batch == 0 and preferred:
+                batch_candidates = [preferred] + [nickname for nickname in batch_candidates if nickname != preferred]
+            for nickname in await cls.find_available(session, batch_candidates):
+                yield nickname
+        raise NicknameUnavailableError("Could not allocate a unique nickname; try again.")
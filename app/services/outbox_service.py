@@ -0,0 +1,132 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from datetime import datetime, timedelta, timezone
+from typing import List
+from uuid import UUID
+import asyncio
+import logging
+from app.models.email_outbox_model import EmailOutbox
+from app.models.invite_model import Invitation
+from app.models.user_model import User
+from app.services.email_service import EmailService
+from settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+class OutboxService:
+    INVITE_EMAIL = "invite_email"
+    VERIFICATION_EMAIL = "verification_email"
+
+    @classmethod
+    def enqueue_invite_email(cls, session: AsyncSession, invite_id: UUID):
+        """
+        Queue an invitation email. The row is only added to the session, so it commits with the caller's transaction.
+        :param session: Database session.
+        :param invite_id: ID of the invitation to email.
+        """
+        session.add(EmailOutbox(kind=cls.INVITE_EMAIL, payload={"invite_id": str(invite_id)}))
+
+    @classmethod
+    def enqueue_verification_email(cls, session: AsyncSession, user_id: UUID):
+        """
+        Queue a verification email. The row is only added to the session, so it commits with the caller's transaction.
+        :param session: Database session.
+        :param user_id: ID of the user to email.
+        """
+        session.add(EmailOutbox(kind=cls.VERIFICATION_EMAIL, payload={"user_id": str(user_id)}))
+
+    @classmethod
+    def invite_email_rows(cls, invite_ids: List[UUID]) -> List[dict]:
+        """
+        Build outbox rows for a multi-row INSERT of invitation emails.
+        :param invite_ids: IDs of the invitations to email.
+        :return: List of column dicts.
+        """
+        return [
+            {"kind": cls.INVITE_EMAIL, "payload": {"invite_id": str(invite_id)}, "status": EmailOutbox.PENDING, "attempts": 0}
+            for invite_id in invite_ids
+        ]
+
+    @classmethod
+    async def _load_targets(cls, session: AsyncSession, entries: List[EmailOutbox]) -> dict:
+        """Fetch the invitations and users a batch refers to with one query per kind, keyed by outbox row ID."""
+        invite_ids = [entry.payload["invite_id"] for entry in entries if entry.kind == cls.INVITE_EMAIL]
+        user_ids = [entry.payload["user_id"] for entry in entries if entry.kind == cls.VERIFICATION_EMAIL]
+        invites, users = {}, {}
+        if invite_ids:
+            result = await session.execute(select(Invitation).where(Invitation.id.in_(invite_ids)))
+            invites = {str(invite.id): invite for invite in result.scalars()}
+        if user_ids:
+            result = await session.execute(select(User).where(User.id.in_(user_ids)))
+            users = {str(user.id): user for user in result.scalars()}
+        return {
+            entry.id: invites.get(entry.payload.get("invite_id")) if entry.kind == cls.INVITE_EMAIL
+            else users.get(entry.payload.get("user_id"))
+            for entry in entries
+        }
+
+    @classmethod
+    async def _deliver(cls, entry: EmailOutbox, target, email_service: EmailService):
+        if target is None:
+            raise LookupError(f"Target of {entry.kind} no longer exists.")
+        if entry.kind == cls.INVITE_EMAIL:
+            await email_service.send_invite_email(target)
+        elif entry.kind == cls.VERIFICATION_EMAIL:
+            await email_service.send_verification_email(target)
+        else:
+            raise ValueError(f"Unknown outbox kind: {entry.kind}")
+
+    @classmethod
+    async def process_batch(cls, session: AsyncSession, email_service: EmailService, batch_size: int = None) -> int:
+        """
+        Claim a batch of due outbox rows, deliver them concurrently and record the outcome.
+        Rows are claimed in a short transaction with SKIP LOCKED, so several workers can drain the outbox in parallel,
+        and leased by pushing `next_attempt_at` `email_outbox_lease_seconds` ahead. Emails are sent after that commit,
+        so no connection or row lock is held during SMTP; rows of a worker that dies mid-batch become due again when
+        the lease runs out. Outcomes are recorded in a second short transaction.
+        Failed deliveries are retried with exponential backoff and dead-lettered after `email_outbox_max_attempts`.
+        :param session: Database session.
+        :param email_service: EmailService instance for sending emails.
+        :param batch_size: Maximum number of rows to claim; defaults to `email_outbox_batch_size`.
+        :return: Number of rows processed.
+        """
+        query = (
+            select(EmailOutbox)
+            .where(EmailOutbox.status == EmailOutbox.PENDING, EmailOutbox.next_attempt_at <= func.now())
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(batch_size or settings.email_outbox_batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        entries = (await session.execute(query)).scalars().all()
+        if not entries:
+            await session.commit()
+            return 0
+        lease_until = datetime.now(timezone.utc) + timedelta(seconds=settings.email_outbox_lease_seconds)
+        for entry in entries:
+            entry.next_attempt_at = lease_until
+        targets = await cls._load_targets(session, entries)
+        await session.commit()
+
+        outcomes = await asyncio.gather(
+            *(cls._deliver(entry, targets[entry.id], email_service) for entry in entries),
+            return_exceptions=True
+        )
+
+        now = datetime.now(timezone.utc)
+        for entry, outcome in zip(entries, outcomes):
+            # CancelledError is a BaseException; a cancelled send was not delivered
+            if not isinstance(outcome, BaseException):
+                entry.status = EmailOutbox.SENT
+                entry.sent_at = now
+                continue
+            entry.attempts += 1
+            entry.last_error = str(outcome) or type(outcome).__name__
+            if isinstance(outcome, LookupError) or entry.attempts >= settings.email_outbox_max_attempts:
+                entry.status = EmailOutbox.DEAD
+                logger.error(f"Dead-lettered {entry.kind} {entry.id} after {entry.attempts} attempts: {entry.last_error}")
+            else:
+                backoff = settings.email_outbox_retry_backoff_seconds * (2 ** (entry.attempts - 1))
+                entry.next_attempt_at = now + timedelta(seconds=backoff)
+                logger.warning(f"Delivery of {entry.kind} {entry.id} failed, retrying in {backoff}s: {entry.last_error}")
+        await session.commit()
+        return len(entries)
@@ -4,21 +4,31 @@ import secrets
 from typing import Optional, Dict, List
 from pydantic import ValidationError
 from sqlalchemy import func, null, update, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import Database
 from app.dependencies import get_email_service, get_settings
 from app.models.user_model import User
 from app.schemas.user_schemas import UserCreate, UserUpdate
 from app.utils.nickname_gen import generate_nickname
-from app.utils.security import generate_verification_token, hash_password, verify_password
-from uuid import UUID
+from app.utils.pagination import CursorPage, keyset_paginate
+from app.utils.password_hasher import PasswordHasherBusy, password_hasher
+from app.utils.security import generate_verification_token
+from uuid import UUID, uuid4
 from app.services.email_service import EmailService
+from app.services.count_service import CountService, CountStrategy
+from app.services.nickname_service import NicknameService, NicknameUnavailableError
+from app.services.outbox_service import OutboxService
 from app.models.user_model import UserRole
 import logging
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+class AccountLockedError(Exception):
+    """Raised by login when the account is locked after too many failed attempts."""
+
 class UserService:
     @classmethod
     async def _execute_query(cls, session: AsyncSession, query):
@@ -57,28 +67,51 @@ class UserService:
             if existing_user:
                 logger.error("User with given email already exists.")
                 return None
-            validated_data['hashed_password'] = hash_password(validated_data.pop('password'))
-            new_user = User(**validated_data)
-            new_nickname = user_data["nickname"]
-            while await cls.get_by_nickname(session, new_nickname):
-                new_nickname = user_data["nickname"]
-            new_user.nickname = new_nickname
-            logger.info(f"User Role: {new_user.role}")
+            validated_data['hashed_password'] = await password_hasher.hash(validated_data.pop('password'))
+            preferred_nickname = validated_data.pop('nickname', None)
             user_count = await cls.count(session)
-            new_user.role = UserRole.ADMIN if user_count == 0 else UserRole.ANONYMOUS            
-            if new_user.role == UserRole.ADMIN:
-                new_user.email_verified = True
-
+            validated_data['role'] = UserRole.ADMIN if user_count == 0 else UserRole.ANONYMOUS
+            if validated_data['role'] == UserRole.ADMIN:
+                validated_data['email_verified'] = True
             else:
-                new_user.verification_token = generate_verification_token()
+                validated_data['verification_token'] = generate_verification_token()
+            logger.info(f"User Role: {validated_data['role']}")
 
-            session.add(new_user)
+            new_user = await cls._insert_with_nickname(session, validated_data, preferred_nickname)
+            # Queue the verification email in the same transaction as the user
+            if settings.email_outbox_enabled:
+                OutboxService.enqueue_verification_email(session, new_user.id)
             await session.commit()
-            await email_service.send_verification_email(new_user)
+            # The INSERT statement bypasses the session's flush hooks, so drop cached totals explicitly
+            CountService.invalidate(User.__tablename__)
+            if not settings.email_outbox_enabled:
+                await email_service.send_verification_email(new_user)
             return new_user
         except ValidationError as e:
             logger.error(f"Validation error during user creation: {e}")
             return None
+        except NicknameUnavailableError as e:
+            logger.error(f"Nickname allocation failed during user creation: {e}")
+            await session.rollback()
+            return None
+
+    @classmethod
+    async def _insert_with_nickname(cls, session: AsyncSession, values: dict, preferred_nickname: Optional[str]) -> User:
+        """
+        Insert a user under the first free nickname candidate.
+        ON CONFLICT DO NOTHING skips candidates claimed by a concurrent registration since they were checked,
+        instead of failing the transaction.
+        """
+        async for nickname in NicknameService.candidates(session, preferred_nickname):
+            result = await session.execute(
+                insert(User)
+                .values(id=uuid4(), nickname=nickname, **values)
+                .on_conflict_do_nothing(index_elements=[User.nickname])
+                .returning(User)
+            )
+            new_user = result.scalars().first()
+            if new_user is not None:
+                return new_user
 
     @classmethod
     async def update(cls, session: AsyncSession, user_id: UUID, update_data: Dict[str, str]) -> Optional[User]:
@@ -87,7 +120,7 @@ class UserService:
             validated_data = UserUpdate(**update_data).model_dump(exclude_unset=True)
 
             if 'password' in validated_data:
-                validated_data['hashed_password'] = hash_password(validated_data.pop('password'))
+                validated_data['hashed_password'] = await password_hasher.hash(validated_data.pop('password'))
             query = update(User).where(User.id == user_id).values(**validated_data).execution_options(synchronize_session="fetch")
             await cls._execute_query(session, query)
             updated_user = await cls.get_by_id(session, user_id)
@@ -98,6 +131,8 @@ class UserService:
             else:
                 logger.error(f"User {user_id} not found after update attempt.")
             return None
+        except PasswordHasherBusy:
+            raise
         except Exception as e:  # Broad exception handling for debugging
             logger.error(f"Error during user update: {e}")
             return None
@@ -114,10 +149,29 @@ class UserService:
 
     @classmethod
     async def list_users(cls, session: AsyncSession, skip: int = 0, limit: int = 10) -> List[User]:
-        query = select(User).offset(skip).limit(limit)
+        query = select(User).order_by(User.created_at, User.id).offset(skip).limit(limit)
         result = await cls._execute_query(session, query)
         return result.scalars().all() if result else []
 
+    @classmethod
+    async def list_users_page(cls, session: AsyncSession, limit: int = 10, cursor: Optional[str] = None,
+                              count_strategy: CountStrategy = CountStrategy.NONE) -> CursorPage:
+        """
+        List a page of users ordered by (created_at, id) using keyset pagination.
+
+        :param session: The AsyncSession instance for database access.
+        :param limit: Maximum number of users to return.
+        :param cursor: Opaque cursor from a previous page; None starts at the first page.
+        :param count_strategy: How to compute the page's `total`; exact totals come back with the page itself.
+        :return: CursorPage of users with cursors for the neighbouring pages.
+        :raises ValueError: If the cursor is malformed.
+        """
+        query = select(User)
+        page = await keyset_paginate(session, query, User, limit, cursor, with_total=count_strategy == CountStrategy.EXACT)
+        if count_strategy not in (CountStrategy.EXACT, CountStrategy.NONE):
+            page.total = await CountService.count(session, query, count_strategy, User.__tablename__)
+        return page
+
     @classmethod
     async def register_user(cls, session: AsyncSession, user_data: Dict[str, str], get_email_service) -> Optional[User]:
         return await cls.create(session, user_data, get_email_service)
@@ -125,25 +179,72 @@ class UserService:
 
     @classmethod
     async def login_user(cls, session: AsyncSession, email: str, password: str) -> Optional[User]:
-        user = await cls.get_by_email(session, email)
-        if user:
-            if user.email_verified is False:
-                return None
-            if user.is_locked:
-                return None
-            if verify_password(password, user.hashed_password):
-                user.failed_login_attempts = 0
-                user.last_login_at = datetime.now(timezone.utc)
-                session.add(user)
-                await session.commit()
-                return user
-            else:
-                user.failed_login_attempts += 1
-                if user.failed_login_attempts >= settings.max_login_attempts:
-                    user.is_locked = True
-                session.add(user)
+        """
+        Authenticate a user with one read and one atomic write.
+        The credentials row is read and its transaction ended before the password is verified, so no pooled
+        connection is held during hashing; the outcome is then applied with a single UPDATE ... RETURNING.
+        :param session: Database session.
+        :param email: Email address the user logs in with.
+        :param password: Plain text password to verify.
+        :return: The logged in user, or None if the credentials are wrong or the email is unverified.
+        :raises AccountLockedError: If the account is locked, including by a concurrent failed login.
+        """
+        result = await session.execute(
+            select(User.id, User.hashed_password, User.email_verified, User.is_locked).where(User.email == email)
+        )
+        credentials = result.first()
+        await session.commit()
+        if credentials is None:
+            return None
+        if credentials.is_locked:
+            raise AccountLockedError(email)
+        if credentials.email_verified is False:
+            return None
+
+        if not await password_hasher.verify(password, credentials.hashed_password):
+            # Counted in the database, so concurrent failures cannot overwrite each other's increments
+            attempts = User.failed_login_attempts + 1
+            await session.execute(
+                update(User)
+                .where(User.id == credentials.id)
+                .values(failed_login_attempts=attempts, is_locked=User.is_locked | (attempts >= settings.max_login_attempts))
+            )
+            await session.commit()
+            return None
+
+        result = await session.execute(
+            update(User)
+            .where(User.id == credentials.id, User.is_locked.is_not(True))
+            .values(failed_login_attempts=0, last_login_at=datetime.now(timezone.utc))
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        user = result.scalars().first()
+        await session.commit()
+        if user is None:
+            raise AccountLockedError(email)
+        if settings.password_rehash_on_login and password_hasher.needs_rehash(credentials.hashed_password):
+            password_hasher.spawn(cls._rehash_password(user.id, credentials.hashed_password, password))
+        return user
+
+    @classmethod
+    async def _rehash_password(cls, user_id: UUID, old_hash: str, password: str):
+        """
+        Replace an outdated password hash after a successful login, outside the login request.
+        The update only applies while the stored hash is still the one that was verified, so a concurrent password change wins.
+        """
+        try:
+            new_hash = await password_hasher.hash(password)
+            async with Database.get_session_factory()() as session:
+                await session.execute(
+                    update(User)
+                    .where(User.id == user_id, User.hashed_password == old_hash)
+                    .values(hashed_password=new_hash)
+                )
                 await session.commit()
-        return None
+        except Exception as e:
+            # The old hash keeps working, so the upgrade is simply retried on the next login
+            logger.warning(f"Failed to upgrade password hash for user {user_id}: {e}")
 
     @classmethod
     async def is_account_locked(cls, session: AsyncSession, email: str) -> bool:
@@ -153,7 +254,7 @@ class UserService:
 
     @classmethod
     async def reset_password(cls, session: AsyncSession, user_id: UUID, new_password: str) -> bool:
-        hashed_password = hash_password(new_password)
+        hashed_password = await password_hasher.hash(new_password)
         user = await cls.get_by_id(session, user_id)
         if user:
             user.hashed_password = hashed_password
@@ -177,13 +278,16 @@ class UserService:
         return False
 
     @classmethod
-    async def count(cls, session: AsyncSession) -> int:
+    async def count(cls, session: AsyncSession, strategy: CountStrategy = CountStrategy.EXACT) -> Optional[int]:
         """
         Count the number of users in the database.
 
         :param session: The AsyncSession instance for database access.
+        :param strategy: Exact, cached or estimated count; NONE returns None.
         :return: The count of users.
         """
+        if strategy != CountStrategy.EXACT:
+            return await CountService.count(session, select(User), strategy, User.__tablename__)
         query = select(func.count()).select_from(User)
         result = await session.execute(query)
         count = result.scalar()
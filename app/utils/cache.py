@@ -0,0 +1,137 @@
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+class CacheBackend(ABC):
+    """Async key/value cache interface. Values must be JSON-serializable so any backend can hold them."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float):
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str):
+        ...
+
+    async def close(self):
+        pass
+
+
+class LocalTTLCache(CacheBackend):
+    """
+    In-process LRU cache with per-entry expiry.
+    Entries are only touched from the event loop, so no locking is needed.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class InMemorySharedCache(CacheBackend):
+    """
+    Stand-in for a shared cache server. Values go through JSON like they would over the network,
+    so code that works against it works against Redis. Intended for tests and local development.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return json.loads(entry[1])
+
+    async def set(self, key: str, value: Any, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, json.dumps(value))
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+
+class RedisCache(CacheBackend):
+    """Shared cache in Redis. Requires the optional `redis` package."""
+
+    def __init__(self, url: str, prefix: str = ""):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("The redis cache backend requires the `redis` package: pip install redis") from e
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self._client.get(self.prefix + key)
+        return None if value is None else json.loads(value)
+
+    async def set(self, key: str, value: Any, ttl: float):
+        await self._client.set(self.prefix + key, json.dumps(value), px=int(ttl * 1000))
+
+    async def delete(self, key: str):
+        await self._client.delete(self.prefix + key)
+
+    async def close(self):
+        await self._client.aclose()
+
+
+class TieredCache(CacheBackend):
+    """
+    A short-lived local LRU in front of a shared backend.
+    Deletes reach both tiers here, but other processes keep their local copy until `local_ttl` expires,
+    so keep it short.
+    """
+
+    def __init__(self, local: LocalTTLCache, shared: CacheBackend, local_ttl: float):
+        self.local = local
+        self.shared = shared
+        self.local_ttl = local_ttl
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self.local.get(key)
+        if value is None:
+            value = await self.shared.get(key)
+            if value is not None:
+                await self.local.set(key, value, self.local_ttl)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float):
+        await self.shared.set(key, value, ttl)
+        await self.local.set(key, value, min(ttl, self.local_ttl))
+
+    async def delete(self, key: str):
+        await self.local.delete(key)
+        await self.shared.delete(key)
+
+    async def close(self):
+        await self.shared.close()
@@ -1,11 +1,12 @@
 from builtins import dict, int, max, str
-from typing import List, Callable
-from urllib.parse import urlencode
+from typing import List, Callable, Optional
+from urllib.parse import parse_qsl, urlencode
 from uuid import UUID
 
 from fastapi import Request
 from app.schemas.link_schema import Link
 from app.schemas.pagination_schema import PaginationLink
+from app.utils.pagination import CursorPage, LAST_PAGE_CURSOR
 
 # Utility function to create a link
 def create_link(rel: str, href: str, method: str = "GET", action: str = None) -> Link:
@@ -16,6 +17,12 @@ def create_pagination_link(rel: str, base_url: str, params: dict) -> PaginationL
     query_string = f"skip={params['skip']}&limit={params['limit']}"
     return PaginationLink(rel=rel, href=f"{base_url}?{query_string}")
 
+def create_cursor_link(rel: str, base_url: str, limit: int, cursor: Optional[str] = None, filters: List[tuple] = ()) -> PaginationLink:
+    query = list(filters) + [('limit', limit)]
+    if cursor:
+        query.append(('cursor', cursor))
+    return PaginationLink(rel=rel, href=f"{base_url}?{urlencode(query)}")
+
 def create_user_links(user_id: UUID, request: Request) -> List[Link]:
     """
     Generate navigation links for user actions.
@@ -30,7 +37,28 @@ def create_user_links(user_id: UUID, request: Request) -> List[Link]:
         for rel, action, method, action_desc in actions
     ]
 
-def generate_pagination_links(request: Request, skip: int, limit: int, total_items: int) -> List[PaginationLink]:
+def generate_cursor_links(request: Request, limit: int, page: CursorPage) -> List[PaginationLink]:
+    base_url, _, query_string = str(request.url).partition('?')
+    # Carry filters such as `used` or `include_total` over to the other pages
+    filters = [(key, value) for key, value in parse_qsl(query_string) if key not in ('skip', 'limit', 'cursor')]
+    links = [
+        PaginationLink(rel="self", href=str(request.url)),
+        create_cursor_link("first", base_url, limit, filters=filters),
+        create_cursor_link("last", base_url, limit, LAST_PAGE_CURSOR, filters)
+    ]
+    if page.next_cursor:
+        links.append(create_cursor_link("next", base_url, limit, page.next_cursor, filters))
+    if page.prev_cursor:
+        links.append(create_cursor_link("prev", base_url, limit, page.prev_cursor, filters))
+    return links
+
+def generate_pagination_links(request: Request, skip: int, limit: int, total_items: int, page: Optional[CursorPage] = None) -> List[PaginationLink]:
+    """
+    Build self/first/last/next/prev links. Given a keyset `page`, the links carry its opaque cursors
+    instead of offsets, so following them never needs OFFSET.
+    """
+    if page is not None:
+        return generate_cursor_links(request, limit, page)
     base_url = str(request.url)
     total_pages = (total_items + limit - 1) // limit
     links = [
@@ -1,10 +1,46 @@
 from builtins import str
 import random
+from typing import List
+
+ADJECTIVES = (
+    "agile", "amber", "azure", "bold", "brave", "breezy", "bright", "brisk", "calm", "candid",
+    "cheery", "clever", "cosmic", "crisp", "curious", "daring", "dapper", "dreamy", "eager", "earnest",
+    "electric", "fancy", "fearless", "feisty", "fierce", "fluffy", "frosty", "gentle", "giddy", "glad",
+    "golden", "graceful", "grand", "happy", "hardy", "hazy", "honest", "humble", "icy", "jazzy",
+    "jolly", "jovial", "keen", "kind", "lively", "lucky", "lunar", "mellow", "merry", "mighty",
+    "misty", "modest", "nimble", "noble", "plucky", "polite", "proud", "quick", "quiet", "quirky",
+    "radiant", "rapid", "rosy", "rustic", "sandy", "savvy", "serene", "shiny", "silent", "silver",
+    "sly", "smooth", "snappy", "solar", "spry", "steady", "stellar", "sturdy", "sunny", "swift",
+    "tidy", "timid", "tranquil", "trusty", "upbeat", "vivid", "wandering", "warm", "whimsical", "wild",
+    "wise", "witty", "zany", "zealous", "zen", "zesty",
+)
+
+ANIMALS = (
+    "albatross", "alpaca", "antelope", "armadillo", "badger", "bat", "beaver", "bison", "bobcat", "buffalo",
+    "camel", "capybara", "caribou", "cheetah", "chinchilla", "cobra", "condor", "cougar", "coyote", "crane",
+    "dingo", "dolphin", "donkey", "dove", "eagle", "elk", "emu", "falcon", "ferret", "finch",
+    "flamingo", "fox", "gazelle", "gecko", "gibbon", "giraffe", "gopher", "gorilla", "hamster", "hare",
+    "hawk", "hedgehog", "heron", "hippo", "ibex", "iguana", "impala", "jackal", "jaguar", "kangaroo",
+    "kestrel", "koala", "lemur", "leopard", "lion", "llama", "lynx", "macaw", "manatee", "marmot",
+    "meerkat", "mink", "mole", "moose", "narwhal", "newt", "ocelot", "octopus", "okapi", "orca",
+    "osprey", "otter", "owl", "panda", "panther", "parrot", "pelican", "penguin", "puffin", "puma",
+    "quail", "rabbit", "raccoon", "raven", "reindeer", "robin", "salmon", "seal", "sparrow", "squirrel",
+    "stork", "swan", "tapir", "tiger", "toucan", "turtle", "walrus", "weasel", "wolf", "wombat",
+)
+
+# 96 adjectives x 100 animals x 10,000 numbers: roughly 10^8 nicknames, all within the 50-character column
+MAX_NUMBER = 9999
 
 
 def generate_nickname() -> str:
     """Generate a URL-safe nickname using adjectives and animal names."""
-    adjectives = ["clever", "jolly", "brave", "sly", "gentle"]
-    animals = ["panda", "fox", "raccoon", "koala", "lion"]
-    number = random.randint(0, 999)
-    return f"{random.choice(adjectives)}_{random.choice(animals)}_{number}"
+    number = random.randint(0, MAX_NUMBER)
+    return f"{random.choice(ADJECTIVES)}_{random.choice(ANIMALS)}_{number}"
+
+
+def generate_nicknames(count: int) -> List[str]:
+    """Generate `count` distinct nicknames."""
+    nicknames = set()
+    while len(nicknames) < count:
+        nicknames.add(generate_nickname())
+    return list(nicknames)
@@ -0,0 +1,97 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NEXT = "next"
+PREV = "prev"
+
+@dataclass
+class CursorPage:
+    """One page of a keyset-paginated listing with opaque cursors for the neighbouring pages."""
+    items: List[Any] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+# Starting a listing from this cursor returns its last page
+LAST_PAGE_CURSOR = urlsafe_b64encode(PREV.encode()).decode().rstrip("=")
+
+def encode_cursor(direction: str, created_at: datetime, row_id: UUID) -> str:
+    """Encode a direction and (created_at, id) key as an opaque URL-safe token."""
+    raw = f"{direction}|{created_at.isoformat()}|{row_id}"
+    return urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, Optional[Tuple[datetime, UUID]]]:
+    """
+    Decode a cursor token into its direction and (created_at, id) key.
+    :raises ValueError: If the token was not produced by `encode_cursor` or is `LAST_PAGE_CURSOR`.
+    """
+    try:
+        raw = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        parts = raw.split("|")
+        if parts == [PREV]:
+            return PREV, None
+        direction, created_at, row_id = parts
+        if direction not in (NEXT, PREV):
+            raise ValueError(direction)
+        return direction, (datetime.fromisoformat(created_at), UUID(row_id))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid pagination cursor.") from e
+
+async def keyset_paginate(session: AsyncSession, query: Select, model, limit: int, cursor: Optional[str] = None,
+                          with_total: bool = False) -> CursorPage:
+    """
+    Fetch one page of `query` ordered by (created_at, id) using a keyset seek instead of OFFSET,
+    so deep pages cost the same as the first one.
+    :param session: Database session.
+    :param query: SELECT of `model` rows, already filtered.
+    :param model: Mapped class with `created_at` and `id` columns.
+    :param limit: Maximum number of rows on the page.
+    :param cursor: Token from a previous page; None starts at the beginning.
+    :param with_total: Also return the exact number of rows `query` matches, computed in the same round trip.
+    :return: CursorPage with the rows in ascending order.
+    """
+    direction, key = decode_cursor(cursor) if cursor else (NEXT, None)
+    total_query = select(func.count()).select_from(query.subquery())
+    sort_key = tuple_(model.created_at, model.id)
+    if direction == NEXT:
+        if key is not None:
+            query = query.where(sort_key > tuple_(*key))
+        query = query.order_by(model.created_at.asc(), model.id.asc())
+    else:
+        if key is not None:
+            query = query.where(sort_key < tuple_(*key))
+        query = query.order_by(model.created_at.desc(), model.id.desc())
+
+    # One extra row tells whether another page exists in the direction of travel
+    total = None
+    if with_total:
+        # An uncorrelated scalar subquery runs once per statement; a count(*) OVER () window would only
+        # count the rows past the cursor
+        result = (await session.execute(query.add_columns(total_query.scalar_subquery()).limit(limit + 1))).all()
+        rows = [row[0] for row in result]
+        if result:
+            total = result[0][1]
+        elif key is None:
+            total = 0
+        else:
+            total = (await session.execute(total_query)).scalar() or 0
+    else:
+        rows = list((await session.execute(query.limit(limit + 1))).scalars().all())
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == PREV:
+        rows.reverse()
+    has_next = has_more if direction == NEXT else key is not None
+    has_prev = key is not None if direction == NEXT else has_more
+
+    page = CursorPage(items=rows, total=total)
+    if rows and has_next:
+        page.next_cursor = encode_cursor(NEXT, rows[-1].created_at, rows[-1].id)
+    if rows and has_prev:
+        page.prev_cursor = encode_cursor(PREV, rows[0].created_at, rows[0].id)
+    return page
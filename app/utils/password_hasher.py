@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from app.utils.password_policy import PasswordPolicy, build_password_policy
+from settings.config import settings
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hash or verify calls are already waiting; surfaced to clients as 429."""
+
+class PasswordHasher:
+    """
+    Runs password hashing in a dedicated thread pool so it never blocks the event loop.
+    bcrypt and argon2 release the GIL while they work, so threads hash in parallel without the pickling cost of processes.
+    At most `max_workers + max_pending` calls are admitted at once; further calls fail fast with
+    PasswordHasherBusy instead of queueing behind seconds of hashing.
+    """
+
+    OPERATIONS = ("hash", "verify")
+
+    def __init__(self, policy: PasswordPolicy, max_workers: int, max_pending: int):
+        self.policy = policy
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0  # only touched from the event loop
+        self._rejected = 0
+        self._stats_lock = threading.Lock()
+        self._stats = {operation: self._empty_stats() for operation in self.OPERATIONS}
+        self._background = set()
+
+    @staticmethod
+    def _empty_stats() -> dict:
+        return {"calls": 0, "wait_seconds_total": 0.0, "wait_seconds_max": 0.0, "run_seconds_total": 0.0, "run_seconds_max": 0.0}
+
+    def start(self):
+        """Create the worker pool if it is not already running."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password")
+
+    def shutdown(self):
+        """Stop the worker threads, waiting for in-flight calls to finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _timed(self, operation: str, queued_at: float, func, *args):
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._stats_lock:
+                stats = self._stats[operation]
+                stats["calls"] += 1
+                stats["wait_seconds_total"] += started - queued_at
+                stats["wait_seconds_max"] = max(stats["wait_seconds_max"], started - queued_at)
+                stats["run_seconds_total"] += finished - started
+                stats["run_seconds_max"] = max(stats["run_seconds_max"], finished - started)
+
+    async def _run(self, operation: str, func, *args):
+        if self._in_flight >= self.max_workers + self.max_pending:
+            self._rejected += 1
+            raise PasswordHasherBusy("Too many password operations in progress; try again shortly.")
+        self.start()
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._timed, operation, time.perf_counter(), func, *args)
+        finally:
+            self._in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password with the policy's current scheme off the event loop.
+        :raises PasswordHasherBusy: If the pool is saturated.
+        """
+        return await self._run("hash", self.policy.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Check a password against its stored hash, whichever scheme made it, off the event loop.
+        :raises PasswordHasherBusy: If the pool is saturated.
+        """
+        return await self._run("verify", self.policy.verify, plain_password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Whether a stored hash should be replaced by one made with the current policy. Only parses the hash."""
+        return self.policy.needs_rehash(hashed_password)
+
+    def spawn(self, coro):
+        """Run follow-up password work, such as upgrading a stored hash, without holding up the caller."""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    async def drain(self):
+        """Wait for spawned background work to finish."""
+        if self._background:
+            await asyncio.gather(*list(self._background), return_exceptions=True)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            operations = {operation: dict(stats) for operation, stats in self._stats.items()}
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self._in_flight,
+            "rejected": self._rejected,
+            **operations,
+        }
+
+password_hasher = PasswordHasher(
+    build_password_policy(settings),
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending
+)
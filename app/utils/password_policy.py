@@ -0,0 +1,129 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+from app.utils.security import hash_password, verify_password
+
+class PasswordScheme(ABC):
+    """A password hashing algorithm with fixed cost parameters."""
+
+    name: str = ""
+
+    @abstractmethod
+    def identifies(self, hashed_password: str) -> bool:
+        ...
+
+    @abstractmethod
+    def hash(self, password: str) -> str:
+        ...
+
+    @abstractmethod
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        ...
+
+    @abstractmethod
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Whether a hash produced by this algorithm used different cost parameters than the configured ones."""
+        ...
+
+class BcryptScheme(PasswordScheme):
+    name = "bcrypt"
+
+    def __init__(self, rounds: int):
+        self.rounds = rounds
+
+    def identifies(self, hashed_password: str) -> bool:
+        return hashed_password.startswith(("$2a$", "$2b$", "$2y$"))
+
+    def hash(self, password: str) -> str:
+        return hash_password(password, rounds=self.rounds)
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return verify_password(plain_password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        # $2b$<cost>$<salt+digest>
+        return int(hashed_password.split("$")[2]) != self.rounds
+
+class Argon2Scheme(PasswordScheme):
+    """argon2id via argon2-cffi, imported on first use so bcrypt-only deployments do not need it."""
+
+    name = "argon2id"
+
+    def __init__(self, time_cost: int, memory_cost: int, parallelism: int):
+        self.time_cost = time_cost
+        self.memory_cost = memory_cost
+        self.parallelism = parallelism
+        self._hasher = None
+
+    def _get_hasher(self):
+        if self._hasher is None:
+            try:
+                import argon2
+            except ImportError as e:
+                raise RuntimeError("The argon2id password scheme requires the `argon2-cffi` package: pip install argon2-cffi") from e
+            self._hasher = argon2.PasswordHasher(
+                time_cost=self.time_cost,
+                memory_cost=self.memory_cost,
+                parallelism=self.parallelism,
+                type=argon2.Type.ID
+            )
+        return self._hasher
+
+    def identifies(self, hashed_password: str) -> bool:
+        return hashed_password.startswith("$argon2")
+
+    def hash(self, password: str) -> str:
+        return self._get_hasher().hash(password)
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        from argon2.exceptions import InvalidHashError, VerificationError
+        try:
+            return self._get_hasher().verify(hashed_password, plain_password)
+        except VerificationError:
+            return False
+        except InvalidHashError as e:
+            raise ValueError("Authentication process encountered an unexpected error") from e
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return self._get_hasher().check_needs_rehash(hashed_password)
+
+class PasswordPolicy:
+    """
+    Hashes new passwords with the configured scheme and verifies hashes made by any known scheme,
+    so stored hashes keep working after the scheme or its cost changes and can be upgraded on next login.
+    """
+
+    def __init__(self, current: str, schemes: Dict[str, PasswordScheme]):
+        if current not in schemes:
+            raise ValueError(f"Unknown password hash scheme: {current}")
+        self.current = schemes[current]
+        self.schemes = schemes
+
+    def _scheme_for(self, hashed_password: str) -> Optional[PasswordScheme]:
+        for scheme in self.schemes.values():
+            if scheme.identifies(hashed_password):
+                return scheme
+        return None
+
+    def hash(self, password: str) -> str:
+        return self.current.hash(password)
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        scheme = self._scheme_for(hashed_password)
+        if scheme is None:
+            raise ValueError("Authentication process encountered an unexpected error")
+        return scheme.verify(plain_password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Whether a stored hash was made with another scheme or with outdated cost parameters."""
+        scheme = self._scheme_for(hashed_password)
+        return scheme is not self.current or scheme.needs_rehash(hashed_password)
+
+def build_password_policy(settings) -> PasswordPolicy:
+    return PasswordPolicy(settings.password_hash_scheme, {
+        BcryptScheme.name: BcryptScheme(rounds=settings.password_bcrypt_rounds),
+        Argon2Scheme.name: Argon2Scheme(
+            time_cost=settings.password_argon2_time_cost,
+            memory_cost=settings.password_argon2_memory_kib,
+            parallelism=settings.password_argon2_parallelism
+        ),
+    })
@@ -1,31 +1,195 @@
 # smtp_client.py
 from builtins import Exception, int, str
+import asyncio
 import smtplib
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.mime.image import MIMEImage
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from typing import Dict, Iterable, Optional, Tuple
 from settings.config import settings
 import logging
 
+class SMTPConnectionPool:
+    """
+    Keeps authenticated, TLS-established SMTP connections open for reuse.
+    Idle connections are closed after `idle_timeout` seconds and connections that sat idle longer than
+    `health_check_after` seconds are probed with NOOP before being handed out again.
+    """
+
+    def __init__(self, server: str, port: int, username: str, password: str, max_size: int,
+                 idle_timeout: float, health_check_after: float, timeout: float):
+        self.server = server
+        self.port = port
+        self.username = username
+        self.password = password
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self.timeout = timeout
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.server, self.port, timeout=self.timeout)
+        try:
+            connection.starttls()  # Use TLS
+            connection.login(self.username, self.password)
+        except Exception:
+            self._close(connection)
+            raise
+        return connection
+
+    @staticmethod
+    def _close(connection: smtplib.SMTP):
+        try:
+            connection.quit()
+        except Exception:
+            connection.close()
+
+    @staticmethod
+    def _is_healthy(connection: smtplib.SMTP) -> bool:
+        try:
+            return connection.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _take_idle(self) -> Optional[smtplib.SMTP]:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                connection, last_used = self._idle.pop()
+            idle_for = time.monotonic() - last_used
+            if idle_for > self.idle_timeout:
+                self._close(connection)
+            elif idle_for > self.health_check_after and not self._is_healthy(connection):
+                connection.close()
+            else:
+                return connection
+
+    def acquire(self) -> smtplib.SMTP:
+        self._slots.acquire()
+        try:
+            return self._take_idle() or self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, connection: smtplib.SMTP, discard: bool = False):
+        try:
+            if discard:
+                connection.close()
+            else:
+                with self._lock:
+                    self._idle.append((connection, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        connection = self.acquire()
+        try:
+            yield connection
+        except BaseException as e:
+            # Protocol-level rejections leave the session usable; anything else may have broken it
+            self.release(connection, discard=not isinstance(e, smtplib.SMTPResponseException))
+            raise
+        else:
+            self.release(connection)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for connection, _ in idle:
+            self._close(connection)
+
+
 class SMTPClient:
     def __init__(self, server: str, port: int, username: str, password: str):
         self.server = server
         self.port = port
         self.username = username
         self.password = password
+        self.pool = SMTPConnectionPool(
+            server, port, username, password,
+            max_size=settings.smtp_pool_size,
+            idle_timeout=settings.smtp_idle_timeout_seconds,
+            health_check_after=settings.smtp_health_check_after_seconds,
+            timeout=settings.smtp_timeout_seconds
+        )
+        self._executor = None
 
-    def send_email(self, subject: str, html_content: str, recipient: str):
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=settings.smtp_pool_size, thread_name_prefix="smtp")
+        return self._executor
+
+    def _build_message(self, subject: str, html_content: str, recipient: str, inline_images: Optional[Dict[str, bytes]] = None) -> str:
+        body = MIMEMultipart('alternative')
+        body.attach(MIMEText(html_content, 'html'))
+        if inline_images:
+            # multipart/related lets the HTML reference each PNG as src="cid:<content id>"
+            message = MIMEMultipart('related')
+            message.attach(body)
+            for content_id, png in inline_images.items():
+                image = MIMEImage(png, 'png')
+                image.add_header('Content-ID', f'<{content_id}>')
+                image.add_header('Content-Disposition', 'inline', filename=f'{content_id.split("@")[0]}.png')
+                message.attach(image)
+        else:
+            message = body
+        message['Subject'] = subject
+        message['From'] = self.username
+        message['To'] = recipient
+        return message.as_string()
+
+    def _send_on_connection(self, pending: deque):
+        with self.pool.connection() as server:
+            while pending:
+                recipient, message = pending[0]
+                server.sendmail(self.username, recipient, message)
+                pending.popleft()
+
+    def send_many(self, emails: Iterable[Tuple]):
+        """
+        Sends (subject, html_content, recipient) emails back to back over a single pooled connection.
+        An email may carry a fourth item, a dict of content ID to PNG bytes embedded as inline images.
+        A connection dropped by the server is replaced once and only the unsent emails are retried.
+        """
+        recipients = []
+        pending = deque()
+        for subject, html_content, recipient, *inline_images in emails:
+            recipients.append(recipient)
+            pending.append((recipient, self._build_message(subject, html_content, recipient, *inline_images)))
         try:
-            message = MIMEMultipart('alternative')
-            message['Subject'] = subject
-            message['From'] = self.username
-            message['To'] = recipient
-            message.attach(MIMEText(html_content, 'html'))
-
-            with smtplib.SMTP(self.server, self.port) as server:
-                server.starttls()  # Use TLS
-                server.login(self.username, self.password)
-                server.sendmail(self.username, recipient, message.as_string())
-            logging.info(f"Email sent to {recipient}")
+            try:
+                self._send_on_connection(pending)
+            except smtplib.SMTPServerDisconnected:
+                self._send_on_connection(pending)
+            for recipient in recipients:
+                logging.info(f"Email sent to {recipient}")
         except Exception as e:
             logging.error(f"Failed to send email: {str(e)}")
             raise
+
+    def send_email(self, subject: str, html_content: str, recipient: str, inline_images: Optional[Dict[str, bytes]] = None):
+        self.send_many([(subject, html_content, recipient, inline_images)])
+
+    async def send_many_async(self, emails: Iterable[Tuple]):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._get_executor(), self.send_many, list(emails))
+
+    async def send_email_async(self, subject: str, html_content: str, recipient: str, inline_images: Optional[Dict[str, bytes]] = None):
+        await self.send_many_async([(subject, html_content, recipient, inline_images)])
+
+    def close(self):
+        """Close pooled connections and stop the sender threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.pool.close_all()
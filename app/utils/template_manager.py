@@ -1,7 +1,33 @@
 import markdown2
+import os
+from html import escape
 from pathlib import Path
+from string import Formatter
+from typing import Dict, List, Tuple
+from settings.config import settings
+
+class CompiledTemplate:
+    """
+    An email rendered to styled HTML once, with the template's `{placeholders}` left as slots.
+    Rendering only interleaves the HTML-escaped context values with the precomputed fragments.
+    """
+    __slots__ = ("fragments", "slots")
+
+    def __init__(self, fragments: List[str], slots: List[str]):
+        self.fragments = fragments
+        self.slots = slots
+
+    def render(self, context: dict) -> str:
+        parts = [self.fragments[0]]
+        for slot, fragment in zip(self.slots, self.fragments[1:]):
+            parts.append(escape(str(context[slot])))
+            parts.append(fragment)
+        return "".join(parts)
 
 class TemplateManager:
+    # Compiled templates are shared by every instance, keyed by template path
+    _compiled: Dict[Path, Tuple[Tuple[float, ...], CompiledTemplate]] = {}
+
     def __init__(self):
         # Dynamically determine the root path of the project
         self.root_dir = Path(__file__).resolve().parent.parent.parent  # Adjust this depending on the structure
@@ -32,15 +58,55 @@ class TemplateManager:
                 styled_html = styled_html.replace(f'<{tag}>', f'<{tag} style="{style}">')
         return styled_html
 
-    def render_template(self, template_name: str, **context) -> str:
-        """Render a markdown template with given context, applying advanced email styles."""
+    def _source_files(self, template_name: str) -> List[Path]:
+        return [self.templates_dir / 'header.md', self.templates_dir / f'{template_name}.md', self.templates_dir / 'footer.md']
+
+    def _compile(self, template_name: str) -> CompiledTemplate:
+        """Render header, template and footer to styled HTML once, with alphanumeric markers standing in for placeholders."""
         header = self._read_template('header.md')
         footer = self._read_template('footer.md')
-
-        # Read main template and format it with provided context
         main_template = self._read_template(f'{template_name}.md')
-        main_content = main_template.format(**context)
 
-        full_markdown = f"{header}\n{main_content}\n{footer}"
-        html_content = markdown2.markdown(full_markdown)
-        return self._apply_email_styles(html_content)
+        # Markers are plain words so markdown passes them through untouched, even inside link targets
+        slots = []
+        main_content = []
+        for literal, field_name, _, _ in Formatter().parse(main_template):
+            main_content.append(literal)
+            if field_name is not None:
+                main_content.append(f"TEMPLATESLOT{len(slots)}X")
+                slots.append(field_name)
+
+        full_markdown = f"{header}\n{''.join(main_content)}\n{footer}"
+        html_content = self._apply_email_styles(markdown2.markdown(full_markdown))
+
+        fragments = []
+        for index in range(len(slots)):
+            fragment, html_content = html_content.split(f"TEMPLATESLOT{index}X", 1)
+            fragments.append(fragment)
+        fragments.append(html_content)
+        return CompiledTemplate(fragments, slots)
+
+    def get_compiled(self, template_name: str) -> CompiledTemplate:
+        """
+        Return the compiled template, compiling it on first use.
+        With `email_template_auto_reload` enabled, source files are re-checked and recompiled when their mtime changes.
+        """
+        key = self.templates_dir / template_name
+        cached = self._compiled.get(key)
+        if cached is not None and not settings.email_template_auto_reload:
+            return cached[1]
+        mtimes = tuple(os.stat(path).st_mtime for path in self._source_files(template_name))
+        if cached is None or cached[0] != mtimes:
+            cached = (mtimes, self._compile(template_name))
+            self._compiled[key] = cached
+        return cached[1]
+
+    def precompile(self):
+        """Compile every email template up front so the first email of each type pays no compile cost."""
+        for path in self.templates_dir.glob('*.md'):
+            if path.stem not in ('header', 'footer'):
+                self.get_compiled(path.stem)
+
+    def render_template(self, template_name: str, **context) -> str:
+        """Render a markdown template with given context, applying advanced email styles."""
+        return self.get_compiled(template_name).render(context)
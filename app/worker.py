@@ -0,0 +1,46 @@
+"""
+Email outbox worker.
+
+Drains the `email_outbox` table in batches and delivers each email through EmailService, so API requests
+never wait on SMTP. Run one or more instances alongside the API with:
+
+    python -m app.worker
+"""
+import asyncio
+import logging
+from app.container import container
+from app.database import Database
+from app.services.outbox_service import OutboxService
+
+logger = logging.getLogger(__name__)
+
+async def run_worker(stop_event: asyncio.Event = None):
+    settings = container.settings
+    container.initialize_database()
+    session_factory = Database.get_session_factory()
+    email_service = container.email_service
+    stop_event = stop_event or asyncio.Event()
+    logger.info("Email outbox worker started.")
+    try:
+        while not stop_event.is_set():
+            try:
+                async with session_factory() as session:
+                    processed = await OutboxService.process_batch(session, email_service)
+            except Exception as e:
+                logger.error(f"Error processing email outbox batch: {e}")
+                processed = 0
+            if processed == 0:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=settings.email_outbox_poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+    finally:
+        await container.shutdown()
+        logger.info("Email outbox worker stopped.")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(run_worker())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,94 @@
+import hashlib
+from collections import OrderedDict
+from io import BytesIO
+from typing import Optional
+from minio.error import S3Error
+from app.minio_setup import AsyncObjectStorage, object_storage
+from qrcodegen.engine import QRRenderEngine, qr_render_engine
+from qrcodegen.rendering import QROptions
+from settings.config import settings
+
+
+def qr_artifact_key(data: str, options: QROptions) -> str:
+    """Content address of a QR image: a hash of the encoded payload and the render options."""
+    return hashlib.sha256(f"{options.cache_params()}\n{data}".encode("utf-8")).hexdigest()
+
+
+def qr_object_name(data: str, options: QROptions) -> str:
+    return f"qr_{qr_artifact_key(data, options)}.{options.image_format}"
+
+
+class QRArtifactCache:
+    """
+    Renders and stores each distinct QR image once.
+    Objects are named by the hash of what they encode, so an invitation that is resent or re-rendered maps
+    to the object that already exists. A local LRU keeps recently rendered or loaded image bytes.
+    Every method renders with the engine's options unless others are given.
+    """
+
+    def __init__(self, storage: AsyncObjectStorage, engine: QRRenderEngine, bucket_name: str, max_entries: int):
+        self.storage = storage
+        self.engine = engine
+        self.bucket_name = bucket_name
+        self.max_entries = max_entries
+        self._images: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def _remember(self, object_name: str, image: bytes):
+        self._images[object_name] = image
+        self._images.move_to_end(object_name)
+        while len(self._images) > self.max_entries:
+            self._images.popitem(last=False)
+
+    def _cached_image(self, object_name: str) -> Optional[bytes]:
+        image = self._images.get(object_name)
+        if image is not None:
+            self._images.move_to_end(object_name)
+        return image
+
+    async def get_image(self, data: str, options: Optional[QROptions] = None) -> bytes:
+        """Return the image for a payload, rendering it only if it is not in the local LRU."""
+        options = options or self.engine.options
+        object_name = qr_object_name(data, options)
+        image = self._cached_image(object_name)
+        if image is None:
+            image = (await self.engine.render(data, options)).getvalue()
+            self._remember(object_name, image)
+        return image
+
+    async def load_image(self, data: str, options: Optional[QROptions] = None) -> bytes:
+        """
+        Return the image for a payload for serving: from the local LRU, else from object storage, else rendered
+        and stored so the next worker to need it finds it in storage.
+        """
+        options = options or self.engine.options
+        object_name = qr_object_name(data, options)
+        image = self._cached_image(object_name)
+        if image is not None:
+            return image
+        try:
+            image = await self.storage.get_object_data(self.bucket_name, object_name)
+        except S3Error as e:
+            if e.code != "NoSuchKey":
+                raise
+            image = await self.get_image(data, options)
+            await self.storage.put_object(
+                bucket_name=self.bucket_name,
+                object_name=object_name,
+                data=BytesIO(image),
+                length=len(image),
+                content_type=options.content_type
+            )
+            return image
+        self._remember(object_name, image)
+        return image
+
+    def clear(self):
+        self._images.clear()
+
+
+qr_artifact_cache = QRArtifactCache(
+    object_storage,
+    qr_render_engine,
+    bucket_name=settings.minio_bucket,
+    max_entries=settings.qr_cache_max_entries
+)
@@ -0,0 +1,261 @@
+"""
+QR module matrix encoder producing exactly the symbols `qrcode` does, built for throughput.
+
+`qrcode` places, masks and scores modules one Python object at a time, eight times over to pick a mask.
+Here everything that depends only on the version is computed once and cached: the function patterns,
+the order data modules are placed in, and every mask pattern as a bit string over those modules.
+Encoding a payload is then a few big-integer XORs, one C-level gather per candidate mask and penalty
+scoring with a regular expression, substring counts and row bitmasks. Segmenting, version and mask selection and the penalty
+rules follow `qrcode` itself (its tables and pattern setup are reused), so the output is module-for-module
+identical to `qrcode.QRCode.get_matrix()`.
+"""
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Tuple
+from qrcode import LUT, QRCode, base, exceptions, util
+
+# GF(256) exponents doubled, so products of two logarithms need no modulo
+_EXP = base.EXP_TABLE[:255] * 2
+_LOG = base.LOG_TABLE
+
+_RUNS = re.compile(r"00000+|11111+")
+# Neither pattern overlaps itself, so non-overlapping `str.count` finds every occurrence
+_FINDER_LIKE = ("10111010000", "00001011101")
+
+
+class _Layout:
+    """The parts of a symbol that depend only on its version."""
+    __slots__ = ("size", "data_count", "blank", "gather", "transposed", "masks")
+
+    def __init__(self, version: int):
+        size = version * 4 + 17
+        qr = QRCode(version=version)
+        qr.modules_count = size
+        qr.modules = [[None] * size for _ in range(size)]
+        qr.setup_position_probe_pattern(0, 0)
+        qr.setup_position_probe_pattern(size - 7, 0)
+        qr.setup_position_probe_pattern(0, size - 7)
+        qr.setup_position_adjust_pattern()
+        qr.setup_timing_pattern()
+        # `qrcode` scores masks with format and version information left light
+        qr.setup_type_info(True, 0)
+        if version >= 7:
+            qr.setup_type_number(True)
+
+        data_cells = _placement_order(qr.modules)
+        data_index = {cell: k for k, cell in enumerate(data_cells)}
+        fixed_cells = [(row, col) for row in range(size) for col in range(size) if (row, col) not in data_index]
+        fixed_index = {cell: len(data_cells) + k for k, cell in enumerate(fixed_cells)}
+        source_index = {**data_index, **fixed_index}
+        newline = size * size
+
+        self.size = size
+        self.data_count = len(data_cells)
+        self.blank = qr.modules
+        # A symbol is gathered from one source string: data bits, then the fixed modules, then a newline.
+        # Rows (and, transposed, columns) come out newline-separated so no pattern match spans two of them.
+        self.gather = itemgetter(*[
+            index for row in range(size) for index in [source_index[(row, col)] for col in range(size)] + [newline]
+        ])
+        self.transposed = itemgetter(*[
+            index for col in range(size) for index in [source_index[(row, col)] for row in range(size)] + [newline]
+        ])
+        self.masks = tuple(
+            int("".join("1" if mask(row, col) else "0" for row, col in data_cells), 2)
+            for mask in map(util.mask_func, range(8))
+        )
+
+    def fixed_modules(self, error_correction: int, mask_pattern: int, test: bool) -> str:
+        """The non-data modules in row-major order, with format and version information unless `test`."""
+        qr = QRCode(version=(self.size - 17) // 4, error_correction=error_correction)
+        qr.modules_count = self.size
+        qr.modules = [row[:] for row in self.blank]
+        if not test:
+            qr.setup_type_info(False, mask_pattern)
+            if qr.version >= 7:
+                qr.setup_type_number(False)
+        return "".join(
+            "1" if module else "0"
+            for blank_row, row in zip(self.blank, qr.modules)
+            for blank_module, module in zip(blank_row, row)
+            if blank_module is not None
+        ) + "\n"
+
+
+def _placement_order(modules) -> List[Tuple[int, int]]:
+    """Data module coordinates in the zig-zag order `qrcode`'s `map_data` fills them."""
+    size = len(modules)
+    cells = []
+    inc = -1
+    row = size - 1
+    for col in range(size - 1, 0, -2):
+        if col <= 6:
+            col -= 1
+        while True:
+            for c in (col, col - 1):
+                if modules[row][c] is None:
+                    cells.append((row, c))
+            row += inc
+            if row < 0 or size <= row:
+                row -= inc
+                inc = -inc
+                break
+    return cells
+
+
+@lru_cache(maxsize=None)
+def _layout(version: int) -> _Layout:
+    return _Layout(version)
+
+
+@lru_cache(maxsize=None)
+def _fixed_modules(version: int, error_correction: int, mask_pattern: int, test: bool) -> str:
+    return _layout(version).fixed_modules(error_correction, mask_pattern, test)
+
+
+@lru_cache(maxsize=None)
+def _generator_logs(ec_count: int) -> Tuple[int, ...]:
+    """Logarithms of the Reed-Solomon generator polynomial's coefficients, leading term dropped."""
+    if ec_count in LUT.rsPoly_LUT:
+        coefficients = LUT.rsPoly_LUT[ec_count]
+    else:
+        poly = base.Polynomial([1], 0)
+        for i in range(ec_count):
+            poly = poly * base.Polynomial([1, base.gexp(i)], 0)
+        coefficients = list(poly)
+    return tuple(_LOG[coefficient] for coefficient in coefficients[1:])
+
+
+@lru_cache(maxsize=None)
+def _rs_blocks(version: int, error_correction: int) -> Tuple[Tuple[int, int], ...]:
+    return tuple((block.data_count, block.total_count - block.data_count) for block in base.rs_blocks(version, error_correction))
+
+
+def _error_correction(block: bytes, ec_count: int) -> List[int]:
+    generator = _generator_logs(ec_count)
+    remainder = [0] * ec_count
+    for byte in block:
+        factor = byte ^ remainder[0]
+        del remainder[0]
+        remainder.append(0)
+        if factor:
+            factor_log = _LOG[factor]
+            remainder = [r ^ _EXP[factor_log + g] for r, g in zip(remainder, generator)]
+    return remainder
+
+
+def _segments(data: bytes) -> List[Tuple[int, bytes]]:
+    return [(chunk.mode, chunk.data) for chunk in util.optimal_data_chunks(data, minimum=20)]
+
+
+def _segment_bits(segments, version: int) -> Tuple[int, int]:
+    """The mode, length and payload bits of every segment, as one integer and its bit length."""
+    mode_sizes = util.mode_sizes_for_version(version)
+    bits = length = 0
+    for mode, chunk in segments:
+        bits = (bits << 4 | mode) << mode_sizes[mode] | len(chunk)
+        length += 4 + mode_sizes[mode]
+        if mode == util.MODE_8BIT_BYTE:
+            bits = bits << 8 * len(chunk) | int.from_bytes(chunk, "big")
+            length += 8 * len(chunk)
+        elif mode == util.MODE_NUMBER:
+            for i in range(0, len(chunk), 3):
+                width = util.NUMBER_LENGTH[len(chunk[i:i + 3])]
+                bits = bits << width | int(chunk[i:i + 3])
+                length += width
+        else:
+            for i in range(0, len(chunk), 2):
+                pair = chunk[i:i + 2]
+                if len(pair) == 2:
+                    bits = bits << 11 | util.ALPHA_NUM.find(pair[0]) * 45 + util.ALPHA_NUM.find(pair[1])
+                    length += 11
+                else:
+                    bits = bits << 6 | util.ALPHA_NUM.find(pair)
+                    length += 6
+    return bits, length
+
+
+def _best_version(segments, error_correction: int) -> int:
+    start = 1
+    while True:
+        _, needed = _segment_bits(segments, start)
+        version = bisect_left(util.BIT_LIMIT_TABLE[error_correction], needed, start)
+        if version == 41:
+            raise exceptions.DataOverflowError()
+        if util.mode_sizes_for_version(version) is util.mode_sizes_for_version(start):
+            return version
+        start = version
+
+
+def _codewords(segments, version: int, error_correction: int) -> bytes:
+    bits, length = _segment_bits(segments, version)
+    limit = util.BIT_LIMIT_TABLE[error_correction][version]
+    terminator = min(limit - length, 4)
+    bits <<= terminator
+    length += terminator
+    padding = -length % 8
+    bits <<= padding
+    length += padding
+    pad_bytes = (limit - length) // 8
+    data = bits.to_bytes(length // 8, "big") + (bytes((util.PAD0, util.PAD1)) * pad_bytes)[:pad_bytes]
+
+    blocks = []
+    offset = 0
+    for data_count, ec_count in _rs_blocks(version, error_correction):
+        block = data[offset:offset + data_count]
+        offset += data_count
+        blocks.append((block, _error_correction(block, ec_count)))
+    interleaved = bytearray()
+    for i in range(max(len(block) for block, _ in blocks)):
+        interleaved.extend(block[i] for block, _ in blocks if i < len(block))
+    for i in range(max(len(ec) for _, ec in blocks)):
+        interleaved.extend(ec[i] for _, ec in blocks if i < len(ec))
+    return bytes(interleaved)
+
+
+def _penalty(rows: str, columns: str, size: int) -> int:
+    """`qrcode`'s `util.lost_point`, over newline-separated row and column strings."""
+    runs = _RUNS.findall(rows) + _RUNS.findall(columns)
+    points = sum(map(len, runs)) - 2 * len(runs)
+
+    row_ints = [int(row, 2) for row in rows.split("\n")[:size]]
+    pairs = (1 << (size - 1)) - 1
+    for upper, lower in zip(row_ints, row_ints[1:]):
+        same = ~(upper ^ lower)
+        level = ~(upper ^ upper >> 1)
+        points += 3 * (same & same >> 1 & level & pairs).bit_count()
+
+    points += 40 * sum(lines.count(pattern) for lines in (rows, columns) for pattern in _FINDER_LIKE)
+
+    percent = float(rows.count("1")) / (size ** 2)
+    return points + int(abs(percent * 100 - 50) / 5) * 10
+
+
+def encode_modules(data, error_correction: int) -> List[str]:
+    """
+    Encode data as a QR symbol, without a quiet zone.
+    :param data: Text (encoded as UTF-8) or bytes.
+    :param error_correction: One of the `qrcode.constants.ERROR_CORRECT_*` levels.
+    :return: One string per row, '1' for a dark module and '0' for a light one.
+    :raises qrcode.exceptions.DataOverflowError: If the data does not fit in a version 40 symbol.
+    """
+    segments = _segments(util.to_bytestring(data))
+    version = _best_version(segments, error_correction)
+    layout = _layout(version)
+    data_count = layout.data_count
+    codewords = _codewords(segments, version, error_correction)
+    # Bits past the last codeword are light before masking
+    data_bits = int.from_bytes(codewords, "big") << (data_count - 8 * len(codewords))
+    bit_format = f"0{data_count}b"
+
+    best_points = best_mask = None
+    for mask_pattern, mask in enumerate(layout.masks):
+        source = format(data_bits ^ mask, bit_format) + _fixed_modules(version, error_correction, mask_pattern, True)
+        points = _penalty("".join(layout.gather(source)), "".join(layout.transposed(source)), layout.size)
+        if best_points is None or points < best_points:
+            best_points, best_mask = points, mask_pattern
+
+    source = format(data_bits ^ layout.masks[best_mask], bit_format) + _fixed_modules(version, error_correction, best_mask, False)
+    return "".join(layout.gather(source)).split("\n")[:layout.size]
@@ -0,0 +1,50 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Iterable, List, Optional
+from qrcodegen.rendering import QROptions, render_qr_image
+from settings.config import settings
+
+# Workers must not be forked from the server: by the time the pool starts, the event loop and the Minio, SMTP and
+# password hashing threads exist, and a forked child can deadlock on a lock one of them held at fork time
+WORKER_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class QRRenderEngine:
+    """Renders QR codes in a process pool so CPU-bound encoding never runs on the event loop."""
+
+    def __init__(self, max_workers: Optional[int] = None, options: QROptions = QROptions()):
+        self.max_workers = max_workers
+        self.options = options
+        self.mp_context = multiprocessing.get_context(WORKER_START_METHOD)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self):
+        """Create the worker pool if it is not already running."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.mp_context)
+
+    def shutdown(self):
+        """Stop the worker pool, waiting for in-flight renders to finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def render(self, data: str, options: Optional[QROptions] = None) -> BytesIO:
+        """
+        Renders a QR code without blocking the event loop, with the engine's options unless others are given.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        image = await loop.run_in_executor(self._executor, render_qr_image, data, options or self.options)
+        return BytesIO(image)
+
+    async def render_many(self, data: Iterable[str], options: Optional[QROptions] = None) -> List[BytesIO]:
+        """
+        Renders a batch of QR codes across the pool, preserving input order.
+        """
+        return list(await asyncio.gather(*(self.render(item, options) for item in data)))
+
+
+qr_render_engine = QRRenderEngine(max_workers=settings.qr_render_workers, options=QROptions.from_settings(settings))
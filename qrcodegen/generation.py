@@ -1,18 +1,26 @@
-import qrcode
 from base64 import urlsafe_b64encode
 from io import BytesIO
-from app.minio_setup import minio_client
+from typing import Optional
+from qrcodegen.artifact_cache import qr_artifact_cache, qr_artifact_key
+from qrcodegen.engine import qr_render_engine
+from qrcodegen.rendering import QROptions, render_qr_image
 from settings.config import settings
 
-def generate_qr_code(data: str) -> BytesIO:
+def qr_options(image_format: Optional[str] = None) -> QROptions:
     """
-    Generates a QR code as a PNG image.
+    The configured QR render options, optionally with another image format.
+    :raises ValueError: If the image format is not supported.
     """
-    qr = qrcode.make(data)
-    img_stream = BytesIO()
-    qr.save(img_stream, 'PNG')
-    img_stream.seek(0)
-    return img_stream
+    options = qr_render_engine.options
+    if image_format and image_format != options.image_format:
+        options = options.with_format(image_format)
+    return options
+
+def generate_qr_code(data: str, options: Optional[QROptions] = None) -> BytesIO:
+    """
+    Generates a QR code in the calling thread, with the configured options unless others are given.
+    """
+    return BytesIO(render_qr_image(data, options or qr_options()))
 
 def generate_qr_data(nickname: str, invite_code: str) -> str:
     """
@@ -22,31 +30,29 @@ def generate_qr_data(nickname: str, invite_code: str) -> str:
     redirect_url = f"{settings.server_base_url}accept?nickname={base64_nickname}&invite_code={invite_code}"
     return redirect_url
 
-def store_qr_code_in_minio(user_id: int, nickname: str, invite_code: str, img_stream: BytesIO):
+async def load_qr_code_image(nickname: str, invite_code: str, options: Optional[QROptions] = None) -> bytes:
     """
-    Stores the generated QR code in Minio and returns the file URL.
+    Returns the image for an invitation's QR code, rendering and storing it on first use.
+    Later calls are served from the in-process LRU or from Minio.
     """
-    try:
-        file_name = f"invite_{invite_code}.png"
-        bucket_name = settings.minio_bucket
-        if not bucket_name:
-            raise ValueError("MINIO_BUCKET is not set.")
-
-        qr_data = generate_qr_data(nickname, invite_code)
+    return await qr_artifact_cache.load_image(generate_qr_data(nickname, invite_code), options or qr_options())
 
-        img_stream = generate_qr_code(qr_data)
+async def render_qr_code_png(nickname: str, invite_code: str) -> bytes:
+    """
+    Returns the PNG for an invitation's QR code for embedding in an email, whatever `qr_image_format` is.
+    The bytes come from the in-process LRU or a fresh in-memory render; nothing is read back from Minio.
+    """
+    return await qr_artifact_cache.get_image(generate_qr_data(nickname, invite_code), qr_options("png"))
 
-        minio_client.put_object(
-            bucket_name=bucket_name,
-            object_name=file_name,
-            data=img_stream,
-            length=len(img_stream.getvalue())
-        )
+def qr_code_version(nickname: str, invite_code: str, options: Optional[QROptions] = None) -> str:
+    """Short content hash of an invitation's QR image; changes whenever the encoded accept URL or render options change."""
+    return qr_artifact_key(generate_qr_data(nickname, invite_code), options or qr_options())[:16]
 
-        return {
-            "file_name": file_name,
-            "url": f"http://localhost:9000/{bucket_name}/{file_name}"
-        }
-    except Exception as e:
-        print(f"Error storing QR code in Minio: {e}")
-        raise
+def qr_code_url_for(nickname: str, invite_code: str, options: Optional[QROptions] = None) -> str:
+    """
+    URL of the API endpoint serving an invitation's QR code. It carries the content version, so the
+    image at a given URL never changes and clients may cache it as immutable.
+    """
+    options = options or qr_options()
+    version = qr_code_version(nickname, invite_code, options)
+    return f"{settings.server_base_url}invites/{invite_code}/qr.{options.image_format}?v={version}"
@@ -0,0 +1,141 @@
+import dataclasses
+import re
+import struct
+import zlib
+import qrcode
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List
+from qrcodegen.encoder import encode_modules
+
+ERROR_CORRECTION_LEVELS = {
+    "L": qrcode.constants.ERROR_CORRECT_L,
+    "M": qrcode.constants.ERROR_CORRECT_M,
+    "Q": qrcode.constants.ERROR_CORRECT_Q,
+    "H": qrcode.constants.ERROR_CORRECT_H,
+}
+
+CONTENT_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+# Part of every cache key; bump it whenever the renderer's output for the same options changes
+RENDERER_VERSION = "v3"
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+_DARK_RUN = re.compile("1+")
+
+
+@dataclass(frozen=True)
+class QROptions:
+    """How a QR code is rendered. Immutable and picklable, so it can be sent to the render workers."""
+    image_format: str = "png"
+    error_correction: str = "M"
+    box_size: int = 10
+    border: int = 4
+    png_compress_level: int = 9
+
+    def __post_init__(self):
+        if self.image_format not in CONTENT_TYPES:
+            raise ValueError(f"Unsupported QR image format: {self.image_format}")
+        if self.error_correction not in ERROR_CORRECTION_LEVELS:
+            raise ValueError(f"Unsupported QR error correction level: {self.error_correction}")
+        if self.box_size < 1:
+            raise ValueError(f"QR box size must be at least 1: {self.box_size}")
+        if self.border < 0:
+            raise ValueError(f"QR border must not be negative: {self.border}")
+        if not 0 <= self.png_compress_level <= 9:
+            raise ValueError(f"PNG compression level must be between 0 and 9: {self.png_compress_level}")
+
+    @classmethod
+    def from_settings(cls, settings) -> "QROptions":
+        return cls(
+            image_format=settings.qr_image_format,
+            error_correction=settings.qr_error_correction,
+            box_size=settings.qr_box_size,
+            border=settings.qr_border,
+            png_compress_level=settings.qr_png_compress_level,
+        )
+
+    def with_format(self, image_format: str) -> "QROptions":
+        return dataclasses.replace(self, image_format=image_format)
+
+    @property
+    def content_type(self) -> str:
+        return CONTENT_TYPES[self.image_format]
+
+    def cache_params(self) -> str:
+        """Every option that changes the output bytes, for content-addressed cache keys."""
+        params = f"{self.image_format}:{RENDERER_VERSION}:ec={self.error_correction}:box={self.box_size}:border={self.border}"
+        if self.image_format == "png":
+            params += f":z={self.png_compress_level}"
+        return params
+
+
+def qr_rows(data: str, options: QROptions) -> List[str]:
+    """Encode data as QR modules, quiet zone included: one string per row, '1' for a dark module."""
+    modules = encode_modules(data, ERROR_CORRECTION_LEVELS[options.error_correction])
+    quiet = "0" * options.border
+    width = len(modules) + 2 * options.border
+    quiet_rows = ["0" * width] * options.border
+    return quiet_rows + [quiet + row + quiet for row in modules] + quiet_rows
+
+
+@lru_cache(maxsize=16)
+def _scale_row(box_size: int) -> dict:
+    # Each module becomes box_size pixels; PNG grayscale bit 1 is white, so the bits are inverted too
+    return str.maketrans({"0": "1" * box_size, "1": "0" * box_size})
+
+
+def _png_chunk(tag: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I", len(payload)) + tag + payload + struct.pack(">I", zlib.crc32(tag + payload))
+
+
+def rows_to_png(rows: List[str], options: QROptions) -> bytes:
+    """
+    Write a 1-bit grayscale PNG directly, without PIL. Each row is scaled in bulk with one `str.translate`
+    and packed to bytes with a single int conversion; the scanline is then repeated `box_size` times.
+    """
+    box_size = options.box_size
+    width = len(rows[0]) * box_size
+    padding = "1" * (-width % 8)
+    row_bytes = (width + 7) // 8
+    scale = _scale_row(box_size)
+    scanlines = {}
+    image = bytearray()
+    for row in rows:
+        scanline = scanlines.get(row)
+        if scanline is None:
+            # Filter type 0, then the packed pixels
+            scanline = scanlines[row] = (b"\x00" + int(row.translate(scale) + padding, 2).to_bytes(row_bytes, "big")) * box_size
+        image += scanline
+    header = struct.pack(">IIBBBBB", width, len(rows) * box_size, 1, 0, 0, 0, 0)
+    return b"".join((
+        PNG_SIGNATURE,
+        _png_chunk(b"IHDR", header),
+        _png_chunk(b"IDAT", zlib.compress(image, options.png_compress_level)),
+        _png_chunk(b"IEND", b""),
+    ))
+
+
+def rows_to_svg(rows: List[str], options: QROptions) -> bytes:
+    """Write the modules as a single SVG path, one subpath per horizontal run of dark modules."""
+    size = len(rows)
+    runs = [
+        f"M{run.start()} {y}h{run.end() - run.start()}v1H{run.start()}z"
+        for y, row in enumerate(rows)
+        for run in _DARK_RUN.finditer(row)
+    ]
+    pixels = size * options.box_size
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{pixels}" height="{pixels}" '
+        f'viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+        f'<rect width="{size}" height="{size}" fill="#fff"/><path d="{"".join(runs)}"/></svg>'
+    ).encode("ascii")
+
+
+def render_qr_image(data: str, options: QROptions) -> bytes:
+    """Render data as a QR image in the requested format. Runs inside the render workers, so it only returns bytes."""
+    rows = qr_rows(data, options)
+    if options.image_format == "svg":
+        return rows_to_svg(rows, options)
+    return rows_to_png(rows, options)
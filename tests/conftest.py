@@ -33,6 +33,8 @@ from app.main import app
 from app.database import Base, Database
 from app.models.user_model import User, UserRole
 from app.dependencies import get_db, get_settings
+from app.services.count_service import CountService
+from app.services.invite_cache import build_cache_backend, invite_cache
 from app.utils.security import hash_password
 from app.utils.template_manager import TemplateManager
 from app.services.email_service import EmailService
@@ -101,14 +103,20 @@ async def setup_database():
             await conn.execute(text('ALTER TABLE invitations DROP CONSTRAINT IF EXISTS invitations_user_id_fkey'))
             await conn.execute(text('DROP TABLE IF EXISTS invitations CASCADE'))
         
+        await conn.execute(text('DROP TABLE IF EXISTS email_outbox CASCADE'))
+
         # Check for and drop the 'users' table
         result = await conn.execute(text("SELECT to_regclass('public.users')"))
         users_exists = result.scalar() is not None
 
         if users_exists:
             await conn.execute(text('DROP TABLE IF EXISTS users CASCADE'))
-    # Dispose of the engine connection
+    # Tables are recreated for every test, so totals and invitations cached by the previous one are stale
+    CountService.clear()
+    invite_cache.backend = build_cache_backend()
+    # Dispose of the engine connections, including the app's own, which background work uses outside the test session
     await engine.dispose()
+    await Database.dispose()
 
 @pytest.fixture(scope="function")
 async def db_session(setup_database):
@@ -193,10 +201,11 @@ async def users_with_same_role_50_users(db_session):
     users = []
     for _ in range(50):
         user_data = {
-            "nickname": fake.user_name(),
+            # Fifty draws from Faker collide often enough to trip the unique indexes
+            "nickname": fake.unique.user_name(),
             "first_name": fake.first_name(),
             "last_name": fake.last_name(),
-            "email": fake.email(),
+            "email": fake.unique.email(),
             "hashed_password": fake.password(),
             "role": UserRole.AUTHENTICATED,
             "email_verified": False,
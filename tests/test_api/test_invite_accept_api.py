@@ -56,3 +56,24 @@ async def test_accept_invite_invalid_code(async_client):
     # Assertions
     assert response.status_code == 400  # Bad Request
     assert response.json()["detail"] == "Error processing invitation: 400: Invalid or expired invite code."
+
+
+@pytest.mark.asyncio
+async def test_accept_invite_twice_is_rejected(async_client, db_session, verified_user, email_service):
+    """
+    Test that a second scan of an already accepted invitation is rejected.
+    """
+    invitation = await InviteService.create_invitation(
+        session=db_session,
+        invitee_email="pytest@example.com",
+        user_id=verified_user.id,
+        nickname="test_nickname",
+        email_service=email_service,
+    )
+    encoded_nickname = urlsafe_b64encode(b"test_nickname").decode("utf-8")
+    url = f"/accept?nickname={encoded_nickname}&invite_code={invitation.invite_code}"
+
+    assert (await async_client.get(url)).status_code == 307
+    response = await async_client.get(url)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Error processing invitation: 400: Invitation has already been used."
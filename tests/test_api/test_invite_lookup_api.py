@@ -0,0 +1,16 @@
+import pytest
+from app.models.invite_model import Invitation
+
+@pytest.mark.asyncio
+async def test_get_invite_by_code(async_client, db_session, verified_user, user_token):
+    db_session.add(Invitation(invitee_email="lookup@example.com", invite_code="lookup-code", nickname="nick", user_id=verified_user.id))
+    await db_session.commit()
+    headers = {"Authorization": f"Bearer {user_token}"}
+
+    for _ in range(2):  # the second request is served from the invite cache
+        response = await async_client.get("/invites/lookup-code", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["invitee_email"] == "lookup@example.com"
+
+    response = await async_client.get("/invites/missing-code", headers=headers)
+    assert response.status_code == 404
@@ -0,0 +1,90 @@
+import pytest
+from app.models.invite_model import Invitation
+from app.services.invite_service import InviteService
+from qrcodegen.artifact_cache import qr_artifact_cache
+from qrcodegen.generation import qr_code_url_for, qr_code_version, qr_options
+
+pytestmark = pytest.mark.asyncio
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+@pytest.fixture
+async def invite(db_session, verified_user):
+    invite = Invitation(invitee_email="qr@example.com", invite_code="qr-code-1", nickname="qr_nick", user_id=verified_user.id)
+    db_session.add(invite)
+    await db_session.commit()
+    return invite
+
+@pytest.fixture
+def forbid_rendering(monkeypatch):
+    async def fail_render(data, options=None):
+        raise AssertionError("the QR code must not be rendered")
+    monkeypatch.setattr(qr_artifact_cache.engine, "render", fail_render)
+
+async def test_qr_code_is_rendered_on_first_request_and_cacheable(async_client, invite):
+    version = qr_code_version(invite.nickname, invite.invite_code)
+    response = await async_client.get(f"/invites/{invite.invite_code}/qr.png", params={"v": version})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    assert response.content.startswith(PNG_SIGNATURE)
+    assert response.headers["etag"] == f'"{version}"'
+    assert "immutable" in response.headers["cache-control"]
+
+    # Without the content version the image at this URL could change, so clients must revalidate
+    response = await async_client.get(f"/invites/{invite.invite_code}/qr.png")
+    assert response.headers["cache-control"] == "no-cache"
+
+async def test_matching_etag_gets_304_without_loading_the_image(async_client, invite, forbid_rendering, monkeypatch):
+    async def fail_load(data, options=None):
+        raise AssertionError("a 304 must not load the image")
+    monkeypatch.setattr(qr_artifact_cache, "load_image", fail_load)
+
+    etag = f'"{qr_code_version(invite.nickname, invite.invite_code)}"'
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = await async_client.get(f"/invites/{invite.invite_code}/qr.png", headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+async def test_later_requests_are_served_from_storage(async_client, invite, monkeypatch):
+    first = await async_client.get(f"/invites/{invite.invite_code}/qr.png")
+    # A worker that has not rendered it loads the stored object instead of rendering again
+    qr_artifact_cache.clear()
+    async def fail_render(data, options=None):
+        raise AssertionError("a stored QR code must not be rendered again")
+    monkeypatch.setattr(qr_artifact_cache.engine, "render", fail_render)
+
+    second = await async_client.get(f"/invites/{invite.invite_code}/qr.png")
+    assert second.status_code == 200
+    assert second.content == first.content
+
+async def test_qr_code_is_served_as_svg(async_client, invite):
+    options = qr_options("svg")
+    version = qr_code_version(invite.nickname, invite.invite_code, options)
+    assert version != qr_code_version(invite.nickname, invite.invite_code)
+    response = await async_client.get(f"/invites/{invite.invite_code}/qr.svg", params={"v": version})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/svg+xml"
+    assert response.content.startswith(b"<svg ")
+    assert response.headers["etag"] == f'"{version}"'
+    assert "immutable" in response.headers["cache-control"]
+
+async def test_unknown_invite_code_is_404(async_client):
+    response = await async_client.get("/invites/missing-code/qr.png")
+    assert response.status_code == 404
+
+async def test_unsupported_format_is_404(async_client, invite):
+    response = await async_client.get(f"/invites/{invite.invite_code}/qr.gif")
+    assert response.status_code == 404
+
+async def test_create_invitation_does_not_render(db_session, verified_user, email_service, forbid_rendering):
+    invitation = await InviteService.create_invitation(
+        db_session,
+        invitee_email="lazy@example.com",
+        user_id=verified_user.id,
+        nickname="lazy_nick",
+        email_service=email_service,
+    )
+    assert invitation is not None
+    assert invitation.qr_code_url == qr_code_url_for("lazy_nick", invitation.invite_code)
+    assert f"/invites/{invitation.invite_code}/qr.png?v=" in invitation.qr_code_url
@@ -5,6 +5,7 @@ from app.main import app
 from app.models.user_model import User, UserRole
 from app.utils.nickname_gen import generate_nickname
 from app.utils.security import hash_password
+from app.utils.password_hasher import password_hasher
 from app.services.jwt_service import decode_token  # Import your FastAPI app
 
 # Example of a test function using the async_client fixture
@@ -190,3 +191,42 @@ async def test_list_users_unauthorized(async_client, user_token):
         headers={"Authorization": f"Bearer {user_token}"}
     )
     assert response.status_code == 403  # Forbidden, as expected for regular user
+
+@pytest.mark.asyncio
+async def test_list_users_with_cursor(async_client, admin_token, users_with_same_role_50_users):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/?limit=20", headers=headers)
+    assert response.status_code == 200
+    first_page = response.json()
+    next_link = next(link["href"] for link in first_page["links"] if link["rel"] == "next")
+    assert "cursor=" in next_link and "skip=" not in next_link
+
+    response = await async_client.get(next_link, headers=headers)
+    assert response.status_code == 200
+    second_page = response.json()
+    assert second_page["page"] is None
+    first_ids = {user["id"] for user in first_page["items"]}
+    assert not first_ids & {user["id"] for user in second_page["items"]}
+
+@pytest.mark.asyncio
+async def test_list_users_with_invalid_cursor(async_client, admin_token):
+    response = await async_client.get("/users/?cursor=bogus", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_login_rejected_with_429_when_password_pool_is_saturated(async_client, verified_user, monkeypatch):
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+    monkeypatch.setattr(password_hasher, "_in_flight", password_hasher.max_workers)
+    form_data = {
+        "username": verified_user.email,
+        "password": "MySuperPassword$1234"
+    }
+    response = await async_client.post("/login/", data=urlencode(form_data), headers={"Content-Type": "application/x-www-form-urlencoded"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+@pytest.mark.asyncio
+async def test_password_hasher_metrics(async_client, admin_token):
+    response = await async_client.get("/metrics/password-hasher", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    assert set(response.json()["verify"]) == {"calls", "wait_seconds_total", "wait_seconds_max", "run_seconds_total", "run_seconds_max"}
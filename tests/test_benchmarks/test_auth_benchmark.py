@@ -0,0 +1,44 @@
+"""
+Benchmark: get_current_user throughput with and without the verified-token cache, for HS256 and
+EdDSA keys. Run with `pytest -m slow -s` to see the numbers.
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from app.dependencies import get_current_user
+from app.services import jwt_service
+from app.services.jwt_service import KeyRing, VerifiedTokenCache, create_access_token
+
+pytestmark = pytest.mark.slow
+
+CALLS = 20_000
+
+def calls_per_second(token) -> float:
+    async def run():
+        start = time.perf_counter()
+        for _ in range(CALLS):
+            # A fresh request each time, so the principal is never reused from request state
+            await get_current_user(SimpleNamespace(state=SimpleNamespace()), token)
+        return CALLS / (time.perf_counter() - start)
+    return asyncio.run(run())
+
+def ed25519_key_ring() -> KeyRing:
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    return KeyRing("bench", "EdDSA", private_key, {"bench": ("EdDSA", private_key.public_key())})
+
+@pytest.mark.parametrize("key_ring", [None, ed25519_key_ring()], ids=["HS256", "EdDSA"])
+def test_get_current_user_throughput(monkeypatch, key_ring):
+    if key_ring is not None:
+        monkeypatch.setattr(jwt_service, "key_ring", key_ring)
+    token = create_access_token(data={"sub": "user@example.com", "role": "admin", "user_id": str(uuid4())})
+
+    monkeypatch.setattr(jwt_service, "token_cache", VerifiedTokenCache(max_entries=0))
+    uncached = calls_per_second(token)
+    monkeypatch.setattr(jwt_service, "token_cache", VerifiedTokenCache(max_entries=100))
+    cached = calls_per_second(token)
+
+    print(f"\n{jwt_service.key_ring.algorithm}: uncached={uncached:,.0f}/s cached={cached:,.0f}/s ({cached / uncached:.1f}x)")
+    assert cached > 3 * uncached
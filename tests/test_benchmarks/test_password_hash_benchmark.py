@@ -0,0 +1,41 @@
+"""
+Benchmark: password hashes per second on one core for each supported policy, to weigh login
+throughput against hash strength when tuning the password_* settings. Run with `pytest -m slow -s`.
+"""
+import time
+import pytest
+from app.utils.password_policy import Argon2Scheme, BcryptScheme
+
+pytestmark = pytest.mark.slow
+
+MIN_SECONDS = 1.0
+
+POLICIES = [
+    ("bcrypt rounds=10", BcryptScheme(rounds=10)),
+    ("bcrypt rounds=12", BcryptScheme(rounds=12)),
+    ("argon2id t=2 m=19MiB p=1", Argon2Scheme(time_cost=2, memory_cost=19456, parallelism=1)),
+    ("argon2id t=3 m=12MiB p=1", Argon2Scheme(time_cost=3, memory_cost=12288, parallelism=1)),
+    ("argon2id t=1 m=47MiB p=1", Argon2Scheme(time_cost=1, memory_cost=47104, parallelism=1)),
+]
+
+def hashes_per_second(scheme):
+    # Single-threaded, so the rate is per core; password_hash_workers multiplies it up to the core count
+    scheme.hash("warm-up")
+    count = 0
+    start = time.perf_counter()
+    while True:
+        scheme.hash(f"MySuperPassword${count}")
+        count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SECONDS:
+            return count / elapsed
+
+def test_password_hashes_per_second_per_core():
+    rates = {name: hashes_per_second(scheme) for name, scheme in POLICIES}
+    print()
+    for name, rate in rates.items():
+        print(f"{name:<36} {rate:8.1f} hashes/s/core  ({1000 / rate:6.1f} ms/hash)")
+    # Each bcrypt cost step doubles the work
+    assert rates["bcrypt rounds=10"] > 2 * rates["bcrypt rounds=12"]
+    # The OWASP-recommended argon2id parameters log users in faster than bcrypt at cost 12
+    assert rates["argon2id t=2 m=19MiB p=1"] > rates["bcrypt rounds=12"]
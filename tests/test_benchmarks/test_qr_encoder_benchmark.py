@@ -0,0 +1,53 @@
+"""
+Benchmark: QR encoding and PNG rendering with `qrcode` versus the fast-path encoder.
+
+The `qrcode` rows build a QRCode per accept URL, as the renderer did before; the fast-path rows use
+`encode_modules` and `render_qr_image`. Both produce identical modules, checked here for every payload.
+Run with `pytest -m slow -s` to see the numbers.
+"""
+import time
+from io import BytesIO
+import pytest
+import qrcode
+from qrcodegen.encoder import encode_modules
+from qrcodegen.generation import generate_qr_data
+from qrcodegen.rendering import ERROR_CORRECTION_LEVELS, QROptions, render_qr_image
+
+pytestmark = pytest.mark.slow
+
+INVITES = 60
+OPTIONS = QROptions(box_size=6)
+ERROR_CORRECTION = ERROR_CORRECTION_LEVELS[OPTIONS.error_correction]
+
+def qrcode_matrix(data: str):
+    qr = qrcode.QRCode(error_correction=ERROR_CORRECTION, border=0)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return ["".join("1" if module else "0" for module in row) for row in qr.get_matrix()]
+
+def qrcode_png(data: str) -> bytes:
+    qr = qrcode.QRCode(error_correction=ERROR_CORRECTION, box_size=OPTIONS.box_size, border=OPTIONS.border)
+    qr.add_data(data)
+    stream = BytesIO()
+    qr.make_image().save(stream, "PNG")
+    return stream.getvalue()
+
+def per_invite_ms(func, payloads) -> float:
+    func(payloads[0])
+    start = time.perf_counter()
+    for payload in payloads:
+        func(payload)
+    return (time.perf_counter() - start) / len(payloads) * 1000
+
+def test_fast_encoder_speedup():
+    payloads = [generate_qr_data(f"brave_otter_{i}", f"invite{i:010d}") for i in range(INVITES)]
+    for payload in payloads:
+        assert encode_modules(payload, ERROR_CORRECTION) == qrcode_matrix(payload)
+
+    encode_qrcode = per_invite_ms(qrcode_matrix, payloads)
+    encode_fast = per_invite_ms(lambda data: encode_modules(data, ERROR_CORRECTION), payloads)
+    render_qrcode = per_invite_ms(qrcode_png, payloads)
+    render_fast = per_invite_ms(lambda data: render_qr_image(data, OPTIONS), payloads)
+
+    print(f"\nencode: qrcode={encode_qrcode:.2f}ms fast={encode_fast:.2f}ms ({encode_qrcode / encode_fast:.1f}x)")
+    print(f"png:    qrcode={render_qrcode:.2f}ms fast={render_fast:.2f}ms ({render_qrcode / render_fast:.1f}x)")
@@ -0,0 +1,58 @@
+"""
+Benchmark: bytes and render time of an invitation QR code per output format and option set.
+
+The legacy image is `qrcode.make` saved as PNG (box size 10, error correction M). The other rows render
+through `render_qr_image`; the output stage is also timed on its own, because encoding the payload into
+modules costs the same for every format. Run with `pytest -m slow -s` to see the numbers.
+"""
+import time
+import pytest
+import qrcode
+from io import BytesIO
+from qrcodegen.rendering import QROptions, qr_rows, render_qr_image, rows_to_png, rows_to_svg
+
+pytestmark = pytest.mark.slow
+
+PAYLOAD = "http://localhost/accept?nickname=YnJhdmVfb3R0ZXJfNDI=&invite_code=AbCdEfGhIjKlMnOp"
+ROUNDS = 40
+
+OPTION_SETS = {
+    "png ec=M box=10": QROptions(box_size=10),
+    "png ec=M box=6": QROptions(box_size=6),
+    "png ec=L box=6": QROptions(error_correction="L", box_size=6),
+    "png ec=M box=6 z=1": QROptions(box_size=6, png_compress_level=1),
+    "svg ec=M": QROptions(image_format="svg"),
+    "svg ec=L": QROptions(image_format="svg", error_correction="L"),
+}
+
+def legacy_render(data: str) -> bytes:
+    stream = BytesIO()
+    qrcode.make(data).save(stream, "PNG")
+    return stream.getvalue()
+
+def per_call_ms(func) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func()
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+def test_qr_bytes_and_render_time_per_format():
+    legacy = legacy_render(PAYLOAD)
+    rows = [("legacy qrcode.make png", len(legacy), per_call_ms(lambda: legacy_render(PAYLOAD)), None)]
+    sizes = {}
+    output_ms = {}
+    for label, options in OPTION_SETS.items():
+        modules = qr_rows(PAYLOAD, options)
+        write = rows_to_svg if options.image_format == "svg" else rows_to_png
+        sizes[label] = len(render_qr_image(PAYLOAD, options))
+        output_ms[label] = per_call_ms(lambda: write(modules, options))
+        rows.append((label, sizes[label], per_call_ms(lambda: render_qr_image(PAYLOAD, options)), output_ms[label]))
+
+    print()
+    for label, size, total_ms, write_ms in rows:
+        output = "" if write_ms is None else f" (output stage {write_ms:.2f}ms)"
+        print(f"{label:<24} {size:>6} bytes {total_ms:6.2f}ms{output}")
+
+    assert sizes["png ec=M box=6"] < len(legacy)
+    assert sizes["png ec=M box=6"] < sizes["png ec=M box=6 z=1"]
@@ -0,0 +1,63 @@
+"""
+Benchmark: p99 latency of an unrelated endpoint while QR codes are being rendered.
+
+Rendering inline on the event loop with `qrcode.make` (the old behaviour) is compared with rendering
+through QRRenderEngine's process pool. Latencies on a shared machine are too noisy to assert a winner,
+so the numbers are only reported. Run with `pytest -m slow -s` to see the numbers.
+"""
+import asyncio
+import time
+from io import BytesIO
+import pytest
+import qrcode
+from qrcodegen.engine import QRRenderEngine
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.slow]
+
+RENDERS = 60
+PROBE_INTERVAL = 0.002
+
+def p99(samples):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+async def probe(async_client, stop: asyncio.Event):
+    # Requests "arrive" every PROBE_INTERVAL; latency is measured from arrival, so time spent
+    # waiting for a blocked event loop counts against the endpoint just as it would in production.
+    latencies = []
+    while not stop.is_set():
+        arrival = time.perf_counter() + PROBE_INTERVAL
+        await asyncio.sleep(PROBE_INTERVAL)
+        await async_client.get("/accepted")
+        latencies.append(time.perf_counter() - arrival)
+    return latencies
+
+async def measure(async_client, render_load):
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(async_client, stop))
+    await asyncio.sleep(0)
+    await render_load()
+    stop.set()
+    return p99(await probe_task)
+
+async def test_unrelated_endpoint_p99_under_qr_render_load(async_client):
+    payloads = [f"http://localhost/accept?nickname=bmljaw==&invite_code=code{i:04d}" for i in range(RENDERS)]
+
+    async def inline_load():
+        for payload in payloads:
+            qrcode.make(payload).save(BytesIO(), "PNG")
+            await asyncio.sleep(0)
+
+    engine = QRRenderEngine(max_workers=2)
+    await engine.render("warm-up")
+
+    async def engine_load():
+        await engine.render_many(payloads)
+
+    try:
+        inline_p99 = await measure(async_client, inline_load)
+        engine_p99 = await measure(async_client, engine_load)
+    finally:
+        engine.shutdown()
+
+    print(f"\nGET /accepted p99 with {RENDERS} QR renders: inline={inline_p99 * 1000:.2f}ms process-pool={engine_p99 * 1000:.2f}ms")
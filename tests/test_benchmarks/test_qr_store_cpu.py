@@ -0,0 +1,83 @@
+"""
+Micro-benchmark: CPU cost per invite of rendering and storing its QR code.
+
+The legacy path rendered the QR twice with `qrcode.make` (once for the bare invite code, once for the accept URL)
+and copied the buffer to compute the upload length. The current path is the one the QR endpoint uses on a miss,
+`QRArtifactCache.load_image`: one render of the accept URL, uploaded in place under its content address.
+Rendering is done in this thread here so its CPU time is counted. Run with `pytest -m slow -s` to see the numbers.
+"""
+import time
+from io import BytesIO
+import pytest
+import qrcode
+from minio.error import S3Error
+from qrcodegen.artifact_cache import QRArtifactCache, qr_object_name
+from qrcodegen.generation import generate_qr_data, qr_options
+from qrcodegen.rendering import render_qr_image
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.slow]
+
+INVITES = 40
+ROUNDS = 5
+BUCKET = "qr-codes"
+
+class RecordingObjectStorage:
+    def __init__(self):
+        self.objects = {}
+
+    async def get_object_data(self, bucket_name, object_name):
+        if object_name not in self.objects:
+            raise S3Error("NoSuchKey", "Object does not exist", object_name, "request_id", "host_id", None)
+        return self.objects[object_name]
+
+    async def put_object(self, bucket_name, object_name, data, length, content_type=None):
+        data.seek(0)
+        self.objects[object_name] = data.read(length)
+
+class InlineRenderEngine:
+    """Renders in the calling thread instead of the process pool."""
+    options = qr_options()
+
+    async def render(self, data, options=None):
+        return BytesIO(render_qr_image(data, options or self.options))
+
+def legacy_render(data: str) -> BytesIO:
+    img_stream = BytesIO()
+    qrcode.make(data).save(img_stream, "PNG")
+    img_stream.seek(0)
+    return img_stream
+
+async def legacy_render_and_store(storage, nickname, invite_code):
+    img_stream = legacy_render(invite_code)
+    img_stream = legacy_render(generate_qr_data(nickname, invite_code))
+    await storage.put_object(BUCKET, f"invite_{invite_code}.png", img_stream, len(img_stream.getvalue()))
+
+async def cpu_time(func):
+    start = time.thread_time()
+    for i in range(INVITES):
+        await func("bench_nickname", f"code{i:06d}")
+    return time.thread_time() - start
+
+async def test_cpu_per_invite():
+    # Alternate the two paths and keep each one's best round of this thread's CPU time, so drift,
+    # background pool threads and noisy neighbours don't skew the comparison
+    legacy_rounds, current_rounds = [], []
+    for _ in range(ROUNDS):
+        storage = RecordingObjectStorage()
+        legacy_rounds.append(await cpu_time(lambda nickname, code: legacy_render_and_store(storage, nickname, code)))
+        # A fresh cache and bucket per round, so every invite is a miss that renders and uploads
+        cache = QRArtifactCache(RecordingObjectStorage(), InlineRenderEngine(), bucket_name=BUCKET, max_entries=INVITES)
+        current_rounds.append(await cpu_time(lambda nickname, code: cache.load_image(generate_qr_data(nickname, code))))
+    legacy, current = min(legacy_rounds), min(current_rounds)
+
+    print(f"\nCPU per invite: legacy={legacy / INVITES * 1000:.2f}ms load_image={current / INVITES * 1000:.2f}ms ({legacy / current:.1f}x)")
+
+async def test_load_image_uploads_whole_image_under_its_content_address():
+    storage = RecordingObjectStorage()
+    cache = QRArtifactCache(storage, InlineRenderEngine(), bucket_name=BUCKET, max_entries=8)
+    data = generate_qr_data("nick", "abc123")
+
+    image = await cache.load_image(data)
+
+    assert list(storage.objects) == [qr_object_name(data, qr_options())]
+    assert storage.objects[qr_object_name(data, qr_options())] == image
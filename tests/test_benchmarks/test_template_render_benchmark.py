@@ -0,0 +1,47 @@
+"""
+Benchmark: rendering 10k invite emails with compiled templates versus the legacy per-email
+read + markdown + style pipeline. Run with `pytest -m slow -s` to see the numbers.
+"""
+import time
+import markdown2
+import pytest
+from app.utils.template_manager import TemplateManager
+
+pytestmark = pytest.mark.slow
+
+EMAILS = 10_000
+LEGACY_SAMPLE = 200
+
+def invite_context(i):
+    return {
+        "name": f"guest_{i}",
+        "qr_code_url": f"http://localhost:9000/qr-codes/invite_code{i}.png",
+        "invite_url": f"http://localhost/accept?nickname=Z3Vlc3Q=&invite_code=code{i}",
+        "email": f"guest{i}@example.com",
+    }
+
+def legacy_render(manager, template_name, **context):
+    header = manager._read_template('header.md')
+    footer = manager._read_template('footer.md')
+    main_content = manager._read_template(f'{template_name}.md').format(**context)
+    return manager._apply_email_styles(markdown2.markdown(f"{header}\n{main_content}\n{footer}"))
+
+def test_render_10k_invite_emails():
+    manager = TemplateManager()
+    manager.precompile()
+
+    start = time.perf_counter()
+    for i in range(EMAILS):
+        manager.render_template("invite_email", **invite_context(i))
+    compiled_total = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(LEGACY_SAMPLE):
+        legacy_render(manager, "invite_email", **invite_context(i))
+    legacy_per_email = (time.perf_counter() - start) / LEGACY_SAMPLE
+
+    compiled_per_email = compiled_total / EMAILS
+    print(
+        f"\n{EMAILS} invite emails: compiled={compiled_total:.3f}s ({compiled_per_email * 1e6:.1f}us/email), "
+        f"legacy≈{legacy_per_email * EMAILS:.1f}s ({legacy_per_email * 1e6:.1f}us/email), {legacy_per_email / compiled_per_email:.0f}x"
+    )
@@ -0,0 +1,49 @@
+import pytest
+from app.utils.cache import CacheBackend, InMemorySharedCache, LocalTTLCache, TieredCache
+
+pytestmark = pytest.mark.asyncio
+
+async def test_local_cache_evicts_least_recently_used():
+    cache = LocalTTLCache(max_entries=2)
+    await cache.set("a", 1, ttl=60)
+    await cache.set("b", 2, ttl=60)
+    assert await cache.get("a") == 1  # "b" is now the least recently used
+    await cache.set("c", 3, ttl=60)
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+    assert await cache.get("c") == 3
+
+async def test_local_cache_expires_entries():
+    cache = LocalTTLCache(max_entries=10)
+    await cache.set("a", 1, ttl=0)
+    assert await cache.get("a") is None
+    assert len(cache) == 0
+
+async def test_shared_fake_round_trips_through_json():
+    cache = InMemorySharedCache()
+    value = {"id": "1", "used": False}
+    await cache.set("a", value, ttl=60)
+    cached = await cache.get("a")
+    assert cached == value and cached is not value
+    await cache.delete("a")
+    assert await cache.get("a") is None
+
+async def test_tiered_cache_fills_local_from_shared_and_deletes_both():
+    local, shared = LocalTTLCache(max_entries=10), InMemorySharedCache()
+    cache = TieredCache(local, shared, local_ttl=60)
+    await shared.set("a", {"v": 1}, ttl=60)
+
+    assert await cache.get("a") == {"v": 1}
+    assert await local.get("a") == {"v": 1}
+
+    await cache.delete("a")
+    assert await local.get("a") is None
+    assert await shared.get("a") is None
+
+async def test_backends_must_implement_get_set_and_delete():
+    class ReadOnly(CacheBackend):
+        async def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        ReadOnly()
@@ -0,0 +1,24 @@
+from app.container import container
+from app.dependencies import get_email_service, get_settings
+from app.main import app
+
+def test_dependencies_return_shared_instances():
+    assert get_settings() is get_settings() is container.settings
+    assert get_email_service() is get_email_service() is container.email_service
+    assert container.email_service.template_manager is container.template_manager
+
+async def test_lifespan_runs_container_hooks(monkeypatch):
+    calls = []
+
+    async def startup():
+        calls.append("startup")
+
+    async def shutdown():
+        calls.append("shutdown")
+
+    monkeypatch.setattr(container, "startup", startup)
+    monkeypatch.setattr(container, "shutdown", shutdown)
+    async with app.router.lifespan_context(app):
+        assert app.state.container is container
+        assert calls == ["startup"]
+    assert calls == ["startup", "shutdown"]
@@ -0,0 +1,36 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.database import Database, InstrumentedQueuePool
+from settings.config import settings
+
+async def test_pool_records_acquisitions_and_timeouts():
+    engine = create_async_engine(
+        settings.database_url, poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.2,
+        connect_args={"statement_cache_size": 0}
+    )
+    try:
+        async with engine.connect() as held:
+            await held.execute(text("SELECT 1"))
+            stats = engine.pool.stats()
+            assert stats["checked_out"] == 1
+            assert stats["acquisitions"] == 1
+            with pytest.raises(PoolTimeoutError):
+                async with engine.connect():
+                    pass
+        stats = engine.pool.stats()
+        assert stats["timeouts"] == 1
+        assert stats["checked_out"] == 0
+        assert stats["wait_seconds_max"] >= 0
+    finally:
+        await engine.dispose()
+
+async def test_metrics_endpoint_reports_pool_stats(async_client, admin_token):
+    response = await async_client.get("/metrics/db-pool", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    assert response.json().keys() == Database.pool_stats().keys()
+
+async def test_metrics_endpoint_requires_admin(async_client, user_token):
+    response = await async_client.get("/metrics/db-pool", headers={"Authorization": f"Bearer {user_token}"})
+    assert response.status_code == 403
@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+from uuid import uuid4
+import pytest
+from fastapi import HTTPException
+from app.dependencies import Principal, get_current_user, require_role
+from app.services.jwt_service import create_access_token
+
+pytestmark = pytest.mark.asyncio
+
+def fake_request(**state):
+    return SimpleNamespace(state=SimpleNamespace(**state))
+
+async def test_get_current_user_builds_and_stores_a_principal():
+    user_id = uuid4()
+    request = fake_request()
+    token = create_access_token(data={"sub": "user@example.com", "role": "manager", "user_id": str(user_id)})
+
+    principal = await get_current_user(request, token)
+    assert principal.subject == "user@example.com"
+    assert principal.user_id == user_id
+    assert principal.roles == frozenset({"MANAGER"})
+    assert principal.role == "MANAGER"
+    assert request.state.principal is principal
+
+async def test_get_current_user_reuses_the_request_principal():
+    principal = Principal("user@example.com", None, frozenset({"ADMIN"}))
+    assert await get_current_user(fake_request(principal=principal), "not-a-token") is principal
+
+async def test_get_current_user_rejects_invalid_tokens():
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(fake_request(), "not-a-token")
+    assert exc_info.value.status_code == 401
+
+    bad_user_id = create_access_token(data={"sub": "user@example.com", "role": "admin", "user_id": "nope"})
+    with pytest.raises(HTTPException):
+        await get_current_user(fake_request(), bad_user_id)
+
+async def test_principal_is_slotted_and_immutable():
+    principal = Principal("user@example.com", None, frozenset({"ADMIN"}))
+    assert not hasattr(principal, "__dict__")
+    with pytest.raises(AttributeError):
+        principal.roles = frozenset({"ANONYMOUS"})
+
+async def test_require_role_shares_checkers_and_checks_membership():
+    assert require_role(["ADMIN", "MANAGER"]) is require_role(("MANAGER", "ADMIN"))
+    checker = require_role(["ADMIN", "MANAGER"])
+
+    manager = Principal("user@example.com", None, frozenset({"MANAGER"}))
+    assert await checker(manager) is manager
+    with pytest.raises(HTTPException) as exc_info:
+        await checker(Principal("user@example.com", None, frozenset({"AUTHENTICATED"})))
+    assert exc_info.value.status_code == 403
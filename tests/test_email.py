@@ -1,6 +1,11 @@
 import pytest
 from app.services.email_service import EmailService
+from unittest.mock import AsyncMock
+from app.models.invite_model import Invitation
 from app.utils.template_manager import TemplateManager
+from qrcodegen.artifact_cache import qr_artifact_cache
+from qrcodegen.generation import qr_code_url_for
+from settings.config import settings
 
     
 @pytest.mark.asyncio
@@ -12,3 +17,33 @@ async def test_send_markdown_email(email_service):
     }
     await email_service.send_user_email(user_data, 'email_verification')
     # Manual verification in Mailtrap
+
+@pytest.mark.asyncio
+async def test_invite_email_embeds_the_lazy_qr_endpoint():
+    smtp_client = AsyncMock()
+    service = EmailService(template_manager=TemplateManager(), smtp_client=smtp_client)
+    invite = Invitation(invitee_email="guest@example.com", invite_code="code123", nickname="guest")
+
+    await service.send_invite_email(invite)
+    html_content = smtp_client.send_email_async.call_args.kwargs["html_content"]
+    assert f'src="{qr_code_url_for("guest", "code123")}"' in html_content
+    assert "/invites/code123/qr.png?v=" in html_content
+
+@pytest.mark.asyncio
+async def test_invite_email_can_embed_the_qr_code_inline(monkeypatch):
+    monkeypatch.setattr(settings, "email_inline_qr_code", True)
+    async def no_storage(*args, **kwargs):
+        raise AssertionError("an inline QR code must not touch object storage")
+    monkeypatch.setattr(qr_artifact_cache.storage, "get_object_data", no_storage)
+    monkeypatch.setattr(qr_artifact_cache.storage, "put_object", no_storage)
+
+    smtp_client = AsyncMock()
+    service = EmailService(template_manager=TemplateManager(), smtp_client=smtp_client)
+    invite = Invitation(invitee_email="guest@example.com", invite_code="code123", nickname="guest")
+
+    await service.send_invite_email(invite)
+    kwargs = smtp_client.send_email_async.call_args.kwargs
+    assert 'src="cid:qr-code123@invite"' in kwargs["html_content"]
+    assert "/qr.png" not in kwargs["html_content"]
+    assert list(kwargs["inline_images"]) == ["qr-code123@invite"]
+    assert kwargs["inline_images"]["qr-code123@invite"].startswith(b"\x89PNG\r\n\x1a\n")
@@ -0,0 +1,97 @@
+import time
+from datetime import timedelta
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from app.services import jwt_service
+from app.services.jwt_service import VerifiedTokenCache, build_key_ring, create_access_token, decode_token
+from settings.config import Settings
+
+def write_key(path, private_key):
+    path.write_bytes(private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ))
+    return str(path)
+
+def write_public_key(path, private_key):
+    path.write_bytes(private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ))
+    return str(path)
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    jwt_service.token_cache.clear()
+    yield
+    jwt_service.token_cache.clear()
+
+def test_tokens_carry_the_signing_key_id():
+    token = create_access_token(data={"sub": "user@example.com", "role": "admin"})
+    assert jwt.get_unverified_header(token)["kid"] == Settings().jwt_key_id
+    assert decode_token(token)["role"] == "ADMIN"
+
+def test_tokens_without_key_id_still_verify():
+    settings = Settings()
+    token = jwt.encode({"sub": "user@example.com", "exp": time.time() + 60}, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    assert decode_token(token)["sub"] == "user@example.com"
+
+def test_repeat_decodes_are_served_from_the_cache(monkeypatch):
+    token = create_access_token(data={"sub": "user@example.com", "role": "admin"})
+    assert decode_token(token) is not None
+
+    def fail_decode(token):
+        raise AssertionError("cached tokens must not be verified again")
+
+    monkeypatch.setattr(jwt_service.key_ring, "decode", fail_decode)
+    assert decode_token(token)["sub"] == "user@example.com"
+
+def test_invalid_and_expired_tokens_are_rejected_and_not_cached():
+    expired = create_access_token(data={"sub": "user@example.com"}, expires_delta=timedelta(seconds=-1))
+    assert decode_token(expired) is None
+    assert decode_token("not-a-token") is None
+    assert decode_token(create_access_token(data={"sub": "user@example.com"})[:-2] + "xx") is None
+    assert len(jwt_service.token_cache) == 0
+
+def test_cache_drops_entries_at_expiry_and_stays_bounded():
+    cache = VerifiedTokenCache(max_entries=2)
+    cache.put(b"expired", {"exp": time.time() - 1})
+    assert cache.get(b"expired") is None
+
+    for key in (b"a", b"b", b"c"):
+        cache.put(key, {"exp": time.time() + 60})
+    assert len(cache) == 2
+    assert cache.get(b"a") is None
+
+    cache.put(b"no-exp", {"sub": "user"})
+    assert cache.get(b"no-exp") is None
+
+def test_asymmetric_key_ring_with_kid_lookup(tmp_path):
+    own_key = ed25519.Ed25519PrivateKey.generate()
+    other_key = ec.generate_private_key(ec.SECP256R1())
+    key_ring = build_key_ring(Settings(
+        jwt_algorithm="EdDSA",
+        jwt_key_id="app-1",
+        jwt_private_key_file=write_key(tmp_path / "app.pem", own_key),
+        jwt_public_key_files={"billing-1": write_public_key(tmp_path / "billing.pub", other_key)},
+    ))
+    payload = {"sub": "user@example.com", "exp": time.time() + 60}
+
+    own_token = key_ring.encode(payload)
+    assert jwt.get_unverified_header(own_token) == {"alg": "EdDSA", "kid": "app-1", "typ": "JWT"}
+    assert key_ring.decode(own_token)["sub"] == "user@example.com"
+
+    other_token = jwt.encode(payload, other_key, algorithm="ES256", headers={"kid": "billing-1"})
+    assert key_ring.decode(other_token)["sub"] == "user@example.com"
+
+    # A token claiming another service's kid must be signed by that service's key
+    forged = jwt.encode(payload, own_key, algorithm="EdDSA", headers={"kid": "billing-1"})
+    with pytest.raises(jwt.PyJWTError):
+        key_ring.decode(forged)
+    unknown = jwt.encode(payload, other_key, algorithm="ES256", headers={"kid": "unknown"})
+    with pytest.raises(jwt.PyJWTError):
+        key_ring.decode(unknown)
+
+def test_asymmetric_algorithm_requires_a_private_key():
+    with pytest.raises(ValueError):
+        build_key_ring(Settings(jwt_algorithm="ES256", jwt_private_key_file=""))
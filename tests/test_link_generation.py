@@ -7,6 +7,7 @@ import pytest
 from fastapi import Request
 
 from app.utils.link_generation import create_link, create_pagination_link, create_user_links, generate_pagination_links
+from app.utils.pagination import CursorPage
 
 from urllib.parse import urlparse, parse_qs, urlunparse, urlencode
 
@@ -49,3 +50,19 @@ def test_generate_pagination_links(mock_request):
     assert len(links) >= 4
     expected_self_url = "http://testserver/users?limit=5&skip=10"
     assert normalize_url(str(links[0].href)) == normalize_url(expected_self_url), "Self link should match expected URL"
+
+def test_generate_pagination_links_with_cursors(mock_request):
+    mock_request.url = "http://testserver/users?limit=5&cursor=abc"
+    page = CursorPage(items=[], next_cursor="nxt", prev_cursor="prv")
+    links = {link.rel: str(link.href) for link in generate_pagination_links(mock_request, 0, 5, 50, page)}
+    assert normalize_url(links["self"]) == normalize_url("http://testserver/users?limit=5&cursor=abc")
+    assert normalize_url(links["first"]) == normalize_url("http://testserver/users?limit=5")
+    assert normalize_url(links["next"]) == normalize_url("http://testserver/users?limit=5&cursor=nxt")
+    assert normalize_url(links["prev"]) == normalize_url("http://testserver/users?limit=5&cursor=prv")
+    assert "skip" not in links["last"]
+
+def test_cursor_links_keep_filters(mock_request):
+    mock_request.url = "http://testserver/invites/?used=false&limit=5&cursor=abc"
+    page = CursorPage(items=[], next_cursor="nxt")
+    links = {link.rel: str(link.href) for link in generate_pagination_links(mock_request, 0, 5, None, page)}
+    assert normalize_url(links["next"]) == normalize_url("http://testserver/invites/?used=false&limit=5&cursor=nxt")
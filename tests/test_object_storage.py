@@ -0,0 +1,58 @@
+import pytest
+from io import BytesIO
+from minio.error import S3Error
+from app.minio_setup import AsyncObjectStorage
+
+class FlakyClient:
+    """Fails the first `failures` calls with the given error, then succeeds."""
+    def __init__(self, failures, error):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+        self.bodies = []
+
+    def put_object(self, bucket_name, object_name, data, length, content_type=None):
+        self.calls += 1
+        self.bodies.append(data.read(length))
+        if self.calls <= self.failures:
+            raise self.error
+        return object_name
+
+def s3_error(code):
+    return S3Error(code, "message", "resource", "request_id", "host_id", None)
+
+@pytest.fixture
+def make_storage():
+    storages = []
+    def factory(client, max_retries=3):
+        storage = AsyncObjectStorage(client, max_concurrency=2, max_retries=max_retries, retry_backoff=0)
+        storages.append(storage)
+        return storage
+    yield factory
+    for storage in storages:
+        storage.shutdown()
+
+@pytest.mark.asyncio
+async def test_put_object_retries_transient_errors(make_storage):
+    client = FlakyClient(failures=2, error=s3_error("SlowDown"))
+    storage = make_storage(client)
+    result = await storage.put_object("bucket", "name", BytesIO(b"payload"), 7)
+    assert result == "name"
+    assert client.calls == 3
+    assert client.bodies == [b"payload"] * 3
+
+@pytest.mark.asyncio
+async def test_put_object_does_not_retry_permanent_errors(make_storage):
+    client = FlakyClient(failures=1, error=s3_error("AccessDenied"))
+    storage = make_storage(client)
+    with pytest.raises(S3Error):
+        await storage.put_object("bucket", "name", BytesIO(b"payload"), 7)
+    assert client.calls == 1
+
+@pytest.mark.asyncio
+async def test_put_object_gives_up_after_max_retries(make_storage):
+    client = FlakyClient(failures=5, error=s3_error("InternalError"))
+    storage = make_storage(client, max_retries=2)
+    with pytest.raises(S3Error):
+        await storage.put_object("bucket", "name", BytesIO(b"payload"), 7)
+    assert client.calls == 3
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.utils.password_hasher import PasswordHasher, PasswordHasherBusy
+from app.utils.password_policy import BcryptScheme, PasswordPolicy
+from app.utils.security import hash_password
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(PasswordPolicy("bcrypt", {"bcrypt": BcryptScheme(rounds=12)}), max_workers=1, max_pending=1)
+    yield hasher
+    hasher.shutdown()
+
+async def test_hash_and_verify_round_trip(hasher):
+    hashed = await hasher.hash("secure_password")
+    assert await hasher.verify("secure_password", hashed) is True
+    assert await hasher.verify("wrong_password", hashed) is False
+
+    stats = hasher.stats()
+    assert stats["hash"]["calls"] == 1
+    assert stats["verify"]["calls"] == 2
+    assert stats["verify"]["run_seconds_max"] > 0
+    assert stats["in_flight"] == 0
+
+async def test_hashing_does_not_block_the_event_loop(hasher):
+    hashed = hash_password("secure_password")
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.005)
+
+    task = asyncio.create_task(ticker())
+    await hasher.verify("secure_password", hashed)
+    task.cancel()
+    gaps = [later - earlier for earlier, later in zip(ticks, ticks[1:])]
+    # bcrypt at cost 12 takes hundreds of milliseconds; the loop kept ticking throughout
+    assert len(ticks) > 5
+    assert max(gaps) < 0.1
+
+async def test_rejects_calls_beyond_the_queue_limit(hasher, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(hasher.policy, "hash", lambda password: release.wait(5) and "hashed")
+
+    running = [asyncio.create_task(hasher.hash("a")), asyncio.create_task(hasher.hash("b"))]
+    await asyncio.sleep(0)
+    with pytest.raises(PasswordHasherBusy):
+        await hasher.hash("c")
+    release.set()
+    assert await asyncio.gather(*running) == ["hashed", "hashed"]
+    assert hasher.stats()["rejected"] == 1
+    assert hasher.stats()["in_flight"] == 0
+
+async def test_drain_waits_for_spawned_work(hasher):
+    done = []
+
+    async def upgrade():
+        await asyncio.sleep(0.01)
+        done.append(True)
+
+    hasher.spawn(upgrade())
+    await hasher.drain()
+    assert done == [True]
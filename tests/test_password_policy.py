@@ -0,0 +1,50 @@
+import pytest
+from app.utils.password_policy import Argon2Scheme, BcryptScheme, PasswordPolicy, PasswordScheme, build_password_policy
+from app.utils.security import hash_password
+from settings.config import Settings
+
+def make_policy(current):
+    return PasswordPolicy(current, {
+        "bcrypt": BcryptScheme(rounds=4),
+        "argon2id": Argon2Scheme(time_cost=1, memory_cost=1024, parallelism=1),
+    })
+
+def test_hashes_with_the_current_scheme():
+    assert make_policy("bcrypt").hash("secure_password").startswith("$2b$04$")
+    assert make_policy("argon2id").hash("secure_password").startswith("$argon2id$")
+
+def test_verifies_hashes_from_every_known_scheme():
+    policy = make_policy("argon2id")
+    for hashed in (hash_password("secure_password", rounds=4), make_policy("argon2id").hash("secure_password")):
+        assert policy.verify("secure_password", hashed) is True
+        assert policy.verify("wrong_password", hashed) is False
+
+def test_unknown_hash_format_is_an_error():
+    with pytest.raises(ValueError):
+        make_policy("bcrypt").verify("secure_password", "plaintext")
+
+def test_needs_rehash_on_cost_or_scheme_change():
+    policy = make_policy("bcrypt")
+    assert policy.needs_rehash(hash_password("secure_password", rounds=4)) is False
+    assert policy.needs_rehash(hash_password("secure_password", rounds=5)) is True
+    assert policy.needs_rehash(make_policy("argon2id").hash("secure_password")) is True
+
+    argon2_hash = make_policy("argon2id").hash("secure_password")
+    assert make_policy("argon2id").needs_rehash(argon2_hash) is False
+    stronger = PasswordPolicy("argon2id", {"argon2id": Argon2Scheme(time_cost=2, memory_cost=1024, parallelism=1)})
+    assert stronger.needs_rehash(argon2_hash) is True
+
+def test_build_password_policy_from_settings():
+    policy = build_password_policy(Settings(password_hash_scheme="argon2id", password_argon2_memory_kib=2048))
+    assert policy.current.name == "argon2id"
+    assert policy.current.memory_cost == 2048
+    with pytest.raises(ValueError):
+        build_password_policy(Settings(password_hash_scheme="md5"))
+
+def test_schemes_must_implement_every_operation():
+    class HashOnly(PasswordScheme):
+        def hash(self, password):
+            return password
+
+    with pytest.raises(TypeError):
+        HashOnly()
@@ -0,0 +1,108 @@
+from io import BytesIO
+import pytest
+from minio.error import S3Error
+from qrcodegen.artifact_cache import QRArtifactCache, qr_artifact_key, qr_object_name
+from qrcodegen.rendering import QROptions
+
+pytestmark = pytest.mark.asyncio
+
+PNG = QROptions()
+SVG = QROptions(image_format="svg")
+
+class FakeEngine:
+    options = PNG
+
+    def __init__(self):
+        self.renders = []
+
+    async def render(self, data, options=None):
+        self.renders.append(data)
+        return BytesIO(f"{(options or self.options).image_format}:{data}".encode())
+
+class FakeStorage:
+    def __init__(self):
+        self.objects = {}
+        self.gets = 0
+        self.puts = 0
+        self.content_types = {}
+
+    async def get_object_data(self, bucket_name, object_name):
+        self.gets += 1
+        if object_name not in self.objects:
+            raise S3Error("NoSuchKey", "Object does not exist", object_name, "request_id", "host_id", None)
+        return self.objects[object_name]
+
+    async def put_object(self, bucket_name, object_name, data, length, content_type=None):
+        self.puts += 1
+        self.objects[object_name] = data.read(length)
+        self.content_types[object_name] = content_type
+
+@pytest.fixture
+def storage():
+    return FakeStorage()
+
+@pytest.fixture
+def engine():
+    return FakeEngine()
+
+def make_cache(storage, engine, max_entries=8):
+    return QRArtifactCache(storage, engine, bucket_name="qr-codes", max_entries=max_entries)
+
+async def test_keys_cover_payload_and_render_options():
+    assert qr_artifact_key("a", PNG) == qr_artifact_key("a", QROptions())
+    assert qr_artifact_key("a", PNG) != qr_artifact_key("b", PNG)
+    assert qr_artifact_key("a", PNG) != qr_artifact_key("a", QROptions(error_correction="L"))
+    assert qr_artifact_key("a", PNG) != qr_artifact_key("a", QROptions(png_compress_level=1))
+    # The PNG compression level does not change an SVG
+    assert qr_artifact_key("a", SVG) == qr_artifact_key("a", QROptions(image_format="svg", png_compress_level=1))
+    assert qr_object_name("a", PNG) == f"qr_{qr_artifact_key('a', PNG)}.png"
+    assert qr_object_name("a", SVG) == f"qr_{qr_artifact_key('a', SVG)}.svg"
+
+async def test_existing_object_is_reused_without_rendering(storage, engine):
+    await make_cache(storage, engine).load_image("payload")
+    # A fresh cache, as in another worker process, loads the stored object instead of rendering it again
+    fresh_engine = FakeEngine()
+    assert await make_cache(storage, fresh_engine).load_image("payload") == b"png:payload"
+    assert (storage.gets, storage.puts) == (2, 1)
+    assert fresh_engine.renders == []
+
+async def test_load_image_renders_and_stores_missing_images_once(storage, engine):
+    cache = make_cache(storage, engine)
+    assert await cache.load_image("payload") == b"png:payload"
+    assert storage.objects[qr_object_name("payload", PNG)] == b"png:payload"
+    assert await cache.load_image("payload") == b"png:payload"
+    assert (storage.gets, storage.puts, len(engine.renders)) == (1, 1, 1)
+
+async def test_load_image_prefers_the_stored_object(storage, engine):
+    storage.objects[qr_object_name("payload", PNG)] = b"stored"
+    cache = make_cache(storage, engine)
+    assert await cache.load_image("payload") == b"stored"
+    assert await cache.load_image("payload") == b"stored"
+    assert (storage.gets, storage.puts, engine.renders) == (1, 0, [])
+
+async def test_image_lru_is_bounded(storage, engine):
+    cache = make_cache(storage, engine, max_entries=2)
+    for data in ("a", "b", "a", "c", "a"):
+        await cache.get_image(data)
+    # "b" was least recently used when "c" arrived; "a" stayed cached throughout
+    assert engine.renders == ["a", "b", "c"]
+    assert len(cache._images) == 2
+
+async def test_storage_errors_other_than_missing_propagate(storage, engine):
+    async def failing_get(bucket_name, object_name):
+        raise S3Error("AccessDenied", "Access denied", object_name, "request_id", "host_id", None)
+
+    storage.get_object_data = failing_get
+    with pytest.raises(S3Error):
+        await make_cache(storage, engine).load_image("payload")
+    assert storage.puts == 0
+    assert engine.renders == []
+
+async def test_formats_are_stored_as_separate_objects(storage, engine):
+    cache = make_cache(storage, engine)
+    await cache.load_image("payload")
+    assert await cache.load_image("payload", SVG) == b"svg:payload"
+    assert storage.content_types == {
+        qr_object_name("payload", PNG): "image/png",
+        qr_object_name("payload", SVG): "image/svg+xml",
+    }
@@ -0,0 +1,53 @@
+import random
+import string
+import pytest
+import qrcode
+from qrcode.exceptions import DataOverflowError
+from qrcodegen.encoder import encode_modules
+from qrcodegen.generation import generate_qr_data
+
+ERROR_CORRECTION_LEVELS = range(4)
+
+def reference_rows(data, error_correction):
+    qr = qrcode.QRCode(error_correction=error_correction, border=0)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return ["".join("1" if module else "0" for module in row) for row in qr.get_matrix()]
+
+def random_payloads(count, alphabet, max_length, seed):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, max_length))) for _ in range(count)]
+
+@pytest.mark.parametrize("error_correction", ERROR_CORRECTION_LEVELS)
+def test_accept_urls_match_qrcode(error_correction):
+    for i in range(20):
+        data = generate_qr_data(f"brave_otter_{i * 97}", f"code{i:08d}")
+        assert encode_modules(data, error_correction) == reference_rows(data, error_correction)
+
+@pytest.mark.parametrize("data", [
+    "",
+    "a",
+    "1234567890" * 5,
+    "HELLO WORLD $%*+-./: 0123456789 ABCDEFGHIJ",
+    "mixed 123456789012345678901234 then ALPHANUMERIC RUN OF CAPS then bytes",
+    "ünïcödé €" * 20,
+    # Versions 7+ carry version information; 10+ and 27+ widen the length fields
+    "x" * 150,
+    "x" * 400,
+    "9" * 2500,
+])
+@pytest.mark.parametrize("error_correction", ERROR_CORRECTION_LEVELS)
+def test_segment_modes_and_versions_match_qrcode(data, error_correction):
+    assert encode_modules(data, error_correction) == reference_rows(data, error_correction)
+
+def test_random_payloads_match_qrcode():
+    for i, data in enumerate(random_payloads(80, string.printable, 300, seed=7)):
+        error_correction = i % 4
+        assert encode_modules(data, error_correction) == reference_rows(data, error_correction)
+
+def test_bytes_payloads_are_accepted():
+    assert encode_modules(b"bytes payload", 0) == reference_rows(b"bytes payload", 0)
+
+def test_overflow_raises_like_qrcode():
+    with pytest.raises(DataOverflowError):
+        encode_modules("x" * 3000, qrcode.constants.ERROR_CORRECT_H)
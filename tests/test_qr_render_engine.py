@@ -0,0 +1,34 @@
+import pytest
+from qrcodegen.engine import QRRenderEngine
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+@pytest.fixture
+def render_engine():
+    engine = QRRenderEngine(max_workers=1)
+    yield engine
+    engine.shutdown()
+
+@pytest.mark.asyncio
+async def test_render_returns_png_stream(render_engine):
+    img_stream = await render_engine.render("http://localhost/accept?invite_code=abc")
+    assert img_stream.tell() == 0
+    assert img_stream.getvalue().startswith(PNG_SIGNATURE)
+
+@pytest.mark.asyncio
+async def test_render_many_preserves_order(render_engine):
+    data = ["first", "a much longer payload that needs a bigger QR version to encode"]
+    streams = await render_engine.render_many(data)
+    assert len(streams) == 2
+    assert len(streams[0].getvalue()) < len(streams[1].getvalue())
+
+def test_shutdown_is_idempotent(render_engine):
+    render_engine.start()
+    render_engine.shutdown()
+    render_engine.shutdown()
+
+@pytest.mark.asyncio
+async def test_workers_are_not_forked_from_the_server(render_engine):
+    assert render_engine.mp_context.get_start_method() in ("forkserver", "spawn")
+    img_stream = await render_engine.render("http://localhost/accept?invite_code=forkserver")
+    assert img_stream.getvalue().startswith(PNG_SIGNATURE)
@@ -0,0 +1,67 @@
+import re
+from io import BytesIO
+import pytest
+import qrcode
+from PIL import Image
+from qrcodegen.rendering import ERROR_CORRECTION_LEVELS, QROptions, qr_rows, render_qr_image
+
+DATA = "http://localhost/accept?invite_code=abc"
+
+def test_png_is_one_bit_and_scaled_per_module():
+    options = QROptions(box_size=3, border=2)
+    rows = qr_rows(DATA, options)
+    image = Image.open(BytesIO(render_qr_image(DATA, options)))
+    assert image.mode == "1"
+    assert image.size == (len(rows) * 3, len(rows) * 3)
+    for y, row in enumerate(rows):
+        for x, module in enumerate(row):
+            assert (image.getpixel((x * 3 + 1, y * 3 + 1)) == 0) == (module == "1")
+
+def test_svg_path_covers_exactly_the_dark_modules():
+    options = QROptions(image_format="svg", box_size=5)
+    rows = qr_rows(DATA, options)
+    svg = render_qr_image(DATA, options).decode("ascii")
+    size = len(rows)
+    assert svg.startswith(f'<svg xmlns="http://www.w3.org/2000/svg" width="{size * 5}" height="{size * 5}" viewBox="0 0 {size} {size}"')
+
+    dark = set()
+    for x, y, run in re.findall(r"M(\d+) (\d+)h(\d+)v1H\d+z", svg):
+        dark.update((int(x) + i, int(y)) for i in range(int(run)))
+    assert dark == {(x, y) for y, row in enumerate(rows) for x, module in enumerate(row) if module == "1"}
+
+def test_error_correction_and_border_change_the_matrix():
+    default = qr_rows(DATA, QROptions())
+    assert len(qr_rows(DATA, QROptions(border=0))) == len(default) - 8
+    assert all(len(row) == len(default) for row in default)
+    assert len(qr_rows(DATA * 4, QROptions(error_correction="H"))) > len(qr_rows(DATA * 4, QROptions(error_correction="L")))
+
+@pytest.mark.parametrize("options", [QROptions(), QROptions(error_correction="H", box_size=3, border=1), QROptions(box_size=1, border=0)])
+def test_png_matches_qrcode_pixel_for_pixel(options):
+    qr = qrcode.QRCode(error_correction=ERROR_CORRECTION_LEVELS[options.error_correction], box_size=options.box_size, border=options.border)
+    qr.add_data(DATA)
+    expected = qr.make_image().get_image()
+    image = Image.open(BytesIO(render_qr_image(DATA, options)))
+    assert image.size == expected.size
+    assert image.tobytes() == expected.convert("1").tobytes()
+
+def test_options_describe_their_output():
+    assert QROptions().content_type == "image/png"
+    svg = QROptions().with_format("svg")
+    assert svg.content_type == "image/svg+xml"
+    assert svg.cache_params() != QROptions().cache_params()
+
+@pytest.mark.parametrize("overrides", [
+    {"image_format": "gif"},
+    {"error_correction": "X"},
+    {"box_size": 0},
+    {"border": -1},
+    {"png_compress_level": -1},
+    {"png_compress_level": 10},
+])
+def test_invalid_options_are_rejected(overrides):
+    with pytest.raises(ValueError):
+        QROptions(**overrides)
+
+def test_option_bounds_are_accepted():
+    QROptions(box_size=1, border=0, png_compress_level=0)
+    QROptions(png_compress_level=9)
@@ -0,0 +1,20 @@
+import pytest
+from pydantic import ValidationError
+from app.main import app
+from app.schemas.invite_schemas import InviteBulkCreate
+from settings.config import settings
+
+def invitees(count):
+    return [{"invitee_email": f"invitee{i}@example.com", "nickname": f"invitee{i}"} for i in range(count)]
+
+def test_bulk_create_accepts_up_to_the_limit():
+    assert len(InviteBulkCreate(invitees=invitees(settings.invite_bulk_max_size)).invitees) == settings.invite_bulk_max_size
+
+@pytest.mark.parametrize("count", [0, settings.invite_bulk_max_size + 1])
+def test_bulk_create_rejects_empty_and_oversized_batches(count):
+    with pytest.raises(ValidationError):
+        InviteBulkCreate(invitees=invitees(count))
+
+def test_bulk_limit_is_published_in_openapi():
+    invitees_schema = app.openapi()["components"]["schemas"]["InviteBulkCreate"]["properties"]["invitees"]
+    assert invitees_schema["maxItems"] == settings.invite_bulk_max_size
@@ -0,0 +1,94 @@
+import pytest
+from sqlalchemy import insert, select, text
+from app.models.invite_model import Invitation
+from app.models.user_model import User, UserRole
+from app.services.count_service import CountService, CountStrategy
+from app.services.invite_service import InviteService
+from app.services.user_service import UserService
+
+def _user(i):
+    return User(nickname=f"count_user_{i}", email=f"count{i}@example.com", hashed_password="x",
+                role=UserRole.AUTHENTICATED, email_verified=False, is_locked=False)
+
+@pytest.mark.asyncio
+async def test_exact_total_comes_with_every_page(db_session, users_with_same_role_50_users):
+    page = await UserService.list_users_page(db_session, limit=20, count_strategy=CountStrategy.EXACT)
+    assert page.total == 50
+    page = await UserService.list_users_page(db_session, limit=20, cursor=page.next_cursor, count_strategy=CountStrategy.EXACT)
+    assert page.total == 50
+    assert len(page.items) == 20
+
+@pytest.mark.asyncio
+async def test_no_total_when_skipped(db_session, users_with_same_role_50_users):
+    page = await UserService.list_users_page(db_session, limit=5)
+    assert page.total is None
+
+@pytest.mark.asyncio
+async def test_cached_total_is_reused_until_rows_are_committed(db_session, users_with_same_role_50_users):
+    assert await UserService.count(db_session, CountStrategy.CACHED) == 50
+
+    # A core INSERT bypasses the session hooks, so the cached total is served as-is
+    await db_session.execute(insert(User).values(
+        nickname="core_user", email="core@example.com", hashed_password="x", role=UserRole.AUTHENTICATED
+    ))
+    await db_session.commit()
+    assert await UserService.count(db_session, CountStrategy.CACHED) == 50
+
+    # Committing an ORM insert drops the cached total
+    db_session.add(_user(0))
+    await db_session.commit()
+    assert await UserService.count(db_session, CountStrategy.CACHED) == 52
+
+@pytest.mark.asyncio
+async def test_rolled_back_inserts_keep_the_cache(db_session, users_with_same_role_50_users):
+    assert await UserService.count(db_session, CountStrategy.CACHED) == 50
+    db_session.add(_user(0))
+    await db_session.flush()
+    await db_session.rollback()
+    assert ("users", "") in CountService._cache
+
+@pytest.mark.asyncio
+async def test_estimate_uses_planner_statistics(db_session, users_with_same_role_50_users):
+    await db_session.execute(text("ANALYZE users"))
+    assert await UserService.count(db_session, CountStrategy.ESTIMATE) == 50
+
+@pytest.mark.asyncio
+async def test_filtered_estimate_uses_explain(db_session, verified_user):
+    query = select(Invitation).where(Invitation.user_id == verified_user.id)
+    estimate = await CountService.estimate(db_session, query, Invitation.__tablename__)
+    assert isinstance(estimate, int) and estimate >= 0
+
+@pytest.mark.asyncio
+async def test_filtered_estimate_with_colons_in_values(db_session, verified_user):
+    # Inlined literals such as ':nickname' must not be parsed as bind parameters
+    query = select(Invitation).where(Invitation.nickname == ":nickname", Invitation.invitee_email == "at :00 (100%)")
+    estimate = await CountService.estimate(db_session, query, Invitation.__tablename__)
+    assert isinstance(estimate, int) and estimate >= 0
+
+@pytest.mark.asyncio
+async def test_invitation_page_with_cached_total(db_session, verified_user):
+    db_session.add_all([
+        Invitation(invitee_email=f"count{i}@example.com", invite_code=f"count-{i}", nickname="nick", user_id=verified_user.id)
+        for i in range(3)
+    ])
+    await db_session.commit()
+    page = await InviteService.list_invitations_page(db_session, verified_user.id, limit=2, count_strategy=CountStrategy.CACHED)
+    assert page.total == 3
+    assert len(page.items) == 2
+
+@pytest.mark.asyncio
+async def test_list_users_include_total(async_client, admin_token, users_with_same_role_50_users):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/?include_total=none", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["total"] is None
+
+    response = await async_client.get("/users/?include_total=exact", headers=headers)
+    assert response.json()["total"] == 51  # the 50 users plus the admin
+    assert response.json()["total_is_estimate"] is False
+
+    response = await async_client.get("/users/?include_total=estimate", headers=headers)
+    assert response.json()["total_is_estimate"] is True
+
+    response = await async_client.get("/users/?include_total=bogus", headers=headers)
+    assert response.status_code == 422
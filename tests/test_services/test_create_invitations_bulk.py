@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import select, func
+from app.models.email_outbox_model import EmailOutbox
+from app.models.invite_model import Invitation
+from app.services.outbox_service import OutboxService
+from app.services.invite_service import InviteService
+
+@pytest.mark.asyncio
+async def test_create_invitations_bulk(db_session, verified_user, email_service):
+    invitees = [
+        {"invitee_email": f"bulk{i}@example.com", "nickname": f"bulk_{i}"}
+        for i in range(5)
+    ]
+    results = await InviteService.create_invitations_bulk(
+        db_session,
+        user_id=verified_user.id,
+        invitees=invitees,
+        email_service=email_service
+    )
+    assert [result["status"] for result in results] == ["created"] * 5
+    assert all(result["invite_code"] for result in results)
+    assert email_service.send_invite_email.await_count == 0
+
+    queued = await db_session.execute(select(func.count(EmailOutbox.id)).where(EmailOutbox.kind == OutboxService.INVITE_EMAIL))
+    assert queued.scalar() == 5
+
+    total = await db_session.execute(select(func.count(Invitation.id)).where(Invitation.user_id == verified_user.id))
+    assert total.scalar() == 5
+
+@pytest.mark.asyncio
+async def test_create_invitations_bulk_rejects_duplicates(db_session, verified_user, email_service):
+    await InviteService.create_invitations_bulk(
+        db_session,
+        user_id=verified_user.id,
+        invitees=[{"invitee_email": "existing@example.com", "nickname": "existing"}],
+        email_service=email_service
+    )
+    results = await InviteService.create_invitations_bulk(
+        db_session,
+        user_id=verified_user.id,
+        invitees=[
+            {"invitee_email": "existing@example.com", "nickname": "existing"},
+            {"invitee_email": "new@example.com", "nickname": "new"},
+            {"invitee_email": "new@example.com", "nickname": "new_again"},
+        ],
+        email_service=email_service
+    )
+    assert [result["status"] for result in results] == ["rejected", "created", "rejected"]
+    assert results[0]["detail"] == "Invitation already exists for this invitee."
+
+@pytest.mark.asyncio
+async def test_create_invitations_bulk_invite_code_collision_is_not_a_duplicate(db_session, verified_user, email_service, monkeypatch):
+    db_session.add(Invitation(invitee_email="taken@example.com", invite_code="taken-code", nickname="taken", user_id=verified_user.id))
+    await db_session.commit()
+    monkeypatch.setattr("app.services.invite_service.secrets.token_urlsafe", lambda nbytes: "taken-code")
+
+    results = await InviteService.create_invitations_bulk(
+        db_session,
+        user_id=verified_user.id,
+        invitees=[{"invitee_email": "fresh@example.com", "nickname": "fresh"}],
+        email_service=email_service
+    )
+    assert results[0]["status"] == "rejected"
+    assert results[0]["detail"] == "Error creating invitation."
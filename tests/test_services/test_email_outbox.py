@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime, timezone
+import pytest
+from sqlalchemy import select, update
+from app.models.email_outbox_model import EmailOutbox
+from app.models.user_model import UserRole
+from app.services.invite_service import InviteService
+from app.services.outbox_service import OutboxService
+from app.services.user_service import UserService
+from settings.config import settings
+from tests.conftest import AsyncTestingSessionLocal
+
+async def outbox_entries(db_session):
+    result = await db_session.execute(select(EmailOutbox))
+    return result.scalars().all()
+
+async def create_invitation(db_session, verified_user, email_service):
+    return await InviteService.create_invitation(
+        db_session,
+        invitee_email="outbox@example.com",
+        user_id=verified_user.id,
+        nickname=verified_user.nickname,
+        email_service=email_service
+    )
+
+@pytest.mark.asyncio
+async def test_create_invitation_queues_email(db_session, verified_user, email_service):
+    invitation = await create_invitation(db_session, verified_user, email_service)
+    entries = await outbox_entries(db_session)
+    assert email_service.send_invite_email.await_count == 0
+    assert len(entries) == 1
+    assert entries[0].kind == OutboxService.INVITE_EMAIL
+    assert entries[0].payload == {"invite_id": str(invitation.id)}
+
+@pytest.mark.asyncio
+async def test_create_user_queues_verification_email(db_session, email_service):
+    user = await UserService.create(db_session, {
+        "nickname": "outbox_user",
+        "email": "outbox_user@example.com",
+        "password": "ValidPassword123!",
+        "role": UserRole.ANONYMOUS.name
+    }, email_service)
+    entries = await outbox_entries(db_session)
+    assert email_service.send_verification_email.await_count == 0
+    assert [(entry.kind, entry.payload) for entry in entries] == [(OutboxService.VERIFICATION_EMAIL, {"user_id": str(user.id)})]
+
+@pytest.mark.asyncio
+async def test_process_batch_sends_and_marks_sent(db_session, verified_user, email_service):
+    invitation = await create_invitation(db_session, verified_user, email_service)
+    processed = await OutboxService.process_batch(db_session, email_service)
+    assert processed == 1
+    email_service.send_invite_email.assert_awaited_once()
+    assert email_service.send_invite_email.await_args.args[0].id == invitation.id
+    entry = (await outbox_entries(db_session))[0]
+    assert entry.status == EmailOutbox.SENT
+    assert await OutboxService.process_batch(db_session, email_service) == 0
+
+@pytest.mark.asyncio
+async def test_process_batch_retries_then_dead_letters(db_session, verified_user, email_service):
+    await create_invitation(db_session, verified_user, email_service)
+    email_service.send_invite_email.side_effect = ConnectionError("SMTP unavailable")
+
+    await OutboxService.process_batch(db_session, email_service)
+    entry = (await outbox_entries(db_session))[0]
+    assert entry.status == EmailOutbox.PENDING
+    assert entry.attempts == 1
+    assert entry.last_error == "SMTP unavailable"
+    assert await OutboxService.process_batch(db_session, email_service) == 0  # backing off
+
+    for _ in range(settings.email_outbox_max_attempts - 1):
+        await db_session.execute(update(EmailOutbox).values(next_attempt_at=EmailOutbox.created_at))
+        await db_session.commit()
+        await OutboxService.process_batch(db_session, email_service)
+    await db_session.refresh(entry)
+    assert entry.status == EmailOutbox.DEAD
+    assert entry.attempts == settings.email_outbox_max_attempts
+
+@pytest.mark.asyncio
+async def test_cancelled_send_is_not_marked_sent(db_session, verified_user, email_service):
+    await create_invitation(db_session, verified_user, email_service)
+    email_service.send_invite_email.side_effect = asyncio.CancelledError()
+
+    assert await OutboxService.process_batch(db_session, email_service) == 1
+    entry = (await outbox_entries(db_session))[0]
+    assert entry.status == EmailOutbox.PENDING
+    assert entry.sent_at is None
+    assert entry.attempts == 1
+    assert entry.last_error == "CancelledError"
+
+@pytest.mark.asyncio
+async def test_emails_are_sent_outside_the_claiming_transaction(db_session, verified_user, email_service):
+    await create_invitation(db_session, verified_user, email_service)
+    seen_during_send = {}
+
+    async def send(invite):
+        async with AsyncTestingSessionLocal() as other:
+            # The claim is committed: the row is neither locked nor due, so no other worker picks it up
+            row = (await other.execute(select(EmailOutbox).with_for_update(nowait=True))).scalars().one()
+            seen_during_send["leased"] = row.next_attempt_at > datetime.now(timezone.utc)
+            seen_during_send["claimed_elsewhere"] = await OutboxService.process_batch(other, email_service)
+    email_service.send_invite_email.side_effect = send
+
+    assert await OutboxService.process_batch(db_session, email_service) == 1
+    assert seen_during_send == {"leased": True, "claimed_elsewhere": 0}
+    assert (await outbox_entries(db_session))[0].status == EmailOutbox.SENT
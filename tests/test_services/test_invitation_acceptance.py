@@ -12,4 +12,33 @@ async def test_accept_invitation(db_session, verified_user, email_service):
         email_service=email_service,
     )
     marked = await InviteService.mark_invitation_as_used(db_session, invitation.id)
-    assert marked is True
\ No newline at end of file
+    assert marked is True
+
+@pytest.mark.asyncio
+async def test_accept_invitation_is_single_use(db_session, verified_user, email_service):
+    invitation = await InviteService.create_invitation(
+        db_session,
+        invitee_email="pytest@example.com",
+        user_id=verified_user.id,
+        nickname=verified_user.nickname,
+        email_service=email_service,
+    )
+    accepted = await InviteService.accept_invitation(db_session, invitation.invite_code, verified_user.nickname)
+    assert accepted.id == invitation.id
+    assert accepted.used is True
+    assert accepted.used_at is not None
+    assert await InviteService.accept_invitation(db_session, invitation.invite_code, verified_user.nickname) is None
+
+
+@pytest.mark.asyncio
+async def test_accept_invitation_rejects_wrong_nickname(db_session, verified_user, email_service):
+    invitation = await InviteService.create_invitation(
+        db_session,
+        invitee_email="pytest@example.com",
+        user_id=verified_user.id,
+        nickname=verified_user.nickname,
+        email_service=email_service,
+    )
+    assert await InviteService.accept_invitation(db_session, invitation.invite_code, "someone-else") is None
+    unchanged = await InviteService.get_invitation_by_code(db_session, invitation.invite_code)
+    assert not unchanged.used
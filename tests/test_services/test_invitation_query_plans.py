@@ -0,0 +1,105 @@
+"""
+Query-plan regression tests: every statement InviteService sends against `invitations` must be able to use an index.
+
+Sequential scans are disabled for the EXPLAIN so the planner only falls back to one when no index fits;
+on tables this small it would otherwise prefer a sequential scan regardless.
+"""
+import pytest
+from contextlib import contextmanager
+from sqlalchemy import event, insert, text
+from app.models.invite_model import Invitation
+from app.services.count_service import CountStrategy
+from app.services.invite_service import InviteService
+
+INDEXED_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Heap Scan"}
+
+@contextmanager
+def capture_statements(session):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "invitations" in statement and statement.lstrip().split(None, 1)[0] in ("SELECT", "UPDATE", "DELETE"):
+            statements.append((statement, parameters))
+
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+def plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+async def explain(session, statement, parameters):
+    connection = await session.connection()
+    await connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    plan = result.scalar()
+    return list(plan_nodes(plan[0]["Plan"]))
+
+def invitation_scans(nodes):
+    return [node for node in nodes if node.get("Relation Name") == "invitations" and node["Node Type"].endswith("Scan")]
+
+@pytest.fixture
+async def invitations(db_session, verified_user):
+    invites = [
+        Invitation(invitee_email=f"plan{i}@example.com", invite_code=f"plan-{i}", nickname="nick", user_id=verified_user.id)
+        for i in range(4)
+    ]
+    db_session.add_all(invites)
+    await db_session.commit()
+    return invites
+
+@pytest.mark.asyncio
+async def test_invite_service_queries_use_indexes(db_session, verified_user, invitations, email_service):
+    user_id = verified_user.id
+    with capture_statements(db_session) as statements:
+        await InviteService.get_invitation_by_code(db_session, "plan-0")
+        await InviteService.accept_invitation(db_session, "plan-0", "nick")
+        page = await InviteService.list_invitations_page(db_session, user_id, limit=2, count_strategy=CountStrategy.EXACT)
+        await InviteService.list_invitations_page(db_session, user_id, limit=2, cursor=page.next_cursor)
+        await InviteService.list_invitations_page(db_session, user_id, limit=2, used=False)
+        await InviteService.list_invitations_for_user(db_session, user_id, skip=1, limit=2)
+        await InviteService.count_invitations_for_user(db_session, user_id)
+        await InviteService.resend_invitation(db_session, invitations[1].id, user_id, email_service)
+        await InviteService.update_invite(db_session, invitations[2].id, user_id, {"nickname": "renamed"})
+        await InviteService.delete_invitation(db_session, invitations[3].id, user_id)
+
+    assert len(statements) >= 10
+    for statement, parameters in statements:
+        scans = invitation_scans(await explain(db_session, statement, parameters))
+        assert scans, statement
+        for scan in scans:
+            assert scan["Node Type"] in INDEXED_SCANS, f"{scan['Node Type']} for: {statement}"
+    await db_session.rollback()
+
+@pytest.mark.asyncio
+async def test_pending_listing_uses_partial_index(db_session, verified_user, invitations):
+    # Once most invitations have been used, the partial index is far smaller than the full one
+    await db_session.execute(insert(Invitation), [
+        {"invitee_email": f"used{i}@example.com", "invite_code": f"used-{i}", "nickname": "nick", "user_id": verified_user.id, "used": True}
+        for i in range(500)
+    ])
+    await db_session.commit()
+    await db_session.execute(text("ANALYZE invitations"))
+
+    with capture_statements(db_session) as statements:
+        await InviteService.list_invitations_page(db_session, verified_user.id, limit=2, used=False)
+
+    statement, parameters = statements[0]
+    nodes = await explain(db_session, statement, parameters)
+    assert any(node.get("Index Name") == "ix_invitations_unused_user_id_created_at_id" for node in nodes)
+    await db_session.rollback()
+
+@pytest.mark.asyncio
+async def test_user_listing_uses_composite_index(db_session, verified_user, invitations):
+    with capture_statements(db_session) as statements:
+        await InviteService.list_invitations_page(db_session, verified_user.id, limit=2)
+
+    statement, parameters = statements[0]
+    nodes = await explain(db_session, statement, parameters)
+    assert any(node.get("Index Name") == "ix_invitations_user_id_created_at_id" for node in nodes)
+    await db_session.rollback()
@@ -0,0 +1,102 @@
+import pytest
+from app.models.invite_model import Invitation
+from app.services.invite_cache import InviteCache, cache_ttl, invite_cache
+from app.services.invite_service import InviteService
+from app.utils.cache import InMemorySharedCache, LocalTTLCache, TieredCache
+from settings.config import settings
+
+@pytest.fixture
+async def invitation(db_session, verified_user):
+    invite = Invitation(invitee_email="cache@example.com", invite_code="cache-code", nickname="nick", user_id=verified_user.id)
+    db_session.add(invite)
+    await db_session.commit()
+    return invite
+
+@pytest.fixture
+def count_queries(monkeypatch):
+    calls = []
+    execute_query = InviteService._execute_query.__func__
+
+    async def counting(cls, session, query):
+        calls.append(query)
+        return await execute_query(cls, session, query)
+
+    monkeypatch.setattr(InviteService, "_execute_query", classmethod(counting))
+    return calls
+
+@pytest.fixture(params=["local", "tiered"])
+def cache_backend(request, monkeypatch):
+    local = LocalTTLCache(max_entries=100)
+    backend = local if request.param == "local" else TieredCache(local, InMemorySharedCache(), local_ttl=5)
+    monkeypatch.setattr(invite_cache, "backend", backend)
+    return backend
+
+@pytest.mark.asyncio
+async def test_repeat_lookups_are_served_from_cache(db_session, invitation, count_queries, cache_backend):
+    first = await InviteService.get_invitation_by_code(db_session, "cache-code")
+    second = await InviteService.get_invitation_by_code(db_session, "cache-code")
+    assert len(count_queries) == 1
+    assert second.id == first.id
+    assert second.nickname == "nick" and second.used is False
+    assert second.created_at == first.created_at
+
+@pytest.mark.asyncio
+async def test_misses_are_not_cached(db_session, count_queries, cache_backend):
+    assert await InviteService.get_invitation_by_code(db_session, "missing") is None
+    assert await InviteService.get_invitation_by_code(db_session, "missing") is None
+    assert len(count_queries) == 2
+
+@pytest.mark.asyncio
+async def test_lookup_can_be_restricted_to_owner(db_session, invitation, verified_user, admin_user, cache_backend):
+    assert await InviteService.get_invitation_by_code(db_session, "cache-code", user_id=verified_user.id) is not None
+    assert await InviteService.get_invitation_by_code(db_session, "cache-code", user_id=admin_user.id) is None
+
+@pytest.mark.asyncio
+async def test_accept_invalidates(db_session, invitation, cache_backend):
+    await InviteService.get_invitation_by_code(db_session, "cache-code")
+    await InviteService.accept_invitation(db_session, "cache-code", "nick")
+    assert (await InviteService.get_invitation_by_code(db_session, "cache-code")).used is True
+
+@pytest.mark.asyncio
+async def test_mark_as_used_invalidates(db_session, invitation, cache_backend):
+    await InviteService.get_invitation_by_code(db_session, "cache-code")
+    await InviteService.mark_invitation_as_used(db_session, invitation.id)
+    assert (await InviteService.get_invitation_by_code(db_session, "cache-code")).used is True
+
+@pytest.mark.asyncio
+async def test_update_invalidates(db_session, invitation, verified_user, cache_backend):
+    await InviteService.get_invitation_by_code(db_session, "cache-code")
+    await InviteService.update_invite(db_session, invitation.id, verified_user.id, {"invitee_email": "changed@example.com"})
+    assert (await InviteService.get_invitation_by_code(db_session, "cache-code")).invitee_email == "changed@example.com"
+
+@pytest.mark.asyncio
+async def test_delete_invalidates(db_session, invitation, verified_user, cache_backend):
+    await InviteService.get_invitation_by_code(db_session, "cache-code")
+    assert await InviteService.delete_invitation(db_session, invitation.id, verified_user.id)
+    assert await InviteService.get_invitation_by_code(db_session, "cache-code") is None
+
+@pytest.mark.asyncio
+async def test_cache_failures_fall_through_to_database(db_session, invitation, monkeypatch):
+    class BrokenBackend:
+        async def get(self, key):
+            raise ConnectionError("down")
+
+        async def set(self, key, value, ttl):
+            raise ConnectionError("down")
+
+    monkeypatch.setattr(invite_cache, "backend", BrokenBackend())
+    assert (await InviteService.get_invitation_by_code(db_session, "cache-code")).id == invitation.id
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_misses(invitation):
+    cache = InviteCache(None, ttl=30)
+    await cache.set(invitation)
+    assert await cache.get("cache-code") is None
+
+def test_local_backend_uses_the_short_local_ttl(monkeypatch):
+    monkeypatch.setattr(settings, "invite_cache_ttl_seconds", 30.0)
+    monkeypatch.setattr(settings, "invite_cache_local_ttl_seconds", 2.0)
+    monkeypatch.setattr(settings, "invite_cache_backend", "local")
+    assert cache_ttl() == 2.0
+    monkeypatch.setattr(settings, "invite_cache_backend", "memory")
+    assert cache_ttl() == 30.0
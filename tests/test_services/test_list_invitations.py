@@ -1,5 +1,7 @@
 import pytest
+from app.models.invite_model import Invitation
 from app.services.invite_service import InviteService
+from app.utils.pagination import LAST_PAGE_CURSOR
 
 @pytest.mark.asyncio
 async def test_get_invitations_paginated(db_session, verified_user, email_service):
@@ -12,4 +14,52 @@ async def test_get_invitations_paginated(db_session, verified_user, email_servic
         email_service=email_service
         )
     invites, total = await InviteService.list_invitations_for_user(db_session, verified_user.id, skip=0, limit=10)
-    assert len(invites) == 5
\ No newline at end of file
+    assert len(invites) == 5
+
+@pytest.mark.asyncio
+async def test_list_invitations_page_walks_forward_and_back(db_session, verified_user):
+    # Rows inserted in one transaction share created_at, so the id tiebreaker must keep pages stable
+    db_session.add_all([
+        Invitation(invitee_email=f"page{i}@example.com", invite_code=f"code-{i}", nickname="nick", user_id=verified_user.id)
+        for i in range(5)
+    ])
+    await db_session.commit()
+
+    seen, cursor = [], None
+    while True:
+        page = await InviteService.list_invitations_page(db_session, verified_user.id, limit=2, cursor=cursor)
+        seen.extend(invite.id for invite in page.items)
+        if not page.next_cursor:
+            break
+        cursor = page.next_cursor
+    assert len(seen) == len(set(seen)) == 5
+    assert len(page.items) == 1
+
+    previous = await InviteService.list_invitations_page(db_session, verified_user.id, limit=2, cursor=page.prev_cursor)
+    assert [invite.id for invite in previous.items] == seen[2:4]
+    assert previous.next_cursor and previous.prev_cursor
+
+    last = await InviteService.list_invitations_page(db_session, verified_user.id, limit=2, cursor=LAST_PAGE_CURSOR)
+    assert [invite.id for invite in last.items] == seen[3:]
+    assert last.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_list_invitations_page_rejects_malformed_cursor(db_session, verified_user):
+    with pytest.raises(ValueError):
+        await InviteService.list_invitations_page(db_session, verified_user.id, cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_list_invitations_page_filters_by_used(db_session, verified_user):
+    db_session.add_all([
+        Invitation(invitee_email=f"used{i}@example.com", invite_code=f"used-{i}", nickname="nick", user_id=verified_user.id, used=i == 0)
+        for i in range(3)
+    ])
+    await db_session.commit()
+
+    pending = await InviteService.list_invitations_page(db_session, verified_user.id, used=False)
+    used = await InviteService.list_invitations_page(db_session, verified_user.id, used=True)
+    assert sorted(invite.invite_code for invite in pending.items) == ["used-1", "used-2"]
+    assert [invite.invite_code for invite in used.items] == ["used-0"]
+    assert await InviteService.count_invitations_for_user(db_session, verified_user.id, used=False) == 2
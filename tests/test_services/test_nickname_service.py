@@ -0,0 +1,55 @@
+import asyncio
+import pytest
+from app.services import nickname_service
+from app.services.nickname_service import NicknameService, NicknameUnavailableError
+from app.services.user_service import UserService
+from app.utils.nickname_gen import generate_nicknames
+
+pytestmark = pytest.mark.asyncio
+
+def user_data(email, nickname=None):
+    data = {"email": email, "password": "ValidPassword123!", "role": "AUTHENTICATED"}
+    if nickname is not None:
+        data["nickname"] = nickname
+    return data
+
+async def test_find_available_checks_a_batch_in_one_query(db_session, verified_user):
+    candidates = [verified_user.nickname, "free_nickname_1", "free_nickname_2"]
+    assert await NicknameService.find_available(db_session, candidates) == ["free_nickname_1", "free_nickname_2"]
+
+async def test_generate_nicknames_returns_distinct_names():
+    nicknames = generate_nicknames(50)
+    assert len(set(nicknames)) == 50
+
+async def test_create_keeps_a_free_preferred_nickname(db_session, email_service):
+    user = await UserService.create(db_session, user_data("free@example.com", "my_nickname"), email_service)
+    assert user.nickname == "my_nickname"
+
+async def test_create_without_nickname_generates_one(db_session, email_service):
+    user = await UserService.create(db_session, user_data("generated@example.com"), email_service)
+    assert user is not None and user.nickname
+
+async def test_create_with_a_taken_nickname_allocates_another(db_session, email_service, verified_user):
+    # Used to spin forever re-checking the same taken nickname
+    user = await asyncio.wait_for(
+        UserService.create(db_session, user_data("collision@example.com", verified_user.nickname), email_service),
+        timeout=10
+    )
+    assert user is not None
+    assert user.nickname != verified_user.nickname
+
+async def test_candidate_claimed_after_the_check_is_skipped(db_session, email_service, verified_user, monkeypatch):
+    # Simulate another registration taking the first candidate between the check and the insert
+    async def stale_find_available(session, candidates):
+        return [verified_user.nickname, "second_choice"]
+
+    monkeypatch.setattr(NicknameService, "find_available", stale_find_available)
+    user = await UserService.create(db_session, user_data("race@example.com"), email_service)
+    assert user.nickname == "second_choice"
+
+async def test_allocation_gives_up_after_the_configured_batches(db_session, email_service, verified_user, monkeypatch):
+    monkeypatch.setattr(nickname_service, "generate_nicknames", lambda count: [verified_user.nickname] * count)
+    with pytest.raises(NicknameUnavailableError):
+        async for _ in NicknameService.candidates(db_session):
+            pass
+    assert await UserService.create(db_session, user_data("exhausted@example.com"), email_service) is None
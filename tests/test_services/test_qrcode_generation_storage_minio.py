@@ -2,12 +2,14 @@ import pytest
 from minio.error import S3Error
 from app.services.invite_service import InviteService
 import uuid
+from qrcodegen.artifact_cache import qr_object_name
+from qrcodegen.generation import generate_qr_data, qr_options
 
 
 @pytest.mark.asyncio
-async def test_qr_code_stored_in_minio(db_session, minio_client, verified_user, email_service):
+async def test_qr_code_stored_in_minio(async_client, db_session, minio_client, verified_user, email_service):
     """
-    Test if the QR code is successfully stored in MinIO after creating an invitation.
+    Test if the QR code is successfully stored in MinIO once it is first requested after creating an invitation.
     """
     bucket_name = 'qr-codes'
 
@@ -26,8 +28,12 @@ async def test_qr_code_stored_in_minio(db_session, minio_client, verified_user,
     qr_code_url = invitation.qr_code_url
     assert qr_code_url is not None, "QR code URL is not set in the invitation."
 
-    # Extract the object name from the URL (e.g., "user_id/nickname/invite_code.png")
-    object_name = qr_code_url.split(bucket_name + "/")[-1]
+    # QR codes are rendered and stored on first request
+    response = await async_client.get(f"/invites/{invitation.invite_code}/qr.png")
+    assert response.status_code == 200
+
+    # Stored objects are named by the hash of the accept URL they encode
+    object_name = qr_object_name(generate_qr_data(invitation.nickname, invitation.invite_code), qr_options())
 
     # Verify the QR code is stored in MinIO
     try:
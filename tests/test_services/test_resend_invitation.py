@@ -1,5 +1,6 @@
 import pytest
 from app.services.invite_service import InviteService
+from qrcodegen.artifact_cache import qr_artifact_cache
 import uuid
 
 @pytest.mark.asyncio
@@ -24,4 +25,23 @@ async def test_resend_invite_failure(db_session, verified_user, email_service):
         email_service=email_service
         )
     resend = await InviteService.resend_invitation(db_session, invitation.id, uuid.uuid4(), email_service)
-    assert resend is False
\ No newline at end of file
+    assert resend is False
+@pytest.mark.asyncio
+async def test_resend_does_not_render_or_upload_the_qr_code(db_session, verified_user, email_service, monkeypatch):
+    invitation = await InviteService.create_invitation(
+        db_session,
+        invitee_email="pytest@example.com",
+        user_id=verified_user.id,
+        nickname=verified_user.nickname,
+        email_service=email_service
+        )
+
+    async def fail_render(data):
+        raise AssertionError("QR codes are rendered when first requested, not when emails are sent")
+
+    async def fail_put(*args, **kwargs):
+        raise AssertionError("QR codes are stored when first requested, not when emails are sent")
+
+    monkeypatch.setattr(qr_artifact_cache.engine, "render", fail_render)
+    monkeypatch.setattr(qr_artifact_cache.storage, "put_object", fail_put)
+    assert await InviteService.resend_invitation(db_session, invitation.id, verified_user.id, email_service) is True
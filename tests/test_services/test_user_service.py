@@ -1,10 +1,13 @@
 from builtins import range
 import pytest
-from sqlalchemy import select
+from sqlalchemy import event, select
 from app.dependencies import get_settings
 from app.models.user_model import User, UserRole
-from app.services.user_service import UserService
+from app.services.user_service import AccountLockedError, UserService
 from app.utils.nickname_gen import generate_nickname
+from app.utils.password_hasher import password_hasher
+from app.utils.password_policy import Argon2Scheme, BcryptScheme, PasswordPolicy
+from app.utils.security import hash_password
 
 pytestmark = pytest.mark.asyncio
 
@@ -122,6 +125,71 @@ async def test_login_user_successful(db_session, verified_user):
     logged_in_user = await UserService.login_user(db_session, user_data["email"], user_data["password"])
     assert logged_in_user is not None
 
+# Test that a hash made with an outdated cost is upgraded in the background after login
+async def test_login_upgrades_outdated_password_hash(db_session, verified_user):
+    verified_user.hashed_password = hash_password("MySuperPassword$1234", rounds=4)
+    await db_session.commit()
+
+    assert await UserService.login_user(db_session, verified_user.email, "MySuperPassword$1234") is not None
+    await password_hasher.drain()
+
+    await db_session.refresh(verified_user)
+    assert verified_user.hashed_password.startswith(f"$2b${get_settings().password_bcrypt_rounds}$")
+    assert await UserService.login_user(db_session, verified_user.email, "MySuperPassword$1234") is not None
+
+# Test that bcrypt hashes still verify after switching to argon2id, and are migrated on login
+async def test_login_migrates_bcrypt_hash_to_argon2(db_session, verified_user, monkeypatch):
+    argon2_policy = PasswordPolicy("argon2id", {
+        "bcrypt": BcryptScheme(rounds=12),
+        "argon2id": Argon2Scheme(time_cost=1, memory_cost=1024, parallelism=1),
+    })
+    monkeypatch.setattr(password_hasher, "policy", argon2_policy)
+
+    assert await UserService.login_user(db_session, verified_user.email, "MySuperPassword$1234") is not None
+    await password_hasher.drain()
+
+    await db_session.refresh(verified_user)
+    assert verified_user.hashed_password.startswith("$argon2id$")
+    assert not password_hasher.needs_rehash(verified_user.hashed_password)
+    assert await UserService.login_user(db_session, verified_user.email, "MySuperPassword$1234") is not None
+    assert await UserService.login_user(db_session, verified_user.email, "WrongPassword$1234") is None
+
+# Test that login issues one SELECT and one UPDATE ... RETURNING
+async def test_login_uses_one_select_and_one_update(db_session, verified_user):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0])
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        user = await UserService.login_user(db_session, verified_user.email, "MySuperPassword$1234")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert statements == ["SELECT", "UPDATE"]
+    assert user.last_login_at is not None
+    assert user.failed_login_attempts == 0
+
+# Test that failed attempts are counted in the database and reset by a successful login
+async def test_login_counts_and_resets_failed_attempts(db_session, verified_user):
+    assert await UserService.login_user(db_session, verified_user.email, "WrongPassword$1234") is None
+    await db_session.refresh(verified_user)
+    assert verified_user.failed_login_attempts == 1
+
+    assert await UserService.login_user(db_session, verified_user.email, "MySuperPassword$1234") is not None
+    await db_session.refresh(verified_user)
+    assert verified_user.failed_login_attempts == 0
+
+# Test that a locked account is rejected before the password is checked
+async def test_login_locked_user_raises(db_session, locked_user, monkeypatch):
+    async def fail_verify(*args):
+        raise AssertionError("locked accounts must not reach password verification")
+
+    monkeypatch.setattr(password_hasher, "verify", fail_verify)
+    with pytest.raises(AccountLockedError):
+        await UserService.login_user(db_session, locked_user.email, "MySuperPassword$1234")
+
 # Test user login with incorrect email
 async def test_login_user_incorrect_email(db_session):
     user = await UserService.login_user(db_session, "nonexistentuser@noway.com", "Password123!")
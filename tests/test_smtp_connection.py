@@ -0,0 +1,91 @@
+import email
+import smtplib
+import pytest
+from app.utils import smtp_connection
+from app.utils.smtp_connection import SMTPClient
+
+class FakeSMTP:
+    instances = []
+
+    def __init__(self, server, port, timeout=None):
+        self.logins = 0
+        self.sent = []
+        self.closed = False
+        self.drop_after = None
+        FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, username, password):
+        self.logins += 1
+
+    def noop(self):
+        return (250, b"OK")
+
+    def sendmail(self, sender, recipient, message):
+        if self.drop_after is not None and len(self.sent) >= self.drop_after:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent.append(recipient)
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def smtp_client(monkeypatch):
+    FakeSMTP.instances = []
+    monkeypatch.setattr(smtp_connection.smtplib, "SMTP", FakeSMTP)
+    client = SMTPClient("smtp.example.com", 2525, "user", "password")
+    yield client
+    client.close()
+
+def test_connection_is_reused_across_sends(smtp_client):
+    smtp_client.send_email("Subject", "<p>one</p>", "one@example.com")
+    smtp_client.send_email("Subject", "<p>two</p>", "two@example.com")
+    assert len(FakeSMTP.instances) == 1
+    assert FakeSMTP.instances[0].logins == 1
+    assert FakeSMTP.instances[0].sent == ["one@example.com", "two@example.com"]
+
+def test_send_many_pipelines_over_one_connection(smtp_client):
+    smtp_client.send_many([("Subject", "<p>hi</p>", f"user{i}@example.com") for i in range(5)])
+    assert len(FakeSMTP.instances) == 1
+    assert len(FakeSMTP.instances[0].sent) == 5
+
+def test_disconnect_reconnects_and_sends_only_unsent(smtp_client):
+    smtp_client.send_email("Subject", "<p>warm</p>", "warm@example.com")
+    FakeSMTP.instances[0].drop_after = 2
+    smtp_client.send_many([("Subject", "<p>hi</p>", f"user{i}@example.com") for i in range(3)])
+    assert len(FakeSMTP.instances) == 2
+    assert FakeSMTP.instances[0].sent == ["warm@example.com", "user0@example.com"]
+    assert FakeSMTP.instances[1].sent == ["user1@example.com", "user2@example.com"]
+
+def test_idle_connections_expire(smtp_client):
+    smtp_client.pool.idle_timeout = 0
+    smtp_client.send_email("Subject", "<p>one</p>", "one@example.com")
+    smtp_client.send_email("Subject", "<p>two</p>", "two@example.com")
+    assert len(FakeSMTP.instances) == 2
+    assert FakeSMTP.instances[0].closed is True
+
+@pytest.mark.asyncio
+async def test_send_email_async(smtp_client):
+    await smtp_client.send_email_async("Subject", "<p>async</p>", "async@example.com")
+    assert FakeSMTP.instances[0].sent == ["async@example.com"]
+
+def test_inline_images_are_sent_as_multipart_related(smtp_client):
+    raw = smtp_client._build_message("Subject", '<img src="cid:qr-1@invite">', "to@example.com", {"qr-1@invite": b"\x89PNG fake"})
+    message = email.message_from_string(raw)
+    assert message.get_content_type() == "multipart/related"
+    assert message["To"] == "to@example.com"
+    body, image = message.get_payload()
+    assert body.get_content_type() == "multipart/alternative"
+    assert image.get_content_type() == "image/png"
+    assert image["Content-ID"] == "<qr-1@invite>"
+    assert image.get_content_disposition() == "inline"
+    assert image.get_payload(decode=True) == b"\x89PNG fake"
+
+def test_messages_without_inline_images_stay_multipart_alternative(smtp_client):
+    message = email.message_from_string(smtp_client._build_message("Subject", "<p>hi</p>", "to@example.com"))
+    assert message.get_content_type() == "multipart/alternative"
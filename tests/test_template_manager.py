@@ -0,0 +1,48 @@
+import os
+import shutil
+import pytest
+from app.utils import template_manager
+from app.utils.template_manager import TemplateManager
+
+@pytest.fixture
+def temp_templates(tmp_path):
+    manager = TemplateManager()
+    for name in ("header.md", "footer.md", "invite_email.md"):
+        shutil.copy(manager.templates_dir / name, tmp_path / name)
+    manager.templates_dir = tmp_path
+    return manager
+
+def test_render_substitutes_and_styles():
+    html = TemplateManager().render_template(
+        "email_verification", name="Jane", verification_url="http://localhost/verify-email/1/token", email="jane@example.com"
+    )
+    assert "Hello Jane," in html
+    assert 'href="http://localhost/verify-email/1/token"' in html
+    assert html.startswith('<div style="font-family: Arial')
+    assert "{name}" not in html
+
+def test_render_escapes_context_values():
+    html = TemplateManager().render_template(
+        "invite_email", name="<b>Jane</b>", qr_code_url="http://x/qr.png", invite_url="http://x/accept?a=1&b=2", email="j@example.com"
+    )
+    assert "&lt;b&gt;Jane&lt;/b&gt;" in html
+    assert 'href="http://x/accept?a=1&amp;b=2"' in html
+
+def test_render_missing_value_raises():
+    with pytest.raises(KeyError):
+        TemplateManager().render_template("email_verification", name="Jane")
+
+def test_template_is_compiled_once():
+    manager = TemplateManager()
+    assert manager.get_compiled("invite_email") is TemplateManager().get_compiled("invite_email")
+
+def test_auto_reload_recompiles_on_mtime_change(temp_templates, monkeypatch):
+    monkeypatch.setattr(template_manager.settings, "email_template_auto_reload", True)
+    context = dict(name="Jane", qr_code_url="http://x/qr.png", invite_url="http://x/accept", email="j@example.com")
+    assert "You're Invited!" in temp_templates.render_template("invite_email", **context)
+
+    path = temp_templates.templates_dir / "invite_email.md"
+    path.write_text("# Updated invite for {name}\n", encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    assert "Updated invite for Jane" in temp_templates.render_template("invite_email", **context)